@@ -0,0 +1,117 @@
+"""
+Micro-benchmark: CPU and memory per contact row of a 1k-row list page,
+loading ORM entities vs selecting only the response columns as row mappings.
+
+Each variant runs the query through an ORM session against in-memory SQLite
+and encodes the page as the endpoint would: either through FastAPI's
+``serialize_response`` for the route's ``response_model`` (validate, then
+serialize), or with ``contact_list_response``, which skips the validation.
+
+Usage:
+    PYTHONPATH=. python benchmarks/contact_rows.py [--rows N] [--pages N]
+"""
+
+import argparse
+import asyncio
+import time
+import tracemalloc
+from datetime import date
+
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+from sqlalchemy import create_engine, insert, select
+from sqlalchemy.orm import Session
+
+from src.api.contacts import contact_list_response, router
+from src.db.models import Base, Contacts, User
+from src.repository.contacts import CONTACT_COLUMNS
+from src.schemas.contacts import ContactSchema
+
+response_field = next(
+    route.response_field for route in router.routes if route.name == "get_contacts"
+)
+loop = asyncio.new_event_loop()
+
+
+def validated_response(contacts) -> JSONResponse:
+    content = loop.run_until_complete(
+        serialize_response(field=response_field, response_content=contacts)
+    )
+    return JSONResponse(content)
+
+
+def orm_entities(session: Session, limit: int):
+    stmt = select(Contacts).filter(Contacts.user_id == 1).limit(limit)
+    contacts = session.execute(stmt).scalars().all()
+    return validated_response(contacts)
+
+
+def row_mappings(session: Session, limit: int):
+    stmt = select(*CONTACT_COLUMNS).filter(Contacts.user_id == 1).limit(limit)
+    rows = session.execute(stmt).mappings().all()
+    return validated_response([dict(row) for row in rows])
+
+
+def row_mappings_serialized(session: Session, limit: int):
+    stmt = select(*CONTACT_COLUMNS).filter(Contacts.user_id == 1).limit(limit)
+    rows = session.execute(stmt).mappings().all()
+    contacts = [ContactSchema.model_construct(**row) for row in rows]
+    return contact_list_response(contacts)
+
+
+def measure(engine, read_page, rows: int, pages: int) -> tuple[float, float]:
+    with Session(engine) as session:
+        read_page(session, rows)  # warm the compiled cache
+    start = time.process_time()
+    for _ in range(pages):
+        with Session(engine) as session:
+            read_page(session, rows)
+    cpu_us = (time.process_time() - start) / (pages * rows) * 1e6
+
+    tracemalloc.start()
+    with Session(engine) as session:
+        read_page(session, rows)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return cpu_us, peak / rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, default=1000)
+    parser.add_argument("--pages", type=int, default=50)
+    args = parser.parse_args()
+
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    with engine.begin() as conn:
+        conn.execute(
+            insert(User).values(
+                id=1, name="a", surname="b", email="a@example.com", hashed_password="x"
+            )
+        )
+        conn.execute(
+            insert(Contacts),
+            [
+                {
+                    "name": f"Contact {i}",
+                    "email": f"contact{i}@example.com",
+                    "phone": f"+38050{i:07d}",
+                    "birthdate": date(1990, 1, 1 + i % 28),
+                    "user_id": 1,
+                }
+                for i in range(args.rows)
+            ],
+        )
+
+    for label, read_page in [
+        ("ORM entities, response_model", orm_entities),
+        ("row mappings, response_model", row_mappings),
+        ("row mappings, serialized", row_mappings_serialized),
+    ]:
+        cpu_us, bytes_per_row = measure(engine, read_page, args.rows, args.pages)
+        print(f"{label:30} {cpu_us:6.1f} us/row, peak {bytes_per_row:7.0f} B/row")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,187 @@
+"""
+Benchmark: p50/p99 latency of contact listing and search as the contacts
+table grows, unpartitioned vs hash-partitioned by user_id.
+
+Every user keeps the same number of contacts while the number of users
+grows, so a flat p99 means per-user queries do not slow down with the
+total row count. Each user's contacts are interleaved with other users' in
+insertion order, as they are in production. Both layouts are built in
+their own schema of a PostgreSQL database (pg_trgm must be installable)
+and dropped afterwards; the queries run through ContactsRepository.
+
+Usage:
+    PYTHONPATH=. python benchmarks/partitioning.py --dsn postgresql+asyncpg://... \\
+        [--base-rows N] [--scales 1,10,100] [--contacts-per-user N] \\
+        [--partitions N] [--queries N]
+"""
+
+import argparse
+import asyncio
+import random
+import statistics
+import time
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+
+from src.db.models import Contacts, User
+from src.repository.contacts import ContactsRepository
+
+FIRST_NAMES = ["Anna", "Bohdan", "Daria", "Ivan", "Kateryna", "Mykola", "Olena"]
+LAST_NAMES = ["Bondar", "Hrytsenko", "Kovalenko", "Melnyk", "Shevchenko", "Tkachuk"]
+SEED_BATCH = 1_000_000
+
+
+def _array(words: list[str]) -> str:
+    return "ARRAY[" + ", ".join(f"'{word}'" for word in words) + "]"
+
+
+async def create_layout(engine, layout: str, partitions: int):
+    async with engine.begin() as conn:
+        await conn.execute(text("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
+        await conn.run_sync(User.__table__.create)
+        if layout == "plain":
+            await conn.run_sync(Contacts.__table__.create)
+            # The index the primary key (user_id, id) replaces when partitioned.
+            await conn.execute(text("CREATE INDEX ON contacts (user_id, id)"))
+            return
+        # Same columns and defaults as the model, partitioned like the
+        # migration does it.
+        await conn.run_sync(Contacts.__table__.create)
+        await conn.execute(text("ALTER TABLE contacts RENAME TO contacts_template"))
+        await conn.execute(
+            text(
+                "CREATE TABLE contacts (LIKE contacts_template INCLUDING DEFAULTS) "
+                "PARTITION BY HASH (user_id)"
+            )
+        )
+        await conn.execute(text("ALTER SEQUENCE contacts_id_seq OWNED BY NONE"))
+        await conn.execute(text("DROP TABLE contacts_template"))
+        for i in range(partitions):
+            await conn.execute(
+                text(
+                    f"CREATE TABLE contacts_p{i} PARTITION OF contacts "
+                    f"FOR VALUES WITH (MODULUS {partitions}, REMAINDER {i})"
+                )
+            )
+        await conn.execute(text("ALTER TABLE contacts ADD PRIMARY KEY (user_id, id)"))
+        for index in Contacts.__table__.indexes:
+            await conn.run_sync(index.create)
+
+
+async def seed(engine, rows: int, total: int, contacts_per_user: int):
+    """Grow contacts from ``rows`` to ``total`` rows, for new users only."""
+    first_user = rows // contacts_per_user + 1
+    users = (total - rows) // contacts_per_user
+    async with engine.begin() as conn:
+        await conn.execute(
+            text(
+                "INSERT INTO users (id, name, surname, email, hashed_password, "
+                "created_at, is_verified, role, token_version) "
+                "SELECT g, 'User', 'Bench', 'user' || g || '@example.com', '-', "
+                "now(), true, 'USER', 0 FROM generate_series(:lo, :hi) g"
+            ),
+            {"lo": first_user, "hi": first_user + users - 1},
+        )
+    for lo in range(rows + 1, total + 1, SEED_BATCH):
+        hi = min(lo + SEED_BATCH - 1, total)
+        async with engine.begin() as conn:
+            await conn.execute(
+                text(
+                    "INSERT INTO contacts (id, name, email, phone, birthdate, "
+                    "birthday_ordinal, phone_normalized, created_at, user_id) "
+                    f"SELECT g, ({_array(FIRST_NAMES)})[1 + g % {len(FIRST_NAMES)}] "
+                    f"|| ' ' || ({_array(LAST_NAMES)})[1 + g / 7 % {len(LAST_NAMES)}], "
+                    "'contact' || g || '@example.com', '+380' || lpad(g::text, 9, '0'), "
+                    "date '1970-01-01' + g % 18000, "
+                    "extract(month FROM date '1970-01-01' + g % 18000) * 100 "
+                    "+ extract(day FROM date '1970-01-01' + g % 18000), "
+                    "'+380' || lpad(g::text, 9, '0'), now(), "
+                    # Interleave the new users' contacts.
+                    ":first_user + g % :users FROM generate_series(:lo, :hi) g"
+                ),
+                {"first_user": first_user, "users": users, "lo": lo, "hi": hi},
+            )
+    async with engine.connect() as conn:
+        conn = await conn.execution_options(isolation_level="AUTOCOMMIT")
+        await conn.execute(text("VACUUM ANALYZE users"))
+        await conn.execute(text("VACUUM ANALYZE contacts"))
+
+
+def percentiles(latencies: list[float]) -> tuple[float, float]:
+    cuts = statistics.quantiles(latencies, n=100)
+    return cuts[49] * 1000, cuts[98] * 1000
+
+
+async def measure(engine, users: int, queries: int) -> dict[str, tuple]:
+    async def get_all(repo, user):
+        await repo.get_all(limit=25, user=user, sort="name")
+
+    async def search(repo, user):
+        q = random.choice(LAST_NAMES)
+        await repo.search(None, None, None, user=user, q=q, limit=25)
+
+    results = {}
+    async with AsyncSession(engine) as session:
+        repo = ContactsRepository(session)
+        for name, query in (("get_all", get_all), ("search", search)):
+            latencies = []
+            for i in range(queries + queries // 10):
+                user = User(id=random.randint(1, users))
+                start = time.perf_counter()
+                await query(repo, user)
+                if i >= queries // 10:  # the first 10% warm the caches
+                    latencies.append(time.perf_counter() - start)
+            results[name] = percentiles(latencies)
+    return results
+
+
+async def run(args):
+    scales = [int(scale) for scale in args.scales.split(",")]
+    print(
+        f"{'layout':12} {'rows':>12} {'get_all p50':>12} {'p99':>8} "
+        f"{'search p50':>12} {'p99':>8}  (ms)"
+    )
+    for layout in ("plain", "partitioned"):
+        schema = f"bench_{layout}"
+        engine = create_async_engine(
+            args.dsn,
+            connect_args={"server_settings": {"search_path": f"{schema}, public"}},
+        )
+        async with engine.begin() as conn:
+            await conn.execute(text(f"DROP SCHEMA IF EXISTS {schema} CASCADE"))
+            await conn.execute(text(f"CREATE SCHEMA {schema}"))
+        try:
+            await create_layout(engine, layout, args.partitions)
+            rows = 0
+            for scale in scales:
+                total = args.base_rows * scale
+                await seed(engine, rows, total, args.contacts_per_user)
+                rows = total
+                results = await measure(
+                    engine, total // args.contacts_per_user, args.queries
+                )
+                print(
+                    f"{layout:12} {total:>12,} "
+                    f"{results['get_all'][0]:>12.2f} {results['get_all'][1]:>8.2f} "
+                    f"{results['search'][0]:>12.2f} {results['search'][1]:>8.2f}"
+                )
+        finally:
+            async with engine.begin() as conn:
+                await conn.execute(text(f"DROP SCHEMA {schema} CASCADE"))
+            await engine.dispose()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--dsn", required=True, help="postgresql+asyncpg:// URL")
+    parser.add_argument("--base-rows", type=int, default=100_000)
+    parser.add_argument("--scales", default="1,10,100")
+    parser.add_argument("--contacts-per-user", type=int, default=200)
+    parser.add_argument("--partitions", type=int, default=16)
+    parser.add_argument("--queries", type=int, default=2000)
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
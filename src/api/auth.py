@@ -1,10 +1,19 @@
-from fastapi import APIRouter, Depends, HTTPException, status, BackgroundTasks
+from fastapi import APIRouter, Depends, HTTPException, Request, status, BackgroundTasks
 from fastapi.security import OAuth2PasswordRequestForm
 from sqlalchemy.ext.asyncio import AsyncSession
-from src.services.auth import create_access_token
-from src.services.utils import Hash
+from src.api.routes import SessionReleasingRoute
+from src.services.auth import (
+    access_token_claims,
+    create_access_token,
+    get_current_user,
+    oauth2_scheme,
+    revoke_access_token,
+)
+from src.services.hashing import password_hasher
 from src.services.users import UserService
+from src.services.sessions import SessionService
 from src.repository.users import UserRepository
+from src.repository.sessions import SessionRepository
 from src.db.configurations import get_db_session as get_db
 from src.schemas.auth import (
     UserCreate,
@@ -12,12 +21,17 @@ from src.schemas.auth import (
     UserSchema,
     RefreshTokenRequest,
     ResetPasswordRequest,
+    LogoutRequest,
 )
 from src.conf.config import config
+from src.conf.limiter import limiter
+from src.api.exceptions import DuplicateEmailError
 
 from src.services.email import send_verification_email
 
-router = APIRouter(prefix="/auth", tags=["auth"])
+router = APIRouter(
+    prefix="/auth", tags=["auth"], route_class=SessionReleasingRoute
+)
 
 
 async def user_service(db: AsyncSession = Depends(get_db)):
@@ -31,8 +45,21 @@ async def user_service(db: AsyncSession = Depends(get_db)):
     return UserService(repo)
 
 
+async def session_service(db: AsyncSession = Depends(get_db)):
+    """
+    Dependency to get SessionService instance.
+    Args:
+        db (AsyncSession): Database session dependency.
+    Returns: SessionService instance.
+    """
+    repo = SessionRepository(db)
+    return SessionService(repo)
+
+
 @router.post("/signup", response_model=UserSchema, status_code=status.HTTP_201_CREATED)
+@limiter.limit(config.RATE_LIMIT_SIGNUP)
 async def register_user(
+    request: Request,
     body: UserCreate,
     background_tasks: BackgroundTasks,
     user_service: UserService = Depends(user_service),
@@ -40,13 +67,15 @@ async def register_user(
     """
     Register a new user.
     Args:
+        request (Request): The HTTP request object.
         body (UserCreate): User registration data.
         background_tasks (BackgroundTasks): FastAPI background tasks for sending email.
         user_service (UserService): User service dependency.
         Returns: Created user data.
     """
-    email_user = await user_service.get_user_by_email(body.email)
-    if email_user:
+    try:
+        user = await user_service.create_user(body)
+    except DuplicateEmailError:
         raise HTTPException(
             status_code=status.HTTP_409_CONFLICT,
             detail="User with this email already exists",
@@ -60,23 +89,34 @@ async def register_user(
         send_verification_email, body.email, token, user_info=body
     )
 
-    return await user_service.create_user(body)
+    return user
 
 
 @router.post("/login", response_model=Token, status_code=status.HTTP_200_OK)
+@limiter.limit(config.RATE_LIMIT_LOGIN)
 async def login_user(
+    request: Request,
     form_data: OAuth2PasswordRequestForm = Depends(),
     user_service: UserService = Depends(user_service),
+    session_service: SessionService = Depends(session_service),
 ):
     """
-    User login.
+    User login. Every login opens a separate session, so several devices can
+    stay signed in at the same time.
     Args:
+        request (Request): The HTTP request object.
         form_data (OAuth2PasswordRequestForm): Login form data.
         user_service (UserService): User service dependency.
+        session_service (SessionService): Session service dependency.
     Returns: Access token and refresh token.
     """
     user = await user_service.get_user_by_email(form_data.username)
-    if not user or not Hash().verify_password(form_data.password, user.hashed_password):
+    valid, new_hash = False, None
+    if user:
+        valid, new_hash = await password_hasher.verify_and_update(
+            form_data.password, user.hashed_password
+        )
+    if not valid:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect email or password",
@@ -89,11 +129,13 @@ async def login_user(
             detail="Email not verified",
         )
 
-    access_token = await create_access_token(data={"sub": user.email})
-    refresh_token = await create_access_token(
-        data={"sub": user.email}, expires_delta=7 * 24 * 3600
-    )  # 7 days
-    await user_service.update_refresh_token(user, refresh_token)
+    if new_hash:
+        await user_service.update_password_hash(user, new_hash)
+
+    access_token = await create_access_token(data=access_token_claims(user))
+    refresh_token = await session_service.create_session(
+        user, device=request.headers.get("user-agent")
+    )
     return {
         "access_token": access_token,
         "refresh_token": refresh_token,
@@ -104,39 +146,78 @@ async def login_user(
 @router.post("/refresh", response_model=Token, status_code=status.HTTP_200_OK)
 async def refresh_token(
     body: RefreshTokenRequest,
-    user_service: UserService = Depends(user_service),
+    session_service: SessionService = Depends(session_service),
 ):
     """
-    Refresh user access token.
+    Refresh user access token. The presented refresh token is rotated: it is
+    replaced by the returned one and cannot be used again.
     Args:
         body (RefreshTokenRequest): Refresh token request data.
-        user_service (UserService): User service dependency.
+        session_service (SessionService): Session service dependency.
     Returns: New access token and refresh token.
     """
     if body.refresh_token is None:
         raise HTTPException(status_code=400, detail="Refresh token is required")
-    user = await user_service.get_user_by_refresh_token(body.refresh_token)
-
-    if not user or user is None:
-        raise HTTPException(status_code=401, detail="Invalid refresh token")
-
-    db_refresh_token = await user_service.get_refresh_token(user)
+    rotated = await session_service.rotate_session(body.refresh_token)
 
-    if db_refresh_token != body.refresh_token:
+    if rotated is None:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid refresh token",
             headers={"WWW-Authenticate": "Bearer"},
         )
 
-    access_token = await create_access_token(data={"sub": user.email})
+    user, new_refresh_token = rotated
+    access_token = await create_access_token(data=access_token_claims(user))
     return {
         "access_token": access_token,
-        "refresh_token": db_refresh_token,
+        "refresh_token": new_refresh_token,
         "token_type": "bearer",
     }
 
 
+@router.post("/logout", status_code=status.HTTP_204_NO_CONTENT)
+async def logout(
+    body: LogoutRequest | None = None,
+    token: str = Depends(oauth2_scheme),
+    user: UserSchema = Depends(get_current_user),
+    session_service: SessionService = Depends(session_service),
+):
+    """
+    Log out the current device.
+    Args:
+        body (LogoutRequest | None): Optional refresh token of the session to end.
+        token (str): The access token to revoke.
+        user (UserSchema): The currently authenticated user.
+        session_service (SessionService): Session service dependency.
+    Returns: None
+    """
+    await revoke_access_token(token)
+    if body is not None and body.refresh_token:
+        await session_service.end_session(user.id, body.refresh_token)
+
+
+@router.post("/logout-all", status_code=status.HTTP_204_NO_CONTENT)
+async def logout_all(
+    token: str = Depends(oauth2_scheme),
+    user: UserSchema = Depends(get_current_user),
+    user_service: UserService = Depends(user_service),
+    session_service: SessionService = Depends(session_service),
+):
+    """
+    Log out every device: end all sessions and revoke all access tokens.
+    Args:
+        token (str): The access token to revoke.
+        user (UserSchema): The currently authenticated user.
+        user_service (UserService): User service dependency.
+        session_service (SessionService): Session service dependency.
+    Returns: None
+    """
+    await revoke_access_token(token)
+    await session_service.end_all_sessions(user.id)
+    await user_service.revoke_tokens(user.id)
+
+
 @router.get("/verify-email", status_code=status.HTTP_200_OK)
 async def verify_email(token: str, user_service: UserService = Depends(user_service)):
     """
@@ -146,19 +227,18 @@ async def verify_email(token: str, user_service: UserService = Depends(user_serv
         user_service (UserService): User service dependency.
     Returns: Success message.
     """
+    if await user_service.verify_email(token) is not None:
+        return {"detail": "Email verified successfully"}
+
+    # Nothing was updated; find out why (error path only).
     user = await user_service.get_user_by_email_verification_token(token)
     if not user:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail="User not found"
         )
-
-    if user.is_verified:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST, detail="Email already verified"
-        )
-
-    await user_service.verify_email(user)
-    return {"detail": "Email verified successfully"}
+    raise HTTPException(
+        status_code=status.HTTP_400_BAD_REQUEST, detail="Email already verified"
+    )
 
 
 @router.post("/reset-password", status_code=status.HTTP_200_OK)
@@ -184,10 +264,14 @@ async def reset_password(
             status_code=status.HTTP_400_BAD_REQUEST, detail="Email not verified"
         )
 
-    if not Hash().verify_password(body.old_password, user.hashed_password):
+    if not await password_hasher.verify(body.old_password, user.hashed_password):
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST, detail="Old password is incorrect"
         )
 
-    await user_service.reset_password(user, body.new_password)
+    if not await user_service.reset_password(user, body.new_password):
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Password was changed concurrently",
+        )
     return {"detail": "Password reset successfully"}
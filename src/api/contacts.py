@@ -1,14 +1,44 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Query, Path
-from src.db.configurations import get_db_session
+from typing import Literal
+
+from fastapi import (
+    APIRouter,
+    Depends,
+    HTTPException,
+    status,
+    Query,
+    Path,
+    Request,
+    Response,
+    UploadFile,
+    File,
+)
+from fastapi.responses import StreamingResponse
+from pydantic import TypeAdapter
+from src.api.routes import SessionReleasingRoute
+from src.db.configurations import get_db_session, get_streaming_session_factory
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from src.schemas.contacts import ContactSchema
+from src.api.exceptions import ImportFormatError
+from src.schemas.contacts import (
+    ContactBatchRequest,
+    ContactBatchResponse,
+    ContactImportResult,
+    ContactSchema,
+    ContactSuggestion,
+)
 from src.services.auth import get_current_user
 from src.services.contacts import ContactService
 from src.repository.contacts import ContactsRepository
+from src.services.pagination import set_next_link
+from src.services.contact_import import detect_format, read_records
+from src.services.contact_export import MEDIA_TYPES, stream_export
+from src.conf.config import config
 
+router = APIRouter(
+    prefix="/contacts", tags=["contacts"], route_class=SessionReleasingRoute
+)
 
-router = APIRouter(prefix="/contacts", tags=["contacts"])
+contact_list = TypeAdapter(list[ContactSchema])
 
 
 async def contact_service(db: AsyncSession = Depends(get_db_session)):
@@ -22,27 +52,61 @@ async def contact_service(db: AsyncSession = Depends(get_db_session)):
     return ContactService(repo)
 
 
+def contact_list_response(contacts: list[ContactSchema]) -> Response:
+    """
+    Serialize contacts read from the database into a JSON response.
+
+    FastAPI passes a returned list through the ``response_model`` validator
+    before serializing it; a returned Response is sent as is, so rows that
+    were validated on write are encoded in a single pass.
+    Args:
+        contacts (list[ContactSchema]): Contacts built from stored rows.
+    Returns:
+        Response: The JSON encoded list.
+    """
+    return Response(contact_list.dump_json(contacts), media_type="application/json")
+
+
 @router.get(
     "/",
     response_model=list[ContactSchema],
     status_code=status.HTTP_200_OK,
 )
 async def get_contacts(
-    skip: int = 0,
-    limit: int = 25,
+    request: Request,
+    limit: int = Query(25, ge=1, le=config.CONTACTS_MAX_PAGE_SIZE),
+    sort: Literal["id", "name", "created_at", "birthdate"] = Query("id"),
+    order: Literal["asc", "desc"] = Query("asc"),
+    cursor: str | None = Query(None, description="Cursor from the Link header"),
+    skip: int = Query(0, ge=0, deprecated=True),
     service: ContactService = Depends(contact_service),
     current_user=Depends(get_current_user),
 ):
     """
-    Retrieve a list of contacts for the current user with pagination.
+    Retrieve a page of contacts for the current user. Further pages are
+    linked from the ``Link: <...>; rel="next"`` response header.
     Args:
-        skip (int): Number of records to skip for pagination. Default is 0.
+        request (Request): The HTTP request object.
         limit (int): Maximum number of records to return. Default is 25.
+        sort (str): Field to sort by: id, name, created_at or birthdate.
+        order (str): Sort order, asc or desc.
+        cursor (str | None): Cursor of the page to return.
+        skip (int): Number of records to skip. Deprecated in favour of cursors.
         service (ContactService): Contact service dependency.
         current_user: The currently authenticated user.
-    Returns: A list of contacts belonging to the current user.
+    Returns: A page of contacts belonging to the current user.
     """
-    return await service.get_contacts(user=current_user, skip=skip, limit=limit)
+    contacts, next_cursor = await service.get_contacts(
+        user=current_user,
+        limit=limit,
+        skip=skip,
+        sort=sort,
+        descending=order == "desc",
+        cursor=cursor,
+    )
+    response = contact_list_response(contacts)
+    set_next_link(request, response, next_cursor)
+    return response
 
 
 @router.post(
@@ -65,6 +129,128 @@ async def create_contact(
     return await service.create_contact(contact, user=current_user)
 
 
+@router.post(
+    "/import",
+    response_model=ContactImportResult,
+    status_code=status.HTTP_200_OK,
+)
+async def import_contacts(
+    file: UploadFile = File(),
+    format: Literal["csv", "jsonl", "vcard"] | None = Query(
+        None, description="File format; guessed from the file name if omitted"
+    ),
+    service: ContactService = Depends(contact_service),
+    current_user=Depends(get_current_user),
+):
+    """
+    Import contacts from a CSV (with a name,email,phone,birthdate header),
+    JSON Lines or vCard file. Records that fail validation or whose email
+    already exists are skipped and reported; the rest are imported at once.
+    Args:
+        file (UploadFile): The file to import.
+        format (str | None): "csv", "jsonl" or "vcard".
+        service (ContactService): Contact service dependency.
+        current_user: The currently authenticated user.
+    Returns: Import counters and per-record errors.
+    """
+    format = format or detect_format(file.filename)
+    if format is None:
+        raise ImportFormatError("Unknown file format; pass ?format=csv|jsonl|vcard")
+    return await service.import_contacts(
+        read_records(file.file, format),
+        user=current_user,
+        batch_size=config.CONTACTS_IMPORT_BATCH_SIZE,
+        max_errors=config.CONTACTS_IMPORT_MAX_ERRORS,
+    )
+
+
+@router.post(
+    "/batch",
+    response_model=ContactBatchResponse,
+    status_code=status.HTTP_200_OK,
+    responses={409: {"model": ContactBatchResponse}},
+)
+async def batch_contacts(
+    body: ContactBatchRequest,
+    response: Response,
+    service: ContactService = Depends(contact_service),
+    current_user=Depends(get_current_user),
+):
+    """
+    Apply a list of create, update and delete operations in one transaction.
+    Deleting or updating a contact that does not exist, or using an email
+    another contact has, fails that operation. An atomic batch with a
+    failed operation is not applied at all and answers 409.
+    Args:
+        body (ContactBatchRequest): The operations and the atomic flag.
+        response (Response): The HTTP response object.
+        service (ContactService): Contact service dependency.
+        current_user: The currently authenticated user.
+    Returns: Whether the batch was applied, and a result per operation.
+    """
+    result = await service.apply_batch(
+        body.operations, user=current_user, atomic=body.atomic
+    )
+    if not result.applied:
+        response.status_code = status.HTTP_409_CONFLICT
+    return result
+
+
+@router.get(
+    "/autocomplete",
+    response_model=list[ContactSuggestion],
+    status_code=status.HTTP_200_OK,
+)
+async def autocomplete_contacts(
+    q: str = Query(..., min_length=1, max_length=100),
+    limit: int = Query(10, ge=1, le=50),
+    service: ContactService = Depends(contact_service),
+    current_user=Depends(get_current_user),
+):
+    """
+    Suggest contacts whose name words, email or phone start with what the
+    user typed. Served from an in-memory index of the user's contacts.
+    Args:
+        q (str): What the user typed.
+        limit (int): Maximum number of suggestions.
+        service (ContactService): Contact service dependency.
+        current_user: The currently authenticated user.
+    Returns: The best matching contacts.
+    """
+    return await service.autocomplete(q, user=current_user, limit=limit)
+
+
+@router.get(
+    "/export",
+    response_class=StreamingResponse,
+    responses={200: {"content": {media: {} for media in MEDIA_TYPES.values()}}},
+)
+async def export_contacts(
+    format: Literal["ndjson", "csv"] = Query("ndjson"),
+    session_factory=Depends(get_streaming_session_factory),
+    current_user=Depends(get_current_user),
+):
+    """
+    Stream all contacts of the current user as NDJSON or CSV. The file can
+    be imported again with POST /contacts/import.
+    Args:
+        format (str): "ndjson" or "csv".
+        session_factory: Opens the database session used by the stream.
+        current_user: The currently authenticated user.
+    Returns: A streaming response with the contacts.
+    """
+    return StreamingResponse(
+        stream_export(
+            session_factory,
+            current_user,
+            format,
+            fetch_size=config.CONTACTS_EXPORT_FETCH_SIZE,
+        ),
+        media_type=MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="contacts.{format}"'},
+    )
+
+
 @router.get(
     "/{contact_id}",
     response_model=ContactSchema,
@@ -88,6 +274,7 @@ async def get_contact(
 
 @router.patch(
     "/{contact_id}",
+    response_model=ContactSchema,
     status_code=status.HTTP_200_OK,
 )
 async def update_contact(
@@ -134,23 +321,66 @@ async def delete_contact(
     status_code=status.HTTP_200_OK,
 )
 async def search_contacts(
+    request: Request,
+    q: str | None = Query(None, description="Search name, email and phone"),
     name: str | None = Query(None, description="Filter by name"),
     email: str | None = Query(None, description="Filter by email"),
     phone: str | None = Query(None, description="Filter by phone"),
+    limit: int = Query(25, ge=1, le=config.CONTACTS_MAX_PAGE_SIZE),
+    cursor: str | None = Query(None, description="Cursor from the Link header"),
     service: ContactService = Depends(contact_service),
     current_user=Depends(get_current_user),
 ):
     """
-    Search for contacts based on the provided filters.
+    Search for contacts, best matches first. Further pages are linked from
+    the ``Link: <...>; rel="next"`` response header.
     Args:
+        request (Request): The HTTP request object.
+        q (str | None): Free-text query over name, email and phone.
         name (str | None): Filter by name.
         email (str | None): Filter by email.
         phone (str | None): Filter by phone.
+        limit (int): Maximum number of results per page.
+        cursor (str | None): Cursor of the page to return.
+        service (ContactService): Contact service dependency.
+        current_user: The currently authenticated user.
+    Returns: A page of contacts matching the search criteria.
+    """
+    contacts, next_cursor = await service.search_contacts(
+        name, email, phone, user=current_user, q=q, limit=limit, cursor=cursor
+    )
+    response = contact_list_response(contacts)
+    set_next_link(request, response, next_cursor)
+    return response
+
+
+@router.get(
+    "/by-phone/",
+    response_model=list[ContactSchema],
+    status_code=status.HTTP_200_OK,
+)
+async def find_contacts_by_phone(
+    phone: str = Query(..., min_length=1, max_length=32),
+    prefix: bool = Query(False, description="Match numbers starting with phone"),
+    limit: int = Query(25, ge=1, le=config.CONTACTS_MAX_PAGE_SIZE),
+    service: ContactService = Depends(contact_service),
+    current_user=Depends(get_current_user),
+):
+    """
+    Find contacts by phone number, whatever its formatting: "+1 (234)
+    567-890" and "1234567890" are the same number.
+    Args:
+        phone (str): The phone number, or its beginning if ``prefix`` is set.
+        prefix (bool): Match numbers starting with ``phone``.
+        limit (int): Maximum number of results.
         service (ContactService): Contact service dependency.
         current_user: The currently authenticated user.
-    Returns: A list of contacts matching the search criteria.
+    Returns: The matching contacts.
     """
-    return await service.search_contacts(name, email, phone, user=current_user)
+    contacts = await service.find_by_phone(
+        phone, user=current_user, prefix=prefix, limit=limit
+    )
+    return contact_list_response(contacts)
 
 
 @router.get(
@@ -159,14 +389,22 @@ async def search_contacts(
     status_code=status.HTTP_200_OK,
 )
 async def get_upcoming_birthdays(
+    days: int = Query(
+        config.CONTACTS_BIRTHDAY_WINDOW_DAYS,
+        ge=0,
+        le=365,
+        description="Days to look ahead; 0 means today only",
+    ),
     service: ContactService = Depends(contact_service),
     current_user=Depends(get_current_user),
 ):
     """
-    Get a list of upcoming birthdays for the current user.
+    Get a list of upcoming birthdays for the current user, soonest first.
     Args:
+        days (int): Number of days to look ahead.
         service (ContactService): Contact service dependency.
         current_user: The currently authenticated user.
     Returns: A list of contacts with upcoming birthdays.
     """
-    return await service.upcoming_birthdays(days=7, user=current_user)
+    contacts = await service.upcoming_birthdays(days=days, user=current_user)
+    return contact_list_response(contacts)
@@ -23,6 +23,29 @@ class ServerError(Exception):
         self.message = message
 
 
+class ServiceUnavailableError(Exception):
+    """Raised when a bounded resource is saturated and the request is shed."""
+
+    def __init__(self, message="Service is temporarily overloaded"):
+        super().__init__(message)
+        self.message = message
+
+
+class InvalidCursorError(Exception):
+    """Raised when a pagination cursor cannot be decoded or used."""
+
+    def __init__(self, message: str = "Invalid cursor"):
+        super().__init__(message)
+        self.message = message
+
+
+class ImportFormatError(Exception):
+    """Raised when an import file cannot be read at all."""
+
+    def __init__(self, message: str = "Unsupported import file"):
+        self.message = message
+
+
 # --- Handlers ---
 async def user_not_found_handler(request: Request, exc: UserNotFoundError):
     return JSONResponse(
@@ -43,3 +66,25 @@ async def server_error_handler(request: Request, exc: ServerError):
         status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
         content={"message": exc.message},
     )
+
+
+async def service_unavailable_handler(request: Request, exc: ServiceUnavailableError):
+    return JSONResponse(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        content={"message": exc.message},
+        headers={"Retry-After": "1"},
+    )
+
+
+async def invalid_cursor_handler(request: Request, exc: InvalidCursorError):
+    return JSONResponse(
+        status_code=status.HTTP_400_BAD_REQUEST,
+        content={"message": exc.message},
+    )
+
+
+async def import_format_handler(request: Request, exc: ImportFormatError):
+    return JSONResponse(
+        status_code=status.HTTP_400_BAD_REQUEST,
+        content={"message": exc.message},
+    )
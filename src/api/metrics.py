@@ -0,0 +1,33 @@
+from fastapi import APIRouter, Depends, status
+
+from src.api.routes import SessionReleasingRoute
+from src.db.configurations import sessionmanager
+from src.schemas.auth import UserSchema
+from src.services.auth import get_current_admin_user
+from src.services.auth_cache import principal_cache, token_versions
+from src.services.hashing import password_hasher
+from src.services.typeahead import typeahead
+
+
+router = APIRouter(
+    prefix="/metrics", tags=["metrics"], route_class=SessionReleasingRoute
+)
+
+
+@router.get("/", status_code=status.HTTP_200_OK)
+async def get_metrics(user: UserSchema = Depends(get_current_admin_user)):
+    """
+    Get in-process runtime metrics of this worker.
+    Args:
+        user (UserSchema): The currently authenticated admin user.
+    Returns: Counters of the in-process caches, worker pools and the
+        database connection pool.
+    """
+    return {
+        "principal_cache": principal_cache.stats(),
+        "token_versions": token_versions.stats(),
+        "password_hasher": password_hasher.stats(),
+        "typeahead": typeahead.stats(),
+        "db_pool": sessionmanager.pool_stats(),
+        "db_replica_pools": sessionmanager.replica_pool_stats(),
+    }
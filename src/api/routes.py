@@ -0,0 +1,39 @@
+import asyncio
+import functools
+
+from fastapi.routing import APIRoute
+
+from src.db.configurations import release_request_sessions
+
+
+def release_sessions_on_return(endpoint):
+    """
+    Wrap an async endpoint so that the request's unit of work is committed
+    and its database sessions released as soon as it returns, before the
+    response is serialized. If the endpoint raises, the work is rolled back.
+    Args:
+        endpoint: The endpoint function.
+    Returns:
+        The wrapped endpoint; sync endpoints are returned unchanged.
+    """
+    if not asyncio.iscoroutinefunction(endpoint):
+        return endpoint
+
+    @functools.wraps(endpoint)
+    async def wrapper(*args, **kwargs):
+        try:
+            result = await endpoint(*args, **kwargs)
+        except BaseException:
+            await release_request_sessions(commit=False)
+            raise
+        await release_request_sessions(commit=True)
+        return result
+
+    return wrapper
+
+
+class SessionReleasingRoute(APIRoute):
+    """Route that commits and returns pooled connections before serialization."""
+
+    def __init__(self, path: str, endpoint, **kwargs):
+        super().__init__(path, release_sessions_on_return(endpoint), **kwargs)
@@ -6,6 +6,7 @@ from fastapi import (
     UploadFile,
     File,
 )
+from src.api.routes import SessionReleasingRoute
 from src.db.configurations import get_db_session
 from sqlalchemy.ext.asyncio import AsyncSession
 
@@ -20,7 +21,9 @@ from src.services.upload_file import UploadFileService
 from src.conf.config import config as settings
 from src.redis.instance import cache_get, cache_set, redis_client
 
-router = APIRouter(prefix="/users", tags=["users"])
+router = APIRouter(
+    prefix="/users", tags=["users"], route_class=SessionReleasingRoute
+)
 
 
 async def user_service(db: AsyncSession = Depends(get_db_session)):
@@ -16,6 +16,38 @@ class BaseConfig(BaseSettings):
     JWT_SECRET: str = "your_jwt_secret"
     JWT_ALGORITHM: str = "HS256"
     JWT_EXPIRATION_SECONDS: int = 3600
+    REFRESH_TOKEN_EXPIRATION_SECONDS: int = 7 * 24 * 3600
+    SESSION_PURGE_BATCH_SIZE: int = 1000
+
+    PRINCIPAL_CACHE_SIZE: int = 10000
+    PRINCIPAL_CACHE_TTL_SECONDS: int = 60
+
+    # Stateless access tokens carry the principal claims; revocation is
+    # visible to other workers within TOKEN_VERSION_CACHE_TTL_SECONDS.
+    JWT_STATELESS: bool = False
+    TOKEN_VERSION_CACHE_SIZE: int = 100000
+    TOKEN_VERSION_CACHE_TTL_SECONDS: int = 30
+
+    # bcrypt runs on a process pool; 0 workers uses the default thread pool.
+    HASH_POOL_WORKERS: int = 2
+    HASH_MAX_PENDING: int = 32
+    # bcrypt cost; recalibrated at startup to fit HASH_TARGET_MS unless it is 0.
+    HASH_ROUNDS: int = 12
+    HASH_TARGET_MS: int = 250
+    HASH_MIN_ROUNDS: int = 10
+    HASH_MAX_ROUNDS: int = 14
+
+    CONTACTS_MAX_PAGE_SIZE: int = 100
+    CONTACTS_IMPORT_BATCH_SIZE: int = 1000
+    CONTACTS_IMPORT_MAX_ERRORS: int = 1000
+    CONTACTS_EXPORT_FETCH_SIZE: int = 1000
+    CONTACTS_BATCH_MAX_OPERATIONS: int = 500
+    CONTACTS_BIRTHDAY_WINDOW_DAYS: int = 7
+
+    # Per-user autocomplete indexes of a worker: (prefix, contact) postings
+    # held across users, roughly 100 bytes each.
+    TYPEAHEAD_MAX_POSTINGS: int = 2_000_000
+    TYPEAHEAD_TTL_SECONDS: int = 300
 
     API_HOST: str = "localhost"
     API_PORT: int = 8005
@@ -26,6 +58,21 @@ class BaseConfig(BaseSettings):
     DB_USER: str = "postgres"
     DB_PASSWORD: str = "postgres"
     DB_NAME: str = "postgres"
+    # Connection pool per worker; size the fleet against max_connections.
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT: float = 30
+    DB_POOL_RECYCLE: int = -1
+    DB_POOL_PRE_PING: bool = False
+    DB_POOL_USE_LIFO: bool = False
+    # SQLAlchemy compiled-statement cache and asyncpg prepared statements
+    # (per connection); set the latter to 0 behind PgBouncer transaction mode.
+    DB_QUERY_CACHE_SIZE: int = 500
+    DB_PREPARED_STATEMENT_CACHE_SIZE: int = 100
+    # Comma-separated read replica URLs; read-only queries are spread over them.
+    DB_REPLICA_URLS: str = ""
+    DB_REPLICA_STRATEGY: str = "round_robin"  # or "least_connections"
+    DB_READ_YOUR_WRITES_SECONDS: int = 5
 
     SMTP_HOST: str = "smtp.gmail.com"
     SMTP_PORT: int = 587
@@ -42,6 +89,16 @@ class BaseConfig(BaseSettings):
     # REDIS_DB: int = 0
     REDIS_PASSWORD: str = "your_redis_password"
 
+    # Empty means the Redis instance above; "memory://" keeps limits per worker.
+    RATE_LIMIT_STORAGE_URI: str = ""
+    RATE_LIMIT_STRATEGY: str = "moving-window"
+    RATE_LIMIT_LOGIN: str = "10/minute"
+    RATE_LIMIT_SIGNUP: str = "5/minute"
+
+    DENYLIST_BLOOM_CAPACITY: int = 100000
+    DENYLIST_BLOOM_ERROR_RATE: float = 0.001
+    DENYLIST_REBUILD_SECONDS: int = 300
+
     model_config = ConfigDict(
         env_file=".env", env_file_encoding="utf-8", case_sensitive=True
     )
@@ -52,6 +109,33 @@ class BaseConfig(BaseSettings):
             f"@{self.DB_HOST}:{self.DB_PORT}/{self.DB_NAME}"
         )
 
+    def db_replica_urls(self) -> list[str]:
+        return [url.strip() for url in self.DB_REPLICA_URLS.split(",") if url.strip()]
+
+    def db_engine_options(self) -> dict:
+        return {
+            **self.db_pool_options(),
+            "query_cache_size": self.DB_QUERY_CACHE_SIZE,
+            "connect_args": {
+                "prepared_statement_cache_size": self.DB_PREPARED_STATEMENT_CACHE_SIZE
+            },
+        }
+
+    def db_pool_options(self) -> dict:
+        return {
+            "pool_size": self.DB_POOL_SIZE,
+            "max_overflow": self.DB_MAX_OVERFLOW,
+            "pool_timeout": self.DB_POOL_TIMEOUT,
+            "pool_recycle": self.DB_POOL_RECYCLE,
+            "pool_pre_ping": self.DB_POOL_PRE_PING,
+            "pool_use_lifo": self.DB_POOL_USE_LIFO,
+        }
+
+    def rate_limit_storage_uri(self) -> str:
+        if self.RATE_LIMIT_STORAGE_URI:
+            return self.RATE_LIMIT_STORAGE_URI
+        return f"redis://:{self.REDIS_PASSWORD}@{self.REDIS_HOST}:{self.REDIS_PORT}/0"
+
 
 class ProdSettings(BaseConfig):
     """Production-specific settings."""
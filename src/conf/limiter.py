@@ -1,4 +1,39 @@
+from fastapi import Request
+from jose import JWTError, jwt
 from slowapi import Limiter
 from slowapi.util import get_remote_address
 
-limiter = Limiter(key_func=get_remote_address)
+from src.conf.config import config
+
+
+def rate_limit_key(request: Request) -> str:
+    """
+    Rate-limit key of a request: the authenticated user when a valid bearer
+    token is present, otherwise the client address.
+    Args:
+        request (Request): The HTTP request object.
+    Returns:
+        str: The bucket key.
+    """
+    authorization = request.headers.get("Authorization", "")
+    scheme, _, token = authorization.partition(" ")
+    if scheme.lower() == "bearer" and token:
+        try:
+            payload = jwt.decode(
+                token, config.JWT_SECRET, algorithms=[config.JWT_ALGORITHM]
+            )
+            return f"user:{payload.get('uid') or payload['sub']}"
+        except (JWTError, KeyError):
+            pass
+    return f"ip:{get_remote_address(request)}"
+
+
+# Counters live in Redis so that limits hold across workers and restarts; the
+# moving window is checked atomically by a single Lua script per hit. When
+# Redis is unreachable each worker falls back to in-memory buckets.
+limiter = Limiter(
+    key_func=rate_limit_key,
+    storage_uri=config.rate_limit_storage_uri(),
+    strategy=config.RATE_LIMIT_STRATEGY,
+    in_memory_fallback_enabled=True,
+)
@@ -0,0 +1,84 @@
+"""Add indexes for contacts and users hot paths
+
+Revision ID: 0501464aae09
+Revises: 8a67f7504b0c
+Create Date: 2026-10-18 02:27:50.053171
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0501464aae09'
+down_revision: Union[str, Sequence[str], None] = '8a67f7504b0c'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _fail_on_case_insensitive_duplicates(table: str, key: str) -> None:
+    if op.get_context().as_sql:
+        return
+    duplicates = op.get_bind().scalar(
+        sa.text(
+            f"SELECT count(*) FROM (SELECT 1 FROM {table} "
+            f"GROUP BY {key} HAVING count(*) > 1) AS duplicates"
+        )
+    )
+    if duplicates:
+        raise RuntimeError(
+            f"{duplicates} groups of {table} rows share {key}; "
+            "merge them before applying this revision"
+        )
+
+
+def upgrade() -> None:
+    """Upgrade schema.
+
+    Indexes are built with CREATE INDEX CONCURRENTLY on PostgreSQL, outside
+    of a transaction, so the tables stay writable. If a build fails, drop the
+    INVALID index it leaves behind before re-running.
+    """
+    _fail_on_case_insensitive_duplicates("users", "lower(email)")
+    _fail_on_case_insensitive_duplicates("contacts", "user_id, lower(email)")
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_contacts_user_id_id",
+            "contacts",
+            ["user_id", "id"],
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            "uq_contacts_user_id_lower_email",
+            "contacts",
+            ["user_id", sa.text("lower(email)")],
+            unique=True,
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            "ix_contacts_user_id_created_at",
+            "contacts",
+            ["user_id", "created_at"],
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            "uq_users_lower_email",
+            "users",
+            [sa.text("lower(email)")],
+            unique=True,
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        for table, index in [
+            ("users", "uq_users_lower_email"),
+            ("contacts", "ix_contacts_user_id_created_at"),
+            ("contacts", "uq_contacts_user_id_lower_email"),
+            ("contacts", "ix_contacts_user_id_id"),
+        ]:
+            op.drop_index(index, table_name=table, postgresql_concurrently=True)
@@ -0,0 +1,56 @@
+"""Add trigram search indexes on contacts
+
+Revision ID: 0ba4037da19a
+Revises: 0501464aae09
+Create Date: 2026-10-18 02:30:09.417851
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "0ba4037da19a"
+down_revision: Union[str, Sequence[str], None] = "0501464aae09"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+SEARCH_COLUMNS = ("name", "email", "phone")
+
+
+def upgrade() -> None:
+    """Upgrade schema.
+
+    PostgreSQL only: trigram GIN indexes serve both ILIKE '%term%' filters
+    and similarity ranking. The pg_trgm extension needs a role allowed to
+    create it; it is left installed on downgrade.
+    """
+    if op.get_context().dialect.name != "postgresql":
+        return
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    with op.get_context().autocommit_block():
+        for column in SEARCH_COLUMNS:
+            op.create_index(
+                f"ix_contacts_{column}_trgm",
+                "contacts",
+                [column],
+                postgresql_using="gin",
+                postgresql_ops={column: "gin_trgm_ops"},
+                postgresql_concurrently=True,
+            )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if op.get_context().dialect.name != "postgresql":
+        return
+    with op.get_context().autocommit_block():
+        for column in SEARCH_COLUMNS:
+            op.drop_index(
+                f"ix_contacts_{column}_trgm",
+                table_name="contacts",
+                postgresql_concurrently=True,
+            )
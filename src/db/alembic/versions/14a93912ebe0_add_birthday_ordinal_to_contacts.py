@@ -0,0 +1,113 @@
+"""Add birthday ordinal to contacts
+
+Revision ID: 14a93912ebe0
+Revises: cfa1695f883e
+Create Date: 2026-10-18 02:47:10.705104
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "14a93912ebe0"
+down_revision: Union[str, Sequence[str], None] = "cfa1695f883e"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+BACKFILL_BATCH_SIZE = 10000
+NOT_NULL_CHECK = "contacts_birthday_ordinal_not_null"
+
+contacts = sa.table(
+    "contacts",
+    sa.column("id", sa.Integer),
+    sa.column("birthdate", sa.Date),
+    sa.column("birthday_ordinal", sa.SmallInteger),
+)
+
+# Fills the column on every write, so application versions that do not know
+# about it keep working while and after it becomes NOT NULL.
+ORDINAL_FUNCTION = """
+CREATE FUNCTION contacts_birthday_ordinal() RETURNS trigger LANGUAGE plpgsql AS $$
+BEGIN
+    NEW.birthday_ordinal := extract(month FROM NEW.birthdate) * 100
+        + extract(day FROM NEW.birthdate);
+    RETURN NEW;
+END
+$$
+"""
+ORDINAL_TRIGGER = (
+    "CREATE TRIGGER contacts_birthday_ordinal "
+    "BEFORE INSERT OR UPDATE OF birthdate ON contacts "
+    "FOR EACH ROW EXECUTE FUNCTION contacts_birthday_ordinal()"
+)
+
+
+def upgrade() -> None:
+    """Upgrade schema.
+
+    A trigger fills the new column on insert and on birthdate updates,
+    whichever application version writes, so rows inserted after max(id)
+    was read are covered. Existing rows are backfilled over id ranges of
+    BACKFILL_BATCH_SIZE rows, each committed on its own, so no long-running
+    transaction holds row locks and no batch rescans rows already filled.
+    The column is then made NOT NULL without scanning the table under an
+    ACCESS EXCLUSIVE lock: a NOT VALID check constraint is validated while
+    writes continue, and SET NOT NULL relies on it. Finally it is indexed
+    concurrently.
+    """
+    op.add_column(
+        "contacts", sa.Column("birthday_ordinal", sa.SmallInteger(), nullable=True)
+    )
+    op.execute(ORDINAL_FUNCTION)
+    op.execute(ORDINAL_TRIGGER)
+    ordinal = sa.cast(
+        sa.extract("month", contacts.c.birthdate) * 100
+        + sa.extract("day", contacts.c.birthdate),
+        sa.SmallInteger,
+    )
+    with op.get_context().autocommit_block():
+        if op.get_context().as_sql:
+            op.execute(contacts.update().values(birthday_ordinal=ordinal))
+        else:
+            bind = op.get_bind()
+            max_id = bind.scalar(sa.select(sa.func.max(contacts.c.id))) or 0
+            for start in range(0, max_id, BACKFILL_BATCH_SIZE):
+                bind.execute(
+                    contacts.update()
+                    .where(
+                        contacts.c.id > start,
+                        contacts.c.id <= start + BACKFILL_BATCH_SIZE,
+                        contacts.c.birthday_ordinal.is_(None),
+                    )
+                    .values(birthday_ordinal=ordinal)
+                )
+        op.execute(
+            f"ALTER TABLE contacts ADD CONSTRAINT {NOT_NULL_CHECK} "
+            "CHECK (birthday_ordinal IS NOT NULL) NOT VALID"
+        )
+        op.execute(f"ALTER TABLE contacts VALIDATE CONSTRAINT {NOT_NULL_CHECK}")
+        op.alter_column("contacts", "birthday_ordinal", nullable=False)
+        op.drop_constraint(NOT_NULL_CHECK, "contacts")
+        op.create_index(
+            "ix_contacts_user_id_birthday_ordinal",
+            "contacts",
+            ["user_id", "birthday_ordinal"],
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            "ix_contacts_user_id_birthday_ordinal",
+            table_name="contacts",
+            postgresql_concurrently=True,
+        )
+    op.execute("DROP TRIGGER contacts_birthday_ordinal ON contacts")
+    op.execute("DROP FUNCTION contacts_birthday_ordinal()")
+    op.drop_column("contacts", "birthday_ordinal")
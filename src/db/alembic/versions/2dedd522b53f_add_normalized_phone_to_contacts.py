@@ -0,0 +1,124 @@
+"""Add normalized phone to contacts
+
+Revision ID: 2dedd522b53f
+Revises: 14a93912ebe0
+Create Date: 2026-10-18 02:51:34.456990
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "2dedd522b53f"
+down_revision: Union[str, Sequence[str], None] = "14a93912ebe0"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+BACKFILL_BATCH_SIZE = 10000
+
+contacts = sa.table(
+    "contacts",
+    sa.column("id", sa.Integer),
+    sa.column("phone", sa.String),
+    sa.column("phone_normalized", sa.String),
+)
+
+# Fills the column on every write with the rules of normalize_phone, so
+# application versions that do not know about it keep it up to date.
+NORMALIZE_FUNCTION = """
+CREATE FUNCTION contacts_phone_normalized() RETURNS trigger LANGUAGE plpgsql AS $$
+DECLARE
+    digits text := regexp_replace(
+        regexp_replace(NEW.phone, '[^0-9]', '', 'g'), '^00', ''
+    );
+BEGIN
+    NEW.phone_normalized := CASE
+        WHEN length(digits) BETWEEN 1 AND 15 THEN '+' || digits
+    END;
+    RETURN NEW;
+END
+$$
+"""
+NORMALIZE_TRIGGER = (
+    "CREATE TRIGGER contacts_phone_normalized "
+    "BEFORE INSERT OR UPDATE OF phone ON contacts "
+    "FOR EACH ROW EXECUTE FUNCTION contacts_phone_normalized()"
+)
+
+
+def upgrade() -> None:
+    """Upgrade schema.
+
+    A trigger fills the new column on insert and on phone updates, whichever
+    application version writes, including rows inserted during the
+    backfill. Existing rows are backfilled with the same rules as
+    src.db.models.normalize_phone, in SQL, over id ranges of
+    BACKFILL_BATCH_SIZE rows, each committed on its own; then it is indexed
+    concurrently, with a btree for exact and prefix lookups and a trigram
+    GIN index for substring search. Numbers that cannot be normalized stay NULL, so batches
+    walk the ids rather than the NULLs.
+    """
+    op.add_column(
+        "contacts", sa.Column("phone_normalized", sa.String(16), nullable=True)
+    )
+    op.execute(NORMALIZE_FUNCTION)
+    op.execute(NORMALIZE_TRIGGER)
+    digits = sa.func.regexp_replace(
+        sa.func.regexp_replace(contacts.c.phone, "[^0-9]", "", "g"), "^00", ""
+    )
+    normalized = sa.case(
+        (sa.func.length(digits).between(1, 15), sa.literal("+") + digits),
+        else_=sa.null(),
+    )
+    with op.get_context().autocommit_block():
+        if op.get_context().as_sql:
+            op.execute(contacts.update().values(phone_normalized=normalized))
+        else:
+            bind = op.get_bind()
+            max_id = bind.scalar(sa.select(sa.func.max(contacts.c.id))) or 0
+            for start in range(0, max_id, BACKFILL_BATCH_SIZE):
+                bind.execute(
+                    contacts.update()
+                    .where(
+                        contacts.c.id > start,
+                        contacts.c.id <= start + BACKFILL_BATCH_SIZE,
+                    )
+                    .values(phone_normalized=normalized)
+                )
+        op.create_index(
+            "ix_contacts_user_id_phone_normalized",
+            "contacts",
+            ["user_id", "phone_normalized"],
+            postgresql_ops={"phone_normalized": "varchar_pattern_ops"},
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            "ix_contacts_phone_normalized_trgm",
+            "contacts",
+            ["phone_normalized"],
+            postgresql_using="gin",
+            postgresql_ops={"phone_normalized": "gin_trgm_ops"},
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            "ix_contacts_phone_normalized_trgm",
+            table_name="contacts",
+            postgresql_concurrently=True,
+        )
+        op.drop_index(
+            "ix_contacts_user_id_phone_normalized",
+            table_name="contacts",
+            postgresql_concurrently=True,
+        )
+    op.execute("DROP TRIGGER contacts_phone_normalized ON contacts")
+    op.execute("DROP FUNCTION contacts_phone_normalized()")
+    op.drop_column("contacts", "phone_normalized")
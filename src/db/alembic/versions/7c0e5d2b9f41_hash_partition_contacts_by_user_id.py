@@ -0,0 +1,241 @@
+"""Hash partition contacts by user_id
+
+Revision ID: 7c0e5d2b9f41
+Revises: 2dedd522b53f
+Create Date: 2026-10-18 02:57:56.625232
+
+"""
+
+import time
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "7c0e5d2b9f41"
+down_revision: Union[str, Sequence[str], None] = "2dedd522b53f"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+PARTITIONS = 16
+BACKFILL_BATCH_SIZE = 10000
+SWAP_LOCK_TIMEOUT = "5s"
+SWAP_ATTEMPTS = 20
+
+# (name, unique, method, key) of the secondary indexes of contacts.
+INDEXES = [
+    ("uq_contacts_user_id_lower_email", True, "btree", "user_id, lower(email)"),
+    ("ix_contacts_user_id_name_id", False, "btree", "user_id, name, id"),
+    ("ix_contacts_user_id_birthdate_id", False, "btree", "user_id, birthdate, id"),
+    ("ix_contacts_user_id_created_at_id", False, "btree", "user_id, created_at, id"),
+    (
+        "ix_contacts_user_id_birthday_ordinal",
+        False,
+        "btree",
+        "user_id, birthday_ordinal",
+    ),
+    (
+        "ix_contacts_user_id_phone_normalized",
+        False,
+        "btree",
+        "user_id, phone_normalized varchar_pattern_ops",
+    ),
+    ("ix_contacts_name_trgm", False, "gin", "name gin_trgm_ops"),
+    ("ix_contacts_email_trgm", False, "gin", "email gin_trgm_ops"),
+    ("ix_contacts_phone_trgm", False, "gin", "phone gin_trgm_ops"),
+    (
+        "ix_contacts_phone_normalized_trgm",
+        False,
+        "gin",
+        "phone_normalized gin_trgm_ops",
+    ),
+]
+# Only needed without partitioning: the partitioned table's primary key is
+# (user_id, id).
+USER_ID_ID_INDEX = ("ix_contacts_user_id_id", False, "btree", "user_id, id")
+
+# (trigger and function name, source column) of the triggers filling derived
+# columns, from 14a93912ebe0 and 2dedd522b53f.
+DERIVED_COLUMN_TRIGGERS = [
+    ("contacts_birthday_ordinal", "birthdate"),
+    ("contacts_phone_normalized", "phone"),
+]
+
+# Mirrors every change to contacts into contacts_new while it is backfilled.
+# Both tables have the same columns in the same order.
+MIRROR_FUNCTION = """
+CREATE FUNCTION contacts_mirror() RETURNS trigger LANGUAGE plpgsql AS $$
+BEGIN
+    IF TG_OP IN ('UPDATE', 'DELETE') THEN
+        DELETE FROM contacts_new WHERE user_id = OLD.user_id AND id = OLD.id;
+    END IF;
+    IF TG_OP IN ('INSERT', 'UPDATE') AND NEW.user_id IS NOT NULL THEN
+        INSERT INTO contacts_new SELECT NEW.*;
+    END IF;
+    RETURN NULL;
+END
+$$
+"""
+
+
+def upgrade() -> None:
+    """Upgrade schema.
+
+    PostgreSQL only. Rebuilds contacts as a table hash-partitioned by user_id
+    into PARTITIONS partitions, while the application keeps reading and
+    writing the old table:
+
+    1. Create the partitioned contacts_new and a trigger mirroring every
+       write to contacts into it.
+    2. Copy contacts over id ranges of BACKFILL_BATCH_SIZE rows, each batch
+       committed on its own. FOR SHARE holds off concurrent updates and
+       deletes of a batch until it is copied, so the trigger cannot miss
+       them; ON CONFLICT DO NOTHING skips rows the trigger already copied.
+       Contacts without a user, which no query can reach, are not copied.
+    3. Build the secondary indexes partition by partition, concurrently, and
+       attach them to indexes on the parent; they are partition-aligned, and
+       queries filtering by user_id use one partition's indexes only.
+    4. Analyze the new table, then swap the tables in one short transaction
+       under an ACCESS EXCLUSIVE lock, retried with a lock timeout so that
+       waiting for it never queues the application's queries for long.
+
+    The primary key becomes (user_id, id), since unique constraints of a
+    partitioned table must include the partition key; ids still come from
+    contacts_id_seq.
+    """
+    if op.get_context().dialect.name != "postgresql":
+        return
+    _rebuild(partitions=PARTITIONS)
+
+
+def downgrade() -> None:
+    """Downgrade schema.
+
+    Rebuilds contacts unpartitioned with the same online procedure.
+    """
+    if op.get_context().dialect.name != "postgresql":
+        return
+    _rebuild(partitions=None)
+
+
+def _rebuild(partitions: int | None) -> None:
+    indexes = INDEXES if partitions else [USER_ID_ID_INDEX, *INDEXES]
+
+    op.execute(
+        "CREATE TABLE contacts_new (LIKE contacts INCLUDING DEFAULTS)"
+        + (" PARTITION BY HASH (user_id)" if partitions else "")
+    )
+    for i in range(partitions or 0):
+        op.execute(
+            f"CREATE TABLE contacts_p{i} PARTITION OF contacts_new "
+            f"FOR VALUES WITH (MODULUS {partitions}, REMAINDER {i})"
+        )
+    primary_key = "user_id, id" if partitions else "id"
+    op.execute(
+        "ALTER TABLE contacts_new "
+        f"ADD CONSTRAINT contacts_new_pkey PRIMARY KEY ({primary_key})"
+    )
+    if not partitions:
+        op.execute("ALTER TABLE contacts_new ALTER COLUMN user_id DROP NOT NULL")
+    op.execute(
+        "ALTER TABLE contacts_new ADD CONSTRAINT contacts_new_user_id_fkey "
+        "FOREIGN KEY (user_id) REFERENCES users (id) ON DELETE CASCADE"
+    )
+    op.execute(MIRROR_FUNCTION)
+    op.execute(
+        "CREATE TRIGGER contacts_mirror AFTER INSERT OR UPDATE OR DELETE "
+        "ON contacts FOR EACH ROW EXECUTE FUNCTION contacts_mirror()"
+    )
+
+    with op.get_context().autocommit_block():
+        _backfill()
+        for name, unique, method, key in indexes:
+            if not partitions:
+                _create_index(
+                    f"{name}_new",
+                    unique,
+                    method,
+                    key,
+                    "contacts_new",
+                    concurrently=True,
+                )
+                continue
+            _create_index(f"{name}_new", unique, method, key, "ONLY contacts_new")
+            for i in range(partitions):
+                _create_index(
+                    f"{name}_p{i}",
+                    unique,
+                    method,
+                    key,
+                    f"contacts_p{i}",
+                    concurrently=True,
+                )
+                op.execute(f"ALTER INDEX {name}_new ATTACH PARTITION {name}_p{i}")
+        # Before the swap, so the exclusive lock is not held while sampling.
+        op.execute("ANALYZE contacts_new")
+
+    _lock_contacts()
+    op.execute("DROP TRIGGER contacts_mirror ON contacts")
+    op.execute("DROP FUNCTION contacts_mirror()")
+    op.execute("ALTER SEQUENCE contacts_id_seq OWNED BY NONE")
+    op.execute("DROP TABLE contacts")
+    op.execute("ALTER TABLE contacts_new RENAME TO contacts")
+    op.execute("ALTER SEQUENCE contacts_id_seq OWNED BY contacts.id")
+    for constraint in ("pkey", "user_id_fkey"):
+        op.execute(
+            f"ALTER TABLE contacts RENAME CONSTRAINT contacts_new_{constraint} "
+            f"TO contacts_{constraint}"
+        )
+    for name, *_ in indexes:
+        op.execute(f"ALTER INDEX {name}_new RENAME TO {name}")
+    # LIKE does not copy triggers.
+    for name, columns in DERIVED_COLUMN_TRIGGERS:
+        op.execute(
+            f"CREATE TRIGGER {name} BEFORE INSERT OR UPDATE OF {columns} "
+            f"ON contacts FOR EACH ROW EXECUTE FUNCTION {name}()"
+        )
+
+
+def _backfill() -> None:
+    copy = "INSERT INTO contacts_new SELECT * FROM contacts WHERE user_id IS NOT NULL"
+    if op.get_context().as_sql:
+        op.execute(f"{copy} ON CONFLICT DO NOTHING")
+        return
+    bind = op.get_bind()
+    max_id = bind.scalar(sa.text("SELECT max(id) FROM contacts")) or 0
+    batch = sa.text(
+        f"{copy} AND id > :start AND id <= :end FOR SHARE ON CONFLICT DO NOTHING"
+    )
+    for start in range(0, max_id, BACKFILL_BATCH_SIZE):
+        bind.execute(batch, {"start": start, "end": start + BACKFILL_BATCH_SIZE})
+
+
+def _create_index(
+    name: str, unique: bool, method: str, key: str, table: str, concurrently=False
+) -> None:
+    op.execute(
+        f"CREATE {'UNIQUE ' if unique else ''}INDEX "
+        f"{'CONCURRENTLY ' if concurrently else ''}{name} "
+        f"ON {table} USING {method} ({key})"
+    )
+
+
+def _lock_contacts() -> None:
+    op.execute(f"SET LOCAL lock_timeout = '{SWAP_LOCK_TIMEOUT}'")
+    lock = "LOCK TABLE contacts IN ACCESS EXCLUSIVE MODE"
+    if op.get_context().as_sql:
+        op.execute(lock)
+        return
+    bind = op.get_bind()
+    for attempt in range(1, SWAP_ATTEMPTS + 1):
+        try:
+            # A savepoint per attempt: a timed-out LOCK only aborts it.
+            with bind.begin_nested():
+                bind.execute(sa.text(lock))
+            return
+        except sa.exc.DBAPIError:
+            if attempt == SWAP_ATTEMPTS:
+                raise
+            time.sleep(1)
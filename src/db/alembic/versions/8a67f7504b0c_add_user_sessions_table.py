@@ -0,0 +1,53 @@
+"""Add user_sessions table
+
+Revision ID: 8a67f7504b0c
+Revises: dac5ada108c5
+Create Date: 2026-10-18 02:10:11.303085
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8a67f7504b0c'
+down_revision: Union[str, Sequence[str], None] = 'dac5ada108c5'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema.
+
+    Refresh tokens move from users.refresh_token to per-device rows in
+    user_sessions; tokens issued before this revision stop working.
+    """
+    op.create_table(
+        "user_sessions",
+        sa.Column("id", sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column("user_id", sa.Integer(), nullable=False),
+        sa.Column("token_hash", sa.String(length=64), nullable=False),
+        sa.Column("device", sa.String(length=255), nullable=True),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.Column("last_used_at", sa.DateTime(), nullable=False),
+        sa.Column("expires_at", sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(["user_id"], ["users.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("token_hash"),
+    )
+    op.create_index("ix_user_sessions_user_id", "user_sessions", ["user_id"])
+    op.create_index("ix_user_sessions_expires_at", "user_sessions", ["expires_at"])
+    op.drop_column("users", "refresh_token")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.add_column(
+        "users",
+        sa.Column("refresh_token", sa.String(length=255), nullable=True),
+    )
+    op.drop_index("ix_user_sessions_expires_at", table_name="user_sessions")
+    op.drop_index("ix_user_sessions_user_id", table_name="user_sessions")
+    op.drop_table("user_sessions")
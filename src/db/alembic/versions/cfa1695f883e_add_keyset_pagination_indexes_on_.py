@@ -0,0 +1,56 @@
+"""Add keyset pagination indexes on contacts
+
+Revision ID: cfa1695f883e
+Revises: 0ba4037da19a
+Create Date: 2026-10-18 02:32:53.597229
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "cfa1695f883e"
+down_revision: Union[str, Sequence[str], None] = "0ba4037da19a"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# Each listing sort order gets a (user_id, <sort column>, id) index so a page
+# is one range scan, however deep it is.
+NEW_INDEXES = [
+    ("ix_contacts_user_id_name_id", ["user_id", "name", "id"]),
+    ("ix_contacts_user_id_birthdate_id", ["user_id", "birthdate", "id"]),
+    ("ix_contacts_user_id_created_at_id", ["user_id", "created_at", "id"]),
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema.
+
+    Built concurrently on PostgreSQL; (user_id, created_at, id) replaces
+    (user_id, created_at), which it covers.
+    """
+    with op.get_context().autocommit_block():
+        for name, columns in NEW_INDEXES:
+            op.create_index(name, "contacts", columns, postgresql_concurrently=True)
+        op.drop_index(
+            "ix_contacts_user_id_created_at",
+            table_name="contacts",
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_contacts_user_id_created_at",
+            "contacts",
+            ["user_id", "created_at"],
+            postgresql_concurrently=True,
+        )
+        for name, _ in reversed(NEW_INDEXES):
+            op.drop_index(name, table_name="contacts", postgresql_concurrently=True)
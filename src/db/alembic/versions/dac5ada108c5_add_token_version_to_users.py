@@ -0,0 +1,31 @@
+"""Add token_version to users
+
+Revision ID: dac5ada108c5
+Revises: 0fb21ed9f707
+Create Date: 2026-10-18 02:07:32.329070
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'dac5ada108c5'
+down_revision: Union[str, Sequence[str], None] = '0fb21ed9f707'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        "users",
+        sa.Column("token_version", sa.Integer(), server_default="0", nullable=False),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column("users", "token_version")
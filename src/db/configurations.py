@@ -1,20 +1,52 @@
 import contextlib
+from contextvars import ContextVar
 
 from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.ext.asyncio import (
     AsyncEngine,
+    AsyncSession,
     async_sessionmaker,
     create_async_engine,
 )
 
 from src.conf.config import config
+from src.db.pool import InstrumentedAsyncQueuePool
+from src.db.routing import ReplicaRouter, RoutingSession
+from src.db.unit_of_work import unit_of_work
+from src.redis.instance import redis_client
 
 
 class DatabaseSessionManager:
-    def __init__(self, url: str):
-        self._engine: AsyncEngine | None = create_async_engine(url)
+    def __init__(
+        self,
+        url: str,
+        replica_urls: list[str] = (),
+        replica_strategy: str = "round_robin",
+        read_your_writes_seconds: float = 5,
+        read_your_writes_store=None,
+        **engine_options,
+    ):
+        self._engine: AsyncEngine | None = create_async_engine(url, **engine_options)
+        self._replicas: list[AsyncEngine] = [
+            create_async_engine(replica_url, **engine_options)
+            for replica_url in replica_urls
+        ]
+        self._router = ReplicaRouter(
+            self._engine,
+            self._replicas,
+            strategy=replica_strategy,
+            read_your_writes_seconds=read_your_writes_seconds,
+            store=read_your_writes_store,
+        )
+        # Sessions may be released before the response is serialized, so
+        # loaded objects must stay readable after commit and close.
         self._session_maker: async_sessionmaker = async_sessionmaker(
-            autoflush=False, autocommit=False, bind=self._engine
+            autoflush=False,
+            autocommit=False,
+            expire_on_commit=False,
+            bind=self._engine,
+            sync_session_class=RoutingSession,
+            info={"router": self._router},
         )
 
     @contextlib.asynccontextmanager
@@ -30,10 +62,100 @@ class DatabaseSessionManager:
         finally:
             await session.close()
 
+    def pool_stats(self) -> dict | None:
+        """
+        Return usage counters of the engine's connection pool.
+        Returns:
+            dict | None: Pool metrics, or None if the pool is not instrumented.
+        """
+        pool = self._engine.pool if self._engine is not None else None
+        if not isinstance(pool, InstrumentedAsyncQueuePool):
+            return None
+        return pool.stats()
+
+    def replica_pool_stats(self) -> list[dict]:
+        """
+        Return usage counters of the replica connection pools.
+        Returns:
+            list[dict]: Pool metrics of each instrumented replica pool.
+        """
+        return [
+            replica.pool.stats()
+            for replica in self._replicas
+            if isinstance(replica.pool, InstrumentedAsyncQueuePool)
+        ]
+
+
+sessionmanager = DatabaseSessionManager(
+    config.db_url(),
+    replica_urls=config.db_replica_urls(),
+    replica_strategy=config.DB_REPLICA_STRATEGY,
+    read_your_writes_seconds=config.DB_READ_YOUR_WRITES_SECONDS,
+    read_your_writes_store=redis_client,
+    poolclass=InstrumentedAsyncQueuePool,
+    **config.db_engine_options(),
+)
+
+
+_request_sessions: ContextVar[list | None] = ContextVar(
+    "request_db_sessions", default=None
+)
+
 
-sessionmanager = DatabaseSessionManager(config.db_url())
+def track_request_session(session: AsyncSession):
+    """
+    Register a session to be released when the current endpoint returns.
+    Args:
+        session (AsyncSession): The request's database session.
+    Returns:
+        None: Nothing is returned.
+    """
+    sessions = _request_sessions.get()
+    if sessions is None:
+        sessions = []
+        _request_sessions.set(sessions)
+    sessions.append(session)
+
+
+async def release_request_sessions(commit: bool = True):
+    """
+    Finish the units of work of the current request and close its sessions,
+    returning their connections to the pool. A closed session can still be
+    used; it checks out a new connection on its next statement.
+    Args:
+        commit (bool): Commit the pending changes; otherwise they are rolled
+            back. Defaults to True.
+    Returns:
+        None: Nothing is returned.
+    """
+    sessions = _request_sessions.get()
+    if not sessions:
+        return
+    _request_sessions.set(None)
+    try:
+        for session in sessions:
+            if commit:
+                await unit_of_work(session).commit()
+    finally:
+        for session in sessions:
+            await session.close()
 
 
 async def get_db_session():
+    # The session checks out a connection only on its first statement.
     async with sessionmanager.session() as session:
+        track_request_session(session)
         yield session
+        # Normally already committed by SessionReleasingRoute.
+        await unit_of_work(session).commit()
+
+
+def get_streaming_session_factory():
+    """
+    Dependency for streaming responses. Their body is produced after the
+    endpoint returns and its dependencies are closed, so it opens its own
+    session with the returned factory instead of using the request's one.
+    Returns:
+        Callable: Returns an async context manager yielding an AsyncSession.
+    """
+    return sessionmanager.session
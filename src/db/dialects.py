@@ -0,0 +1,32 @@
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.asyncio import AsyncSession
+
+
+def dialect_name(db: AsyncSession) -> str:
+    """
+    Name of the SQL dialect a session is bound to.
+    Args:
+        db (AsyncSession): The database session.
+    Returns:
+        str: Dialect name, e.g. "postgresql" or "sqlite".
+    """
+    router = db.info.get("router")
+    if router is not None:
+        # Replicas share the primary's dialect; get_bind() inside a read-only
+        # method would pick a replica and skew the balancing.
+        return router.primary.dialect.name
+    return db.get_bind().dialect.name
+
+
+def dialect_insert(db: AsyncSession, entity):
+    """
+    Build an INSERT supporting ON CONFLICT for the session's dialect.
+    Args:
+        db (AsyncSession): The database session.
+        entity: The mapped class or table to insert into.
+    Returns:
+        Insert: A PostgreSQL or SQLite insert construct.
+    """
+    if dialect_name(db) == "sqlite":
+        return sqlite.insert(entity)
+    return postgresql.insert(entity)
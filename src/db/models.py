@@ -1,13 +1,32 @@
-from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column, relationship
-from sqlalchemy import Date, String, Column, String, func, ForeignKey, Enum as SqlEnum
+from sqlalchemy.orm import (
+    DeclarativeBase,
+    Mapped,
+    mapped_column,
+    relationship,
+    validates,
+)
+from sqlalchemy import (
+    Date,
+    String,
+    Column,
+    String,
+    func,
+    ForeignKey,
+    Index,
+    SmallInteger,
+    Enum as SqlEnum,
+)
 from enum import Enum
+import re
 from datetime import date, datetime
 from typing import Optional
 from sqlalchemy.sql.sqltypes import DateTime
 
 
 class Base(DeclarativeBase):
-    pass
+    # Fetch server-generated columns (id, created_at, ...) with RETURNING at
+    # flush time instead of reloading the row afterwards.
+    __mapper_args__ = {"eager_defaults": True}
 
 
 class UserRole(str, Enum):
@@ -24,15 +43,32 @@ class User(Base):
     email: Mapped[str] = mapped_column(String(100), nullable=False, unique=True)
     hashed_password: Mapped[str] = mapped_column(String(255), nullable=False)
     created_at: Mapped[datetime] = mapped_column(DateTime, default=func.now())
-    refresh_token: Mapped[Optional[str]] = mapped_column(String(255), nullable=True)
     is_verified: Mapped[bool] = mapped_column(default=False)
     avatar: Mapped[Optional[str]] = mapped_column(String(255), nullable=True)
     role: Mapped[UserRole] = mapped_column(
         SqlEnum(UserRole, name="userrole"), default=UserRole.USER, nullable=False
     )
+    token_version: Mapped[int] = mapped_column(
+        default=0, server_default="0", nullable=False
+    )
+
+
+# Emails are matched case-insensitively.
+Index("uq_users_lower_email", func.lower(User.email), unique=True)
+
+
+def _birthday_ordinal_default(context) -> int:
+    return birthday_ordinal(context.get_current_parameters()["birthdate"])
+
+
+def _phone_normalized_default(context) -> str | None:
+    return normalize_phone(context.get_current_parameters()["phone"])
 
 
 class Contacts(Base):
+    # On PostgreSQL the table is hash-partitioned by user_id (migration
+    # 7c0e5d2b9f41) with primary key (user_id, id): queries must filter by
+    # user_id to be pruned to one partition.
     __tablename__ = "contacts"
 
     id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
@@ -40,10 +76,156 @@ class Contacts(Base):
     email: Mapped[str] = mapped_column(String(100), nullable=False)
     phone: Mapped[str] = mapped_column(String(20), nullable=False)
     birthdate: Mapped[date | None] = mapped_column(Date, nullable=False)
+    # month * 100 + day of the birthdate, kept in sync by set_birthdate;
+    # Core inserts get it from the default.
+    birthday_ordinal: Mapped[int] = mapped_column(
+        SmallInteger, nullable=False, default=_birthday_ordinal_default
+    )
+    # normalize_phone(phone), kept in sync by set_phone; Core inserts get it
+    # from the default.
+    phone_normalized: Mapped[Optional[str]] = mapped_column(
+        String(16), nullable=True, default=_phone_normalized_default
+    )
     avatar: Mapped[Optional[str]] = mapped_column(String(255), nullable=True)
     created_at: Mapped[datetime] = mapped_column(DateTime, default=func.now())
 
-    user_id: Mapped[int | None] = mapped_column(
-        "user_id", ForeignKey("users.id", ondelete="CASCADE"), default=None
+    user_id: Mapped[int] = mapped_column(
+        "user_id", ForeignKey("users.id", ondelete="CASCADE"), nullable=False
     )
     user: Mapped["User"] = relationship("User", backref="contacts")
+
+    # Identify rows by (id, user_id), so that UPDATEs and DELETEs the ORM flushes
+    # carry the partition key. The table keeps id as its own primary key
+    # where it is not partitioned, so that it stays autoincrementing.
+    __mapper_args__ = {**Base.__mapper_args__, "primary_key": [id, user_id]}
+
+    @validates("birthdate")
+    def set_birthdate(self, key, value):
+        if isinstance(value, date):
+            self.birthday_ordinal = birthday_ordinal(value)
+        return value
+
+    @validates("phone")
+    def set_phone(self, key, value):
+        if isinstance(value, str):
+            self.phone_normalized = normalize_phone(value)
+        return value
+
+
+def birthday_ordinal(day: date) -> int:
+    """
+    Day-of-year key of a date that ignores the year: month * 100 + day.
+    Args:
+        day (date): The date.
+    Returns:
+        int: E.g. 1228 for December 28 and 229 for February 29.
+    """
+    return day.month * 100 + day.day
+
+
+_NON_DIGITS = re.compile(r"[^0-9]")
+
+
+def phone_digits(phone: str) -> str:
+    """
+    The digits of a phone number, without its formatting.
+    Args:
+        phone (str): The phone number as entered.
+    Returns:
+        str: E.g. "1234567890" for "+1 (234) 567-890".
+    """
+    return _NON_DIGITS.sub("", phone)
+
+
+def normalize_phone(phone: str) -> str | None:
+    """
+    E.164-style form of a phone number: "+" and its digits, without
+    formatting or a leading "00" international prefix. Numbers are not
+    checked against a numbering plan, so a number written without its
+    country code stays without one.
+    Args:
+        phone (str): The phone number as entered.
+    Returns:
+        str | None: E.g. "+1234567890" for "+1 (234) 567-890" and
+            "1234567890", or None if there are no digits or more than 15.
+    """
+    digits = phone_digits(phone)
+    if digits.startswith("00"):
+        digits = digits[2:]
+    return "+" + digits if 0 < len(digits) <= 15 else None
+
+
+# The (user_id, id) order is served by the primary key of the partitioned table.
+Index(
+    "uq_contacts_user_id_lower_email",
+    Contacts.user_id,
+    func.lower(Contacts.email),
+    unique=True,
+)
+# Keyset pagination of contact listings, one index per sort order.
+Index("ix_contacts_user_id_name_id", Contacts.user_id, Contacts.name, Contacts.id)
+Index(
+    "ix_contacts_user_id_birthdate_id",
+    Contacts.user_id,
+    Contacts.birthdate,
+    Contacts.id,
+)
+Index(
+    "ix_contacts_user_id_created_at_id",
+    Contacts.user_id,
+    Contacts.created_at,
+    Contacts.id,
+)
+Index(
+    "ix_contacts_user_id_birthday_ordinal",
+    Contacts.user_id,
+    Contacts.birthday_ordinal,
+)
+# Exact and prefix lookup by phone; the pattern operator class lets LIKE
+# 'prefix%' use the index under any collation.
+Index(
+    "ix_contacts_user_id_phone_normalized",
+    Contacts.user_id,
+    Contacts.phone_normalized,
+    postgresql_ops={"phone_normalized": "varchar_pattern_ops"},
+)
+# Trigram indexes for contact search (PostgreSQL with pg_trgm).
+Index(
+    "ix_contacts_name_trgm",
+    Contacts.name,
+    postgresql_using="gin",
+    postgresql_ops={"name": "gin_trgm_ops"},
+)
+Index(
+    "ix_contacts_email_trgm",
+    Contacts.email,
+    postgresql_using="gin",
+    postgresql_ops={"email": "gin_trgm_ops"},
+)
+Index(
+    "ix_contacts_phone_trgm",
+    Contacts.phone,
+    postgresql_using="gin",
+    postgresql_ops={"phone": "gin_trgm_ops"},
+)
+Index(
+    "ix_contacts_phone_normalized_trgm",
+    Contacts.phone_normalized,
+    postgresql_using="gin",
+    postgresql_ops={"phone_normalized": "gin_trgm_ops"},
+)
+
+
+class UserSession(Base):
+    __tablename__ = "user_sessions"
+
+    id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
+    user_id: Mapped[int] = mapped_column(
+        ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True
+    )
+    # SHA-256 hex digest of the refresh token; the token itself is never stored.
+    token_hash: Mapped[str] = mapped_column(String(64), nullable=False, unique=True)
+    device: Mapped[Optional[str]] = mapped_column(String(255), nullable=True)
+    created_at: Mapped[datetime] = mapped_column(DateTime, default=func.now())
+    last_used_at: Mapped[datetime] = mapped_column(DateTime, default=func.now())
+    expires_at: Mapped[datetime] = mapped_column(DateTime, nullable=False, index=True)
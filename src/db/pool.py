@@ -0,0 +1,85 @@
+import time
+
+from sqlalchemy import exc
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+from src.services.metrics import LatencyHistogram
+
+
+class PoolMetrics:
+    """
+    Counters of a connection pool, kept across pool re-creation.
+
+    Returns:
+        PoolMetrics: An instance of the PoolMetrics class.
+    """
+
+    def __init__(self):
+        self.checkout_wait = LatencyHistogram(
+            buckets=(0.1, 0.5, 1, 5, 10, 50, 100, 500, 1000, 5000, 30000)
+        )
+        self.checkouts = 0
+        self.checkout_timeouts = 0
+        self.connections_opened = 0
+        self.connections_closed = 0
+
+
+class InstrumentedAsyncQueuePool(AsyncAdaptedQueuePool):
+    """
+    Async queue pool that records checkout waits and connection churn.
+
+    Accepts the same arguments as ``AsyncAdaptedQueuePool``.
+
+    Returns:
+        InstrumentedAsyncQueuePool: An instance of the pool.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.metrics = PoolMetrics()
+
+    def connect(self):
+        start = time.perf_counter()
+        try:
+            return super().connect()
+        except exc.TimeoutError:
+            self.metrics.checkout_timeouts += 1
+            raise
+        finally:
+            self.metrics.checkouts += 1
+            self.metrics.checkout_wait.observe((time.perf_counter() - start) * 1000)
+
+    def _create_connection(self):
+        record = super()._create_connection()
+        self.metrics.connections_opened += 1
+        return record
+
+    def _close_connection(self, connection, *, terminate: bool = False):
+        self.metrics.connections_closed += 1
+        super()._close_connection(connection, terminate=terminate)
+
+    def recreate(self):
+        pool = super().recreate()
+        pool.metrics = self.metrics
+        return pool
+
+    def stats(self) -> dict:
+        """
+        Return the current pool usage and counters.
+        Returns:
+            dict: Pool size, checked-out, idle and overflow connections,
+            checkout wait histogram and connection churn.
+        """
+        metrics = self.metrics
+        return {
+            "size": self.size(),
+            "max_overflow": self._max_overflow,
+            "checked_out": self.checkedout(),
+            "idle": self.checkedin(),
+            "overflow": max(0, self.overflow()),
+            "checkouts": metrics.checkouts,
+            "checkout_timeouts": metrics.checkout_timeouts,
+            "checkout_wait": metrics.checkout_wait.stats(),
+            "connections_opened": metrics.connections_opened,
+            "connections_closed": metrics.connections_closed,
+        }
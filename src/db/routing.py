@@ -0,0 +1,220 @@
+import functools
+import inspect
+import itertools
+import time
+
+import redis.asyncio as redis
+from redis.exceptions import RedisError
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
+from sqlalchemy.orm import Session
+
+
+class ReplicaRouter:
+    """
+    Chooses the engine a statement runs on: writes go to the primary, reads
+    marked read-only go to a replica.
+
+    After a user's transaction that wrote to the primary commits, reads
+    made on behalf of that user stay on the primary for
+    ``read_your_writes_seconds``, so replication lag does not hide their own
+    changes. Each worker process tracks the windows it opened; with a
+    ``store``, they are also kept in Redis keys expiring with the window, so
+    the user's next request sees them on any worker.
+
+    Args:
+        primary (AsyncEngine): The primary engine.
+        replicas (list[AsyncEngine]): Read replica engines.
+        strategy (str): "round_robin" or "least_connections".
+        read_your_writes_seconds (float): Primary pinning window after a write.
+        store (redis.Redis | None): Redis client sharing the windows between
+            workers. Defaults to None (per process only).
+
+    Returns:
+        ReplicaRouter: An instance of the ReplicaRouter class.
+    """
+
+    strategies = ("round_robin", "least_connections")
+    key_prefix = "wrote:user:"
+
+    def __init__(
+        self,
+        primary: AsyncEngine,
+        replicas: list[AsyncEngine],
+        strategy: str = "round_robin",
+        read_your_writes_seconds: float = 5,
+        store: redis.Redis | None = None,
+    ):
+        if strategy not in self.strategies:
+            raise ValueError(f"Unknown replica strategy: {strategy}")
+        self.primary = primary.sync_engine
+        self.replicas = [replica.sync_engine for replica in replicas]
+        self.strategy = strategy
+        self.read_your_writes_seconds = read_your_writes_seconds
+        self.store = store
+        self._cycle = itertools.cycle(self.replicas)
+        self._recent_writes: dict[int, float] = {}
+
+    def choose_replica(self):
+        """
+        Pick the replica for the next read.
+        Returns:
+            Engine: The selected replica engine.
+        """
+        if self.strategy == "least_connections":
+            return min(self.replicas, key=lambda engine: engine.pool.checkedout())
+        return next(self._cycle)
+
+    def mark_write(self, user_id: int):
+        """
+        Pin a user's reads to the primary for the read-your-writes window.
+        Args:
+            user_id (int): The ID of the user who wrote.
+        Returns:
+            None: Nothing is returned.
+        """
+        now = time.monotonic()
+        if len(self._recent_writes) > 10000:
+            self._recent_writes = {
+                uid: until for uid, until in self._recent_writes.items() if until > now
+            }
+        self._recent_writes[user_id] = now + self.read_your_writes_seconds
+
+    def recently_wrote(self, user_id: int | None) -> bool:
+        """
+        Check whether a user is inside their read-your-writes window.
+        Args:
+            user_id (int | None): The ID of the user, if known.
+        Returns:
+            bool: True if the user's reads must go to the primary.
+        """
+        if user_id is None:
+            return False
+        until = self._recent_writes.get(user_id)
+        return until is not None and until > time.monotonic()
+
+    async def share_write(self, user_id: int):
+        """
+        Open a user's read-your-writes window for every worker.
+        Args:
+            user_id (int): The ID of the user who wrote.
+        Returns:
+            None: Nothing is returned.
+        """
+        if self.store is None:
+            return
+        try:
+            await self.store.set(
+                self.key_prefix + str(user_id),
+                1,
+                px=int(self.read_your_writes_seconds * 1000),
+            )
+        except (RedisError, OSError) as e:
+            print(f"❌ Could not share read-your-writes window: {e}")
+
+    async def wrote_recently(self, user_id: int) -> bool:
+        """
+        Check whether a user is inside a read-your-writes window opened by
+        any worker.
+        Args:
+            user_id (int): The ID of the user.
+        Returns:
+            bool: True if the user's reads must go to the primary.
+        """
+        if self.recently_wrote(user_id):
+            return True
+        if self.store is None:
+            return False
+        try:
+            return bool(await self.store.exists(self.key_prefix + str(user_id)))
+        except (RedisError, OSError):
+            # Without Redis the window is unknown; the primary is always fresh.
+            return True
+
+
+class RoutingSession(Session):
+    """Session that routes statements through the ``ReplicaRouter`` in its info."""
+
+    def get_bind(self, mapper=None, clause=None, **kw):
+        router = self.info.get("router")
+        if router is None or not router.replicas:
+            return super().get_bind(mapper, clause=clause, **kw)
+        if self._flushing or getattr(clause, "is_dml", False):
+            self.info["wrote"] = True
+            return router.primary
+        if (
+            self.info.get("read_only")
+            and not self.info.get("wrote")
+            and not self.info.get("recent_writer")
+            and not router.recently_wrote(self.info.get("user_id"))
+        ):
+            return router.choose_replica()
+        return router.primary
+
+
+@event.listens_for(RoutingSession, "after_commit")
+def _after_commit(session: Session):
+    router = session.info.get("router")
+    user_id = session.info.get("user_id")
+    if session.info.pop("wrote", False) and router and user_id is not None:
+        router.mark_write(user_id)
+        uow = session.info.get("unit_of_work")
+        if uow is not None and router.store is not None:
+            # Awaited by the unit of work before the response is sent.
+            uow.after_commit(functools.partial(router.share_write, user_id))
+
+
+@event.listens_for(RoutingSession, "after_rollback")
+def _after_rollback(session: Session):
+    session.info.pop("wrote", None)
+
+
+async def set_session_user(session: AsyncSession, user_id: int):
+    """
+    Record the user a session works for, so that routing keeps their reads
+    on the primary inside a read-your-writes window opened by any worker.
+    Args:
+        session (AsyncSession): The database session.
+        user_id (int): The ID of the user.
+    Returns:
+        None: Nothing is returned.
+    """
+    session.info["user_id"] = user_id
+    router = session.info.get("router")
+    if router is not None and router.replicas:
+        session.info["recent_writer"] = await router.wrote_recently(user_id)
+
+
+def read_only(method):
+    """
+    Mark a repository method as safe to run on a read replica.
+
+    The repository must keep its session in ``self.db``. Async generator
+    methods stay read-only until they are exhausted or closed.
+    """
+    if inspect.isasyncgenfunction(method):
+
+        @functools.wraps(method)
+        async def generator_wrapper(self, *args, **kwargs):
+            info = self.db.info
+            previous = info.get("read_only", False)
+            info["read_only"] = True
+            try:
+                async for item in method(self, *args, **kwargs):
+                    yield item
+            finally:
+                info["read_only"] = previous
+
+        return generator_wrapper
+
+    @functools.wraps(method)
+    async def wrapper(self, *args, **kwargs):
+        info = self.db.info
+        previous = info.get("read_only", False)
+        info["read_only"] = True
+        try:
+            return await method(self, *args, **kwargs)
+        finally:
+            info["read_only"] = previous
+
+    return wrapper
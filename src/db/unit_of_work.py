@@ -0,0 +1,74 @@
+import inspect
+from typing import Awaitable, Callable
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+
+class UnitOfWork:
+    """
+    Request-scoped unit of work over a database session.
+
+    Repositories only flush their changes; the unit of work commits them
+    once, when the request's endpoint returns, and then runs the callbacks
+    registered with ``after_commit``.
+
+    Args:
+        session (AsyncSession): The request's database session.
+
+    Returns:
+        UnitOfWork: An instance of the UnitOfWork class.
+    """
+
+    def __init__(self, session: AsyncSession):
+        self.session = session
+        self._after_commit: list[Callable[[], None | Awaitable[None]]] = []
+
+    def after_commit(self, callback: Callable[[], None | Awaitable[None]]):
+        """
+        Run a callback once the current transaction has been committed.
+        Coroutine callbacks are awaited.
+        Args:
+            callback (Callable[[], None | Awaitable[None]]): The callback, e.g.
+                a cache invalidation.
+        Returns:
+            None: Nothing is returned.
+        """
+        self._after_commit.append(callback)
+
+    async def commit(self):
+        """
+        Commit the session's transaction, if any, and run the after-commit
+        callbacks.
+        Returns:
+            None: Nothing is returned.
+        """
+        if self.session.in_transaction():
+            await self.session.commit()
+        callbacks, self._after_commit = self._after_commit, []
+        for callback in callbacks:
+            result = callback()
+            if inspect.isawaitable(result):
+                await result
+
+    async def rollback(self):
+        """
+        Roll back the session's transaction and drop the after-commit callbacks.
+        Returns:
+            None: Nothing is returned.
+        """
+        self._after_commit = []
+        await self.session.rollback()
+
+
+def unit_of_work(session: AsyncSession) -> UnitOfWork:
+    """
+    Return the unit of work bound to a session, creating it on first use.
+    Args:
+        session (AsyncSession): The database session.
+    Returns:
+        UnitOfWork: The session's unit of work.
+    """
+    uow = session.info.get("unit_of_work")
+    if uow is None:
+        uow = session.info["unit_of_work"] = UnitOfWork(session)
+    return uow
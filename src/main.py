@@ -3,17 +3,24 @@ Main application file for the FastAPI project.
 Sets up the FastAPI app, middleware, routes, and exception handlers.
 """
 
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
 from src.api.users import router as users_router
 from src.api.utils import router as utils_router
 from src.api.auth import router as auth_router
 from src.api.contacts import router as contacts_router
+from src.api.metrics import router as metrics_router
 import time
 from slowapi import _rate_limit_exceeded_handler
 from slowapi.middleware import SlowAPIMiddleware
 from slowapi.errors import RateLimitExceeded
 from src.conf.limiter import limiter
+from src.services.hashing import password_hasher
+from src.services.utils import Hash
+from src.conf.config import config
+from src.redis.denylist import token_denylist
 
 
 from src.api.exceptions import (
@@ -23,10 +30,28 @@ from src.api.exceptions import (
     duplicate_email_handler,
     ServerError,
     server_error_handler,
+    ServiceUnavailableError,
+    service_unavailable_handler,
+    InvalidCursorError,
+    invalid_cursor_handler,
+    ImportFormatError,
+    import_format_handler,
 )
 
 
-app = FastAPI()
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    if config.HASH_TARGET_MS:
+        Hash.calibrate(
+            config.HASH_TARGET_MS, config.HASH_MIN_ROUNDS, config.HASH_MAX_ROUNDS
+        )
+    await token_denylist.start()
+    yield
+    await token_denylist.stop()
+    password_hasher.shutdown()
+
+
+app = FastAPI(lifespan=lifespan)
 app.state.limiter = limiter
 app.add_middleware(
     CORSMiddleware,
@@ -55,6 +80,9 @@ def read_root():
 app.add_exception_handler(UserNotFoundError, user_not_found_handler)
 app.add_exception_handler(DuplicateEmailError, duplicate_email_handler)
 app.add_exception_handler(ServerError, server_error_handler)
+app.add_exception_handler(ServiceUnavailableError, service_unavailable_handler)
+app.add_exception_handler(InvalidCursorError, invalid_cursor_handler)
+app.add_exception_handler(ImportFormatError, import_format_handler)
 app.add_exception_handler(RateLimitExceeded, _rate_limit_exceeded_handler)
 
 
@@ -62,3 +90,4 @@ app.include_router(users_router, prefix="/api")
 app.include_router(utils_router, prefix="/api")
 app.include_router(auth_router, prefix="/api")
 app.include_router(contacts_router, prefix="/api")
+app.include_router(metrics_router, prefix="/api")
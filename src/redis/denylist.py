@@ -0,0 +1,194 @@
+import asyncio
+import hashlib
+import math
+import time
+
+import redis.asyncio as redis
+from redis.exceptions import RedisError
+
+from src.conf.config import config
+from src.redis.instance import redis_client
+
+
+class BloomFilter:
+    """
+    Fixed-size Bloom filter over strings.
+
+    Args:
+        capacity (int): Expected number of items.
+        error_rate (float): Target false-positive rate at ``capacity`` items.
+
+    Returns:
+        BloomFilter: An instance of the BloomFilter class.
+    """
+
+    def __init__(self, capacity: int, error_rate: float):
+        self.size = max(8, int(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hashes = max(1, round(self.size / capacity * math.log(2)))
+        self._bits = bytearray((self.size + 7) // 8)
+        self.count = 0
+
+    def _positions(self, item: str):
+        digest = hashlib.blake2b(item.encode("utf-8"), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        return ((h1 + i * h2) % self.size for i in range(self.hashes))
+
+    def add(self, item: str):
+        """
+        Add an item to the filter.
+        Args:
+            item (str): The item to add.
+        Returns:
+            None: Nothing is returned.
+        """
+        for position in self._positions(item):
+            self._bits[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+
+    def __contains__(self, item: str) -> bool:
+        bits = self._bits
+        return all(
+            bits[position >> 3] & (1 << (position & 7))
+            for position in self._positions(item)
+        )
+
+
+class TokenDenylist:
+    """
+    Denylist of revoked access-token IDs (``jti``).
+
+    Redis holds the authoritative entries, each expiring together with its
+    token. Every worker keeps a local Bloom filter of revoked IDs, seeded from
+    Redis on start and kept current through pub/sub, so that the common case
+    (a token that was never revoked) is answered without a Redis round-trip.
+    Bloom hits are confirmed against Redis. The filter is rebuilt
+    periodically to forget expired entries.
+
+    Args:
+        client (redis.Redis): Redis client.
+        capacity (int): Expected number of live revocations.
+        error_rate (float): Bloom filter false-positive rate.
+        rebuild_interval (float): Seconds between Bloom filter rebuilds.
+
+    Returns:
+        TokenDenylist: An instance of the TokenDenylist class.
+    """
+
+    key_prefix = "revoked:jti:"
+    channel = "revoked:jti"
+
+    def __init__(
+        self,
+        client: redis.Redis,
+        capacity: int,
+        error_rate: float,
+        rebuild_interval: float,
+    ):
+        self.client = client
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.rebuild_interval = rebuild_interval
+        self._bloom = BloomFilter(capacity, error_rate)
+        # Revocations made by this worker, kept so they hold while Redis is down.
+        self._local: dict[str, float] = {}
+        self._listener: asyncio.Task | None = None
+
+    async def revoke(self, jti: str, ttl: int):
+        """
+        Revoke a token until it expires.
+        Args:
+            jti (str): The token ID.
+            ttl (int): Remaining lifetime of the token in seconds.
+        Returns:
+            None: Nothing is returned.
+        """
+        if ttl <= 0:
+            return
+        self._bloom.add(jti)
+        self._local[jti] = time.monotonic() + ttl
+        try:
+            async with self.client.pipeline(transaction=False) as pipe:
+                pipe.setex(self.key_prefix + jti, ttl, 1)
+                pipe.publish(self.channel, jti)
+                await pipe.execute()
+        except (RedisError, OSError) as e:
+            print(f"❌ Could not publish token revocation: {e}")
+
+    async def is_revoked(self, jti: str) -> bool:
+        """
+        Check whether a token was revoked.
+        Args:
+            jti (str): The token ID.
+        Returns:
+            bool: True if the token was revoked.
+        """
+        if jti not in self._bloom:
+            return False
+        expires_at = self._local.get(jti)
+        if expires_at is not None:
+            if expires_at > time.monotonic():
+                return True
+            del self._local[jti]
+        try:
+            return bool(await self.client.exists(self.key_prefix + jti))
+        except (RedisError, OSError):
+            # Fail closed: the filter says the token is most likely revoked.
+            return True
+
+    async def start(self):
+        """Seed the Bloom filter from Redis and start the pub/sub listener."""
+        if self._listener is None:
+            self._listener = asyncio.create_task(self._listen())
+
+    async def stop(self):
+        """Stop the pub/sub listener."""
+        if self._listener is not None:
+            self._listener.cancel()
+            try:
+                await self._listener
+            except asyncio.CancelledError:
+                pass
+            self._listener = None
+
+    async def _rebuild(self):
+        bloom = BloomFilter(self.capacity, self.error_rate)
+        async for key in self.client.scan_iter(
+            match=self.key_prefix + "*", count=1000
+        ):
+            bloom.add(key[len(self.key_prefix) :])
+        now = time.monotonic()
+        self._local = {jti: exp for jti, exp in self._local.items() if exp > now}
+        for jti in self._local:
+            bloom.add(jti)
+        self._bloom = bloom
+
+    async def _listen(self):
+        while True:
+            try:
+                async with self.client.pubsub() as pubsub:
+                    await pubsub.subscribe(self.channel)
+                    await self._rebuild()
+                    rebuilt_at = time.monotonic()
+                    while True:
+                        message = await pubsub.get_message(
+                            ignore_subscribe_messages=True, timeout=1.0
+                        )
+                        if message is not None:
+                            self._bloom.add(message["data"])
+                        if time.monotonic() - rebuilt_at >= self.rebuild_interval:
+                            await self._rebuild()
+                            rebuilt_at = time.monotonic()
+            except asyncio.CancelledError:
+                raise
+            except (RedisError, OSError) as e:
+                print(f"❌ Token denylist listener error: {e}")
+                await asyncio.sleep(5)
+
+
+token_denylist = TokenDenylist(
+    redis_client,
+    capacity=config.DENYLIST_BLOOM_CAPACITY,
+    error_rate=config.DENYLIST_BLOOM_ERROR_RATE,
+    rebuild_interval=config.DENYLIST_REBUILD_SECONDS,
+)
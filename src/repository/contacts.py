@@ -1,7 +1,95 @@
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import extract, and_, or_, select
+from sqlalchemy import (
+    String,
+    and_,
+    bindparam,
+    case,
+    delete,
+    func,
+    literal,
+    or_,
+    select,
+    tuple_,
+    update,
+)
+import calendar
+import functools
 from datetime import date, timedelta
-from src.db.models import Contacts, User
+from src.db.dialects import dialect_insert, dialect_name
+from src.db.models import (
+    Contacts,
+    User,
+    birthday_ordinal,
+    normalize_phone,
+    phone_digits,
+)
+from src.db.routing import read_only
+from src.db.unit_of_work import unit_of_work
+from src.services.typeahead import Suggestion, typeahead
+
+# Hot lookups are built once and executed with bound parameters: their cache
+# key and SQL text (and so the asyncpg prepared statement) are reused.
+_CONTACT_BY_ID = select(Contacts).filter(
+    Contacts.id == bindparam("contact_id"), Contacts.user_id == bindparam("user_id")
+)
+_CONTACT_BY_EMAIL = select(Contacts).filter(
+    Contacts.user_id == bindparam("user_id"),
+    func.lower(Contacts.email) == func.lower(bindparam("email")),
+)
+
+# One step of a batch of updates, executed with a parameter list.
+_UPDATE_CONTACT_STEP = (
+    update(Contacts.__table__)
+    .where(
+        Contacts.__table__.c.id == bindparam("b_id"),
+        Contacts.__table__.c.user_id == bindparam("b_user_id"),
+    )
+    .execution_options(synchronize_session=False)
+)
+
+# Columns list endpoints return; read as plain row mappings, not entities.
+CONTACT_COLUMNS = (
+    Contacts.id,
+    Contacts.name,
+    Contacts.email,
+    Contacts.phone,
+    Contacts.birthdate,
+)
+
+# Columns contact listings can be sorted by; ties are broken by id.
+CONTACT_SORT_COLUMNS = {
+    "id": Contacts.id,
+    "name": Contacts.name,
+    "created_at": Contacts.created_at,
+    "birthdate": Contacts.birthdate,
+}
+
+
+def _escape_like(term: str) -> str:
+    return term.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+def _contains(term: str) -> str:
+    return f"%{_escape_like(term)}%"
+
+
+def _with_derived_columns(data: dict) -> dict:
+    # Set-based UPDATEs bypass the validators that keep these in sync.
+    data = dict(data)
+    if data.get("birthdate") is not None:
+        data["birthday_ordinal"] = birthday_ordinal(data["birthdate"])
+    if data.get("phone") is not None:
+        data["phone_normalized"] = normalize_phone(data["phone"])
+    return data
+
+
+def _birthday_window(today: date, days: int) -> tuple[int, int]:
+    end = today + timedelta(days=days)
+    start_ordinal, end_ordinal = birthday_ordinal(today), birthday_ordinal(end)
+    # February 29 birthdays are celebrated on March 1 in common years.
+    if start_ordinal == 301 and not calendar.isleap(today.year):
+        start_ordinal = 229
+    return start_ordinal, end_ordinal
 
 
 class ContactsRepository:
@@ -18,23 +106,99 @@ class ContactsRepository:
     def __init__(self, db: AsyncSession):
         self.db = db
 
-    async def get_all(self, limit: int, skip: int, user: User):
+    @read_only
+    async def get_all(
+        self,
+        limit: int,
+        user: User,
+        skip: int = 0,
+        sort: str = "id",
+        descending: bool = False,
+        after: tuple | None = None,
+    ):
         """
-        Retrieve all contacts for a specific user with pagination.
+        Retrieve a page of a user's contacts in a stable order.
+
+        Pages are continued with ``after``, the sort key of the last contact
+        of the previous page, so every page is a single index range scan.
         Args:
             limit (int): The maximum number of contacts to retrieve.
-            skip (int): The number of contacts to skip (for pagination).
             user (User): The user whose contacts are to be retrieved.
+            skip (int): The number of contacts to skip. Costs O(skip); prefer
+                ``after``. Ignored when ``after`` is given.
+            sort (str): One of ``CONTACT_SORT_COLUMNS``.
+            descending (bool): Sort in descending order.
+            after (tuple | None): (sort value, id) of the last contact already seen.
         Returns:
-            List[Contacts]: A list of contacts belonging to the user.
+            List[RowMapping]: ``CONTACT_COLUMNS`` and the sort column of each contact.
         """
-        result = await self.db.execute(
-            select(Contacts)
+        column = CONTACT_SORT_COLUMNS[sort]
+        key = [column, Contacts.id] if sort != "id" else [Contacts.id]
+        columns = list(CONTACT_COLUMNS)
+        if sort not in {col.key for col in CONTACT_COLUMNS}:
+            columns.append(column)  # the cursor needs the sort value
+        stmt = select(*columns).filter(Contacts.user_id == user.id)
+        if after is not None:
+            skip = 0
+            value, last_id = after
+            if sort == "created_at" and dialect_name(self.db) == "sqlite":
+                # SQLite stores timestamps as text; compare in the stored format.
+                value = literal(str(value), String)
+            bound = [value, last_id] if sort != "id" else [last_id]
+            stmt = stmt.filter(
+                tuple_(*key) < tuple_(*bound)
+                if descending
+                else tuple_(*key) > tuple_(*bound)
+            )
+        if descending:
+            key = [col.desc() for col in key]
+        result = await self.db.execute(stmt.order_by(*key).offset(skip).limit(limit))
+        return result.mappings().all()
+
+    @read_only
+    async def stream_all(self, user: User, fetch_size: int):
+        """
+        Stream all contacts of a user, ordered by id, through a server-side
+        cursor, so only ``fetch_size`` rows are held in memory at a time.
+        Args:
+            user (User): The user whose contacts are to be streamed.
+            fetch_size (int): Rows fetched from the cursor per round trip.
+        Returns:
+            AsyncIterator[list[RowMapping]]: Partitions of ``CONTACT_COLUMNS``.
+        """
+        result = await self.db.stream(
+            select(*CONTACT_COLUMNS)
             .filter(Contacts.user_id == user.id)
-            .offset(skip)
-            .limit(limit)
+            .order_by(Contacts.id)
+            .execution_options(yield_per=fetch_size)
+        )
+        try:
+            async for partition in result.mappings().partitions():
+                yield partition
+        finally:
+            await result.close()
+
+    @read_only
+    async def get_suggestions(self, user: User) -> list[Suggestion]:
+        """
+        Read the fields the typeahead index needs for all of a user's contacts.
+        Args:
+            user (User): The user whose contacts are read.
+        Returns:
+            list[Suggestion]: ID, name, email and phone of each contact.
+        """
+        result = await self.db.execute(
+            select(Contacts.id, Contacts.name, Contacts.email, Contacts.phone).filter(
+                Contacts.user_id == user.id
+            )
+        )
+        return [Suggestion(*row) for row in result.all()]
+
+    def _index_after_commit(self, contact: Contacts):
+        suggestion = Suggestion(contact.id, contact.name, contact.email, contact.phone)
+        unit_of_work(self.db).after_commit(
+            functools.partial(typeahead.upsert, contact.user_id, suggestion)
         )
-        return result.scalars().all()
 
     async def get_by_id(self, contact_id: int, user: User):
         """
@@ -46,9 +210,7 @@ class ContactsRepository:
             Contacts | None: The contact if found, otherwise None.
         """
         result = await self.db.execute(
-            select(Contacts).filter(
-                Contacts.id == contact_id, Contacts.user_id == user.id
-            )
+            _CONTACT_BY_ID, {"contact_id": contact_id, "user_id": user.id}
         )
         return result.scalar_one_or_none()
 
@@ -62,110 +224,339 @@ class ContactsRepository:
             Contacts | None: The contact if found, otherwise None.
         """
         result = await self.db.execute(
-            select(Contacts).filter(
-                Contacts.email == email, Contacts.user_id == user.id
-            )
+            _CONTACT_BY_EMAIL, {"email": email, "user_id": user.id}
         )
         return result.scalar_one_or_none()
 
     async def create(self, body: Contacts, user: User, avatar: str = None):
         """
-        Create a new contact for a specific user.
+        Create a new contact for a specific user in one INSERT that skips
+        the row if the user already has a contact with that email.
         Args:
             body (Contacts): The contact data to create.
             user (User): The user for whom the contact is to be created.
             avatar (str, optional): The avatar URL for the contact. Defaults to None.
         Returns:
-            Contacts: The created contacts.
+            Contacts | None: The created contact, or None if the email is taken.
+        """
+        stmt = (
+            dialect_insert(self.db, Contacts)
+            .values(**body.model_dump(), user_id=user.id, avatar=avatar)
+            .on_conflict_do_nothing(
+                index_elements=[Contacts.user_id, func.lower(Contacts.email)]
+            )
+            .returning(Contacts)
+        )
+        result = await self.db.execute(stmt)
+        contact = result.scalar_one_or_none()
+        if contact is not None:
+            self._index_after_commit(contact)
+        return contact
+
+    async def create_many(self, rows: list[dict], user: User) -> set[str]:
+        """
+        Insert contacts in one multi-row statement, skipping those whose
+        email the user already has.
+        Args:
+            rows (list[dict]): Contact columns per contact, without user_id.
+            user (User): The user for whom the contacts are created.
+        Returns:
+            set[str]: Lowercased emails of the contacts actually inserted.
+        """
+        if not rows:
+            return set()
+        # One cached statement executed with a parameter list; the driver
+        # layer ("insertmanyvalues") sends it as multi-row INSERTs.
+        stmt = (
+            dialect_insert(self.db, Contacts.__table__)
+            .on_conflict_do_nothing(
+                index_elements=[Contacts.user_id, func.lower(Contacts.email)]
+            )
+            .returning(func.lower(Contacts.email))
+        )
+        result = await self.db.execute(
+            stmt, [{**row, "user_id": user.id} for row in rows]
+        )
+        unit_of_work(self.db).after_commit(
+            functools.partial(typeahead.invalidate, user.id)
+        )
+        return set(result.scalars().all())
+
+    async def get_many(self, contact_ids: list[int], user: User) -> dict[int, Contacts]:
+        """
+        Retrieve several contacts of a user in one query.
+        Args:
+            contact_ids (list[int]): The IDs of the contacts.
+            user (User): The user whose contacts are to be retrieved.
+        Returns:
+            dict[int, Contacts]: The contacts found, by ID.
+        """
+        if not contact_ids:
+            return {}
+        result = await self.db.execute(
+            select(Contacts).filter(
+                Contacts.user_id == user.id, Contacts.id.in_(contact_ids)
+            )
+        )
+        return {contact.id: contact for contact in result.scalars().all()}
+
+    async def get_ids_by_emails(self, emails: list[str], user: User) -> dict[str, int]:
+        """
+        Find which of the given emails a user's contacts already use.
+        Args:
+            emails (list[str]): Lowercased emails.
+            user (User): The user whose contacts are checked.
+        Returns:
+            dict[str, int]: Contact ID by lowercased email, for emails in use.
+        """
+        if not emails:
+            return {}
+        email = func.lower(Contacts.email)
+        result = await self.db.execute(
+            select(email, Contacts.id).filter(
+                Contacts.user_id == user.id, email.in_(emails)
+            )
+        )
+        return dict(result.all())
+
+    async def write_batch(
+        self,
+        delete_ids: list[int],
+        updates: list[tuple[int, dict]],
+        creates: list[dict],
+        user: User,
+    ) -> list[Contacts]:
+        """
+        Write a batch of changes: one DELETE for all deleted contacts, one
+        executemany UPDATE for the update steps, then one flush of the inserts.
+        Args:
+            delete_ids (list[int]): IDs of the contacts to delete.
+            updates (list[tuple[int, dict]]): Contact ID and new values of
+                each update step, in the order they must be applied.
+            creates (list[dict]): Columns of the contacts to create, without user_id.
+            user (User): The user who owns the contacts.
+        Returns:
+            list[Contacts]: The created contacts, in the order of ``creates``.
         """
-        new_contacts = Contacts(**body.model_dump(), user_id=user.id, avatar=avatar)
-        self.db.add(new_contacts)
-        await self.db.commit()
-        await self.db.refresh(new_contacts)
-        return new_contacts
+        if delete_ids:
+            await self.db.execute(
+                delete(Contacts).filter(
+                    Contacts.user_id == user.id, Contacts.id.in_(delete_ids)
+                )
+            )
+        if updates:
+            # The steps run in the given order, not the primary key order of
+            # an ORM flush: a step may take an email an earlier one released,
+            # and the unique index is checked row by row.
+            await self.db.execute(
+                _UPDATE_CONTACT_STEP,
+                [
+                    {**_with_derived_columns(data), "b_id": id, "b_user_id": user.id}
+                    for id, data in updates
+                ],
+            )
+        created = [Contacts(**data, user_id=user.id) for data in creates]
+        self.db.add_all(created)
+        await self.db.flush()
+        unit_of_work(self.db).after_commit(
+            functools.partial(typeahead.invalidate, user.id)
+        )
+        return created
 
-    async def update(self, existing_contact: Contacts, data: dict):
+    async def update(self, contact_id: int, data: dict, user: User):
         """
-        Update an existing contact with new data.
+        Update a contact of a specific user in one UPDATE.
         Args:
-            existing_contact (Contacts): The contact to be updated.
+            contact_id (int): The ID of the contact to update.
             data (dict): A dictionary containing the updated contact data.
-            Returns:
-            None: Nothing is returned.
+            user (User): The user who owns the contact.
+        Returns:
+            Contacts | None: The updated contact, or None if the user has no
+                contact with that ID.
+        Raises:
+            IntegrityError: If the new email is used by another of the user's contacts.
         """
-        for field, value in data.items():
-            setattr(existing_contact, field, value)
-        await self.db.commit()
-        await self.db.refresh(existing_contact)
+        stmt = (
+            update(Contacts)
+            .filter(Contacts.id == contact_id, Contacts.user_id == user.id)
+            .values(**_with_derived_columns(data))
+            .returning(Contacts)
+        )
+        result = await self.db.execute(stmt)
+        contact = result.scalar_one_or_none()
+        if contact is not None:
+            self._index_after_commit(contact)
+        return contact
 
-    async def delete(self, contact: Contacts):
+    async def delete(self, contact_id: int, user: User) -> bool:
         """
-        Delete a contact from the database.
+        Delete a contact of a specific user in one DELETE.
         Args:
-            contact (Contacts): The contact to be deleted.
-            Returns:
-            None: Nothing is returned.
+            contact_id (int): The ID of the contact to delete.
+            user (User): The user who owns the contact.
+        Returns:
+            bool: Whether a contact was deleted.
         """
-        await self.db.delete(contact)
-        await self.db.commit()
+        result = await self.db.execute(
+            delete(Contacts)
+            .filter(Contacts.id == contact_id, Contacts.user_id == user.id)
+            .returning(Contacts.id)
+        )
+        if result.scalar_one_or_none() is None:
+            return False
+        unit_of_work(self.db).after_commit(
+            functools.partial(typeahead.remove, user.id, contact_id)
+        )
+        return True
 
+    @read_only
     async def search(
         self,
         name: str | None,
         email: str | None,
         phone: str | None,
         user: User,
+        q: str | None = None,
+        limit: int | None = None,
+        after: tuple | None = None,
     ):
         """
-        Search for contacts based on name, email, and/or phone for a specific user.
+        Search for contacts of a specific user, ranked by relevance to ``q``.
+
+        On PostgreSQL, matching and ranking use pg_trgm (trigram GIN indexes on
+        name, email and phone); other dialects rank exact, prefix and substring
+        matches. Results are ordered by rank, then id, and paginated by keyset.
         Args:
-            name (str | None): The name to search for (optional).
-            email (str | None): The email to search for (optional).
-            phone (str | None): The phone number to search for (optional).
+            name (str | None): Substring of the name (optional).
+            email (str | None): Substring of the email (optional).
+            phone (str | None): Substring of the phone number, ignoring
+                formatting if it has digits (optional).
             user (User): The user whose contacts are to be searched.
+            q (str | None): Free-text query over name, email and phone (optional).
+            limit (int | None): Maximum number of results (optional).
+            after (tuple | None): (rank, id) of the last result of the
+                previous page (optional).
             Returns:
-            List[Contacts]: A list of contacts matching the search criteria."""
-        query = select(Contacts).filter(Contacts.user_id == user.id)
+            List[RowMapping]: ``CONTACT_COLUMNS`` and rank of the matching contacts."""
+        rank = self._search_rank(q) if q else literal(0)
+        query = select(*CONTACT_COLUMNS, rank.label("rank")).filter(
+            Contacts.user_id == user.id
+        )
 
         if name:
-            query = query.where(Contacts.name.ilike(f"%{name}%"))
+            query = query.where(Contacts.name.ilike(_contains(name), escape="\\"))
         if email:
-            query = query.where(Contacts.email.ilike(f"%{email}%"))
+            query = query.where(Contacts.email.ilike(_contains(email), escape="\\"))
         if phone:
-            query = query.where(Contacts.phone.ilike(f"%{phone}%"))
+            digits = phone_digits(phone)
+            if digits:
+                # Ignores formatting: "234 567" matches "+1 (234) 567-890".
+                # A substring keeps a leading "00", unlike normalize_phone.
+                query = query.where(Contacts.phone_normalized.like(_contains(digits)))
+            else:
+                query = query.where(Contacts.phone.ilike(_contains(phone), escape="\\"))
+        if q:
+            query = query.where(self._search_match(q))
+        if after is not None:
+            last_rank, last_id = after
+            query = query.where(
+                or_(rank < last_rank, and_(rank == last_rank, Contacts.id > last_id))
+            )
 
+        query = query.order_by(rank.desc(), Contacts.id)
+        if limit is not None:
+            query = query.limit(limit)
         result = await self.db.execute(query)
-        return result.scalars().all()
+        return result.mappings().all()
 
-    async def upcoming_birthdays(self, days: int, user: User):
+    @read_only
+    async def find_by_phone(
+        self, phone_normalized: str, user: User, prefix: bool = False, limit: int = 25
+    ):
         """
-        Retrieve contacts with upcoming birthdays within a specified number of days for a specific user.
+        Retrieve contacts by normalized phone number with one range scan of
+        ``ix_contacts_user_id_phone_normalized``.
         Args:
-            days (int): The number of days to look ahead for upcoming birthdays.
-            user (User): The user whose contacts are to be checked for upcoming birthdays.
-            Returns:
-            List[Contacts]: A list of contacts with upcoming birthdays.
+            phone_normalized (str): Output of ``normalize_phone``.
+            user (User): The user whose contacts are looked up.
+            prefix (bool): Match numbers starting with ``phone_normalized``
+                instead of equal to it.
+            limit (int): Maximum number of results.
+        Returns:
+            List[RowMapping]: ``CONTACT_COLUMNS`` of the matching contacts.
         """
-        today = date.today()
-        upcoming = today + timedelta(days=days)
-
+        if prefix:
+            # Digits and "+" only, so there is nothing to escape.
+            match = Contacts.phone_normalized.like(phone_normalized + "%")
+        else:
+            match = Contacts.phone_normalized == phone_normalized
         query = (
-            select(Contacts)
-            .filter(Contacts.user_id == user.id)
-            .where(
-                or_(
-                    and_(
-                        extract("month", Contacts.birthdate) == today.month,
-                        extract("day", Contacts.birthdate) >= today.day,
-                        extract("day", Contacts.birthdate) <= upcoming.day,
-                    ),
-                    and_(
-                        extract("month", Contacts.birthdate) == upcoming.month,
-                        extract("day", Contacts.birthdate) <= upcoming.day,
-                    ),
+            select(*CONTACT_COLUMNS)
+            .filter(Contacts.user_id == user.id, match)
+            .order_by(Contacts.phone_normalized, Contacts.id)
+            .limit(limit)
+        )
+        result = await self.db.execute(query)
+        return result.mappings().all()
+
+    def _search_match(self, q: str):
+        pattern = _contains(q)
+        match = or_(
+            Contacts.name.ilike(pattern, escape="\\"),
+            Contacts.email.ilike(pattern, escape="\\"),
+            Contacts.phone.ilike(pattern, escape="\\"),
+        )
+        if dialect_name(self.db) == "postgresql":
+            # Typo-tolerant: a word of the name is trigram-similar to q.
+            match = or_(match, Contacts.name.op("%>")(q))
+        return match
+
+    def _search_rank(self, q: str):
+        if dialect_name(self.db) == "postgresql":
+            return func.greatest(
+                func.word_similarity(q, Contacts.name),
+                func.word_similarity(q, Contacts.email),
+                func.word_similarity(q, Contacts.phone),
+            )
+        term = q.lower()
+        prefix = _escape_like(term) + "%"
+        return func.max(
+            *(
+                case(
+                    (func.lower(column) == term, 3),
+                    (func.lower(column).like(prefix, escape="\\"), 2),
+                    else_=1,
                 )
+                for column in (Contacts.name, Contacts.email, Contacts.phone)
             )
         )
 
+    @read_only
+    async def upcoming_birthdays(
+        self, days: int, user: User, today: date | None = None
+    ):
+        """
+        Retrieve contacts whose birthday falls within the next ``days`` days,
+        soonest first, with an index range scan on ``birthday_ordinal``.
+        Args:
+            days (int): The number of days to look ahead; 0 means today only.
+            user (User): The user whose contacts are to be checked for upcoming birthdays.
+            today (date | None): The first day of the window. Defaults to today.
+            Returns:
+            List[RowMapping]: ``CONTACT_COLUMNS`` of contacts with upcoming birthdays.
+        """
+        today = today or date.today()
+        ordinal = Contacts.birthday_ordinal
+        query = select(*CONTACT_COLUMNS).filter(Contacts.user_id == user.id)
+        start, end = _birthday_window(today, days)
+        if days >= 365:
+            pass  # every birthday is in the window
+        elif start <= end:
+            query = query.where(ordinal.between(start, end))
+        else:  # the window wraps past December 31
+            query = query.where(or_(ordinal >= start, ordinal <= end))
+        # Soonest first: this year's remaining birthdays, then next year's.
+        query = query.order_by(ordinal < start, ordinal, Contacts.id)
+
         result = await self.db.execute(query)
-        return result.scalars().all()
+        return result.mappings().all()
@@ -0,0 +1,169 @@
+from datetime import datetime
+
+from sqlalchemy import delete, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.db.dialects import dialect_name
+from src.db.models import User, UserSession
+
+
+class SessionRepository:
+    """
+    Repository for managing refresh-token sessions in the database.
+
+    Args:
+        db (AsyncSession): The database session.
+
+    Returns:
+        SessionRepository: An instance of the SessionRepository class.
+    """
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def create(
+        self, user_id: int, token_hash: str, expires_at: datetime, device: str = None
+    ):
+        """
+        Create a new session for a user.
+        Args:
+            user_id (int): The ID of the user.
+            token_hash (str): Hash of the refresh token.
+            expires_at (datetime): When the session expires.
+            device (str, optional): Client description, e.g. the User-Agent.
+        Returns:
+            UserSession: The created session.
+        """
+        new_session = UserSession(
+            user_id=user_id,
+            token_hash=token_hash,
+            expires_at=expires_at,
+            device=device,
+        )
+        self.db.add(new_session)
+        await self.db.flush()
+        return new_session
+
+    async def rotate(
+        self,
+        token_hash: str,
+        new_token_hash: str,
+        now: datetime,
+        expires_at: datetime,
+    ):
+        """
+        Replace the refresh token of a live session in a single statement
+        (UPDATE ... FROM users ... RETURNING) that also returns the owner.
+        Args:
+            token_hash (str): Hash of the presented refresh token.
+            new_token_hash (str): Hash of the refresh token replacing it.
+            now (datetime): The current time.
+            expires_at (datetime): New expiry of the session.
+        Returns:
+            Row | None: id, email, name, surname, role and token_version of the
+            session owner, or None if the token is unknown or expired.
+        """
+        owner_columns = (
+            User.id,
+            User.email,
+            User.name,
+            User.surname,
+            User.role,
+            User.token_version,
+        )
+        stmt = (
+            update(UserSession)
+            .where(
+                UserSession.token_hash == token_hash,
+                UserSession.expires_at > now,
+            )
+            .values(token_hash=new_token_hash, last_used_at=now, expires_at=expires_at)
+            .execution_options(synchronize_session=False)
+        )
+        if dialect_name(self.db) == "sqlite":
+            # SQLite cannot return columns of UPDATE ... FROM tables; read the
+            # owner through correlated subqueries instead.
+            stmt = stmt.returning(
+                *(
+                    select(column)
+                    .where(User.id == UserSession.user_id)
+                    .scalar_subquery()
+                    .label(column.key)
+                    for column in owner_columns
+                )
+            )
+        else:
+            stmt = stmt.where(UserSession.user_id == User.id).returning(
+                *owner_columns
+            )
+        result = await self.db.execute(stmt)
+        return result.one_or_none()
+
+    async def get_by_token_hash(self, token_hash: str):
+        """
+        Retrieve a session by its refresh-token hash.
+        Args:
+            token_hash (str): Hash of the refresh token.
+        Returns:
+            UserSession | None: The session if found, otherwise None.
+        """
+        result = await self.db.execute(
+            select(UserSession).filter(UserSession.token_hash == token_hash)
+        )
+        return result.scalar_one_or_none()
+
+    async def delete_by_token_hash(self, token_hash: str, user_id: int):
+        """
+        Delete a session of a user by its refresh-token hash.
+        Args:
+            token_hash (str): Hash of the refresh token.
+            user_id (int): The ID of the session owner.
+        Returns:
+            bool: True if a session was deleted.
+        """
+        result = await self.db.execute(
+            delete(UserSession).where(
+                UserSession.token_hash == token_hash, UserSession.user_id == user_id
+            )
+        )
+        return result.rowcount > 0
+
+    async def delete_for_user(self, user_id: int):
+        """
+        Delete every session of a user.
+        Args:
+            user_id (int): The ID of the user.
+        Returns:
+            int: The number of deleted sessions.
+        """
+        result = await self.db.execute(
+            delete(UserSession).where(UserSession.user_id == user_id)
+        )
+        return result.rowcount
+
+    async def purge_expired(self, now: datetime, batch_size: int):
+        """
+        Delete expired sessions in batches, committing after each batch.
+        This is a maintenance job run outside requests, so unlike the other
+        methods it commits on its own to keep transactions short.
+        Args:
+            now (datetime): The current time.
+            batch_size (int): Maximum number of rows deleted per statement.
+        Returns:
+            int: The number of deleted sessions.
+        """
+        total = 0
+        while True:
+            expired_ids = (
+                select(UserSession.id)
+                .filter(UserSession.expires_at <= now)
+                .limit(batch_size)
+                .scalar_subquery()
+            )
+            result = await self.db.execute(
+                delete(UserSession).where(UserSession.id.in_(expired_ids))
+            )
+            await self.db.commit()
+            total += result.rowcount
+            if result.rowcount < batch_size:
+                return total
@@ -1,8 +1,20 @@
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import bindparam, func, select, update
+from src.db.dialects import dialect_insert
 from src.db.models import User
+from src.db.unit_of_work import unit_of_work
 from src.schemas.auth import UserCreate
-from src.api.utils import hash_password
+from src.services.auth_cache import invalidate_user
+
+# Hot lookups are built once and executed with bound parameters: their cache
+# key and SQL text (and so the asyncpg prepared statement) are reused.
+_USER_BY_ID = select(User).filter(User.id == bindparam("user_id"))
+_USER_BY_EMAIL = select(User).filter(
+    func.lower(User.email) == func.lower(bindparam("email"))
+)
+_TOKEN_VERSION = select(User.token_version).filter(User.id == bindparam("user_id"))
+# User fields copied into stateless access tokens (see create_access_token).
+_TOKEN_CLAIMS = ("name", "surname", "email", "role")
 
 
 class UserRepository:
@@ -19,18 +31,8 @@ class UserRepository:
     def __init__(self, db: AsyncSession):
         self.db = db
 
-    async def get_user_by_refresh_token(self, refresh_token: str):
-        """Retrieve a user by their refresh token.
-        Args:
-            refresh_token (str): The refresh token to search for.
-
-        Returns:
-            User | None: The user if found, otherwise None.
-        """
-        result = await self.db.execute(
-            select(User).filter(User.refresh_token == refresh_token)
-        )
-        return result.scalar_one_or_none()
+    def _invalidate_after_commit(self, email: str, user_id: int | None = None):
+        unit_of_work(self.db).after_commit(lambda: invalidate_user(email, user_id))
 
     async def get_all(self, limit: int, skip: int):
         """Retrieve all users with pagination.
@@ -53,7 +55,19 @@ class UserRepository:
         Returns:
             User | None: The user if found, otherwise None.
         """
-        result = await self.db.execute(select(User).filter(User.id == user_id))
+        result = await self.db.execute(_USER_BY_ID, {"user_id": user_id})
+        return result.scalar_one_or_none()
+
+    async def get_token_version(self, user_id: int):
+        """
+        Retrieve the current token version of a user.
+        Args:
+            user_id (int): The ID of the user.
+
+        Returns:
+            int | None: The token version if the user exists, otherwise None.
+        """
+        result = await self.db.execute(_TOKEN_VERSION, {"user_id": user_id})
         return result.scalar_one_or_none()
 
     async def get_by_email(self, email: str):
@@ -65,30 +79,36 @@ class UserRepository:
         Returns:
             User | None: The user if found, otherwise None.
         """
-        result = await self.db.execute(select(User).filter(User.email == email))
+        result = await self.db.execute(_USER_BY_EMAIL, {"email": email})
         return result.scalar_one_or_none()
 
-    async def create(self, body: UserCreate, avatar: str = None):
+    async def create(self, body: UserCreate, hashed_password: str, avatar: str = None):
         """Create a new user.
         Args:
             body (UserCreate): The user data.
+            hashed_password (str): Hash of body.password, computed off the
+                event loop by PasswordHasher.
             avatar (str, optional): The URL of the user's avatar. Defaults to None.
 
         Returns:
-            User | None: The created user if successful, otherwise None.
+            User | None: The created user, or None if the email is taken.
         """
 
-        hashed_password = hash_password(body.password)
         user_data = body.model_dump(exclude={"password"})
 
-        new_user = User(**user_data, hashed_password=hashed_password, avatar=avatar)
-        self.db.add(new_user)
-        await self.db.commit()
-        await self.db.refresh(new_user)
-        return new_user
+        # A single INSERT ... ON CONFLICT DO NOTHING RETURNING both checks the
+        # email and returns the generated columns.
+        result = await self.db.execute(
+            dialect_insert(self.db, User)
+            .values(**user_data, hashed_password=hashed_password, avatar=avatar)
+            .on_conflict_do_nothing(index_elements=[func.lower(User.email)])
+            .returning(User)
+        )
+        return result.scalar_one_or_none()
 
     async def update(self, existing_user: User, data: dict):
-        """Update an existing user.
+        """Update an existing user. Changing a field that access tokens carry
+        bumps the token version, so tokens with the old claims are rejected.
         Args:
             existing_user (User): The user to update.
             data (dict): The data to update the user with.
@@ -96,10 +116,16 @@ class UserRepository:
         Returns:
             User | None: The updated user if successful, otherwise None.
         """
+        email = existing_user.email
+        if any(
+            field in _TOKEN_CLAIMS and getattr(existing_user, field) != value
+            for field, value in data.items()
+        ):
+            existing_user.token_version = User.token_version + 1
         for field, value in data.items():
             setattr(existing_user, field, value)
-        await self.db.commit()
-        await self.db.refresh(existing_user)
+        await self.db.flush()
+        self._invalidate_after_commit(email, existing_user.id)
         return existing_user
 
     async def delete(self, user: User):
@@ -110,23 +136,83 @@ class UserRepository:
              Note: Nothing returned, user is deleted from the database.
         """
         try:
-            await self.db.delete(user)
-            await self.db.commit()
-            return True
+            # A savepoint keeps a failed delete from aborting the request's
+            # unit of work.
+            async with self.db.begin_nested():
+                await self.db.delete(user)
         except Exception as e:
-            await self.db.rollback()
             return False
+        self._invalidate_after_commit(user.email, user.id)
+        return True
+
+    async def confirm_email(self, email: str):
+        """Confirm a user's email with a single conditional UPDATE.
+        Args:
+            email (str): The email to confirm.
+            Returns:
+             int | None: The ID of the confirmed user, or None if there is no
+             unverified user with this email.
+        """
+        result = await self.db.execute(
+            update(User)
+            .where(
+                func.lower(User.email) == func.lower(email),
+                User.is_verified.is_(False),
+            )
+            .values(is_verified=True)
+            .returning(User.id)
+            .execution_options(synchronize_session=False)
+        )
+        user_id = result.scalar_one_or_none()
+        if user_id is not None:
+            self._invalidate_after_commit(email, user_id)
+        return user_id
+
+    async def set_password_hash(
+        self, user: User, hashed_password: str, revoke_tokens: bool = False
+    ):
+        """Replace a user's password hash if it was not changed concurrently.
+        Args:
+            user (User): The user, as loaded with their current hash.
+            hashed_password (str): The new password hash.
+            revoke_tokens (bool): Also bump the token version. Defaults to False.
+            Returns:
+             bool: True if the hash was replaced.
+        """
+        values = {"hashed_password": hashed_password}
+        if revoke_tokens:
+            values["token_version"] = User.token_version + 1
+        result = await self.db.execute(
+            update(User)
+            .where(User.id == user.id, User.hashed_password == user.hashed_password)
+            .values(**values)
+            .returning(User.id)
+            .execution_options(synchronize_session=False)
+        )
+        updated = result.scalar_one_or_none() is not None
+        if updated:
+            self._invalidate_after_commit(user.email, user.id)
+        return updated
 
-    async def confirm_email(self, user: User):
-        """Confirm a user's email.
+    async def bump_token_version(self, user_id: int):
+        """Increment a user's token version, revoking their access tokens.
         Args:
-            user (User): The user to confirm.
+            user_id (int): The ID of the user.
             Returns:
-             Note: Nothing returned, user's email is confirmed in the database.
+             int | None: The new token version, or None if the user is missing.
         """
-        user.is_verified = True
-        await self.db.commit()
-        await self.db.refresh(user)
+        result = await self.db.execute(
+            update(User)
+            .where(User.id == user_id)
+            .values(token_version=User.token_version + 1)
+            .returning(User.email, User.token_version)
+            .execution_options(synchronize_session=False)
+        )
+        row = result.one_or_none()
+        if row is None:
+            return None
+        self._invalidate_after_commit(row.email, user_id)
+        return row.token_version
 
     async def update_avatar_url(self, email: str, url: str):
         """
@@ -139,5 +225,5 @@ class UserRepository:
         """
         user = await self.get_by_email(email)
         user.avatar = url
-        await self.db.commit()
-        await self.db.refresh(user)
+        await self.db.flush()
+        self._invalidate_after_commit(email, user.id)
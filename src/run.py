@@ -1,3 +1,4 @@
+import asyncio
 import uvicorn
 from dotenv import load_dotenv
 import os
@@ -15,3 +16,17 @@ def prod():
     api_host = os.getenv("API_HOST")
     api_port = int(os.getenv("API_PORT"))
     uvicorn.run("src.main:app", host=api_host, port=api_port)
+
+
+def purge_sessions():
+    from src.db.configurations import sessionmanager
+    from src.repository.sessions import SessionRepository
+    from src.services.sessions import SessionService
+
+    async def purge():
+        async with sessionmanager.session() as session:
+            return await SessionService(
+                SessionRepository(session)
+            ).purge_expired_sessions()
+
+    print(f"Purged {asyncio.run(purge())} expired sessions")
@@ -30,6 +30,10 @@ class RefreshTokenRequest(BaseModel):
     refresh_token: str
 
 
+class LogoutRequest(BaseModel):
+    refresh_token: str | None = None
+
+
 class ResetPasswordRequest(BaseModel):
     email: EmailStr
     old_password: str = Field(..., min_length=6, max_length=100)
@@ -1,5 +1,8 @@
-from pydantic import BaseModel, Field, EmailStr
+from pydantic import BaseModel, Field, EmailStr, model_validator
 from datetime import date
+from typing import Literal
+
+from src.conf.config import config
 
 
 class ContactSchema(BaseModel):
@@ -31,3 +34,60 @@ class ContactSchema(BaseModel):
     model_config = {
         "from_attributes": True,
     }
+
+
+class ContactSuggestion(BaseModel):
+    id: int
+    name: str
+    email: str
+    phone: str
+
+
+class ImportRowError(BaseModel):
+    row: int = Field(..., description="1-based number of the record in the file")
+    message: str
+
+
+class ContactImportResult(BaseModel):
+    total: int = Field(0, description="Records read from the file")
+    imported: int = Field(0, description="Contacts created")
+    duplicates: int = Field(0, description="Records skipped as duplicate emails")
+    invalid: int = Field(0, description="Records that failed validation")
+    errors: list[ImportRowError] = Field(
+        default_factory=list,
+        description="Per-record errors and skipped duplicates, the first ones only",
+    )
+
+
+class ContactBatchOperation(BaseModel):
+    op: Literal["create", "update", "delete"]
+    id: int | None = Field(None, description="Contact ID, for update and delete")
+    data: ContactSchema | None = Field(None, description="For create and update")
+
+    @model_validator(mode="after")
+    def check_fields(self):
+        if self.op != "create" and self.id is None:
+            raise ValueError(f"{self.op} needs an id")
+        if self.op != "delete" and self.data is None:
+            raise ValueError(f"{self.op} needs data")
+        return self
+
+
+class ContactBatchRequest(BaseModel):
+    operations: list[ContactBatchOperation] = Field(
+        ..., min_length=1, max_length=config.CONTACTS_BATCH_MAX_OPERATIONS
+    )
+    atomic: bool = Field(True, description="Apply nothing if any operation fails")
+
+
+class ContactBatchResult(BaseModel):
+    index: int = Field(..., description="Position of the operation in the request")
+    op: str
+    id: int | None = None
+    status: int = Field(..., description="HTTP status of the operation")
+    message: str | None = None
+
+
+class ContactBatchResponse(BaseModel):
+    applied: bool = Field(..., description="False if an atomic batch was rejected")
+    results: list[ContactBatchResult]
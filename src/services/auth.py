@@ -1,5 +1,6 @@
 from datetime import datetime, timedelta, UTC
 from typing import Optional
+from uuid import uuid4
 
 from fastapi import Depends, HTTPException, status
 
@@ -8,15 +9,21 @@ from fastapi.security import OAuth2PasswordBearer
 from jose import JWTError, jwt
 
 from src.db.configurations import get_db_session
+from src.db.routing import set_session_user
 from src.conf.config import config
 from src.services.users import UserService
 from src.repository.users import UserRepository
 from src.schemas.auth import UserSchema
+from src.redis.denylist import token_denylist
+from src.services.auth_cache import (
+    principal_cache,
+    token_fingerprint,
+    token_versions,
+)
 
 from sqlalchemy.ext.asyncio import AsyncSession
 from src.db.models import User, UserRole
 
-
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/auth/login")
 
 
@@ -27,12 +34,71 @@ async def create_access_token(data: dict, expires_delta: Optional[int] = None):
     else:
         expire = datetime.now(UTC) + timedelta(seconds=config.JWT_EXPIRATION_SECONDS)
     to_encode.update({"exp": expire})
+    to_encode.setdefault("jti", uuid4().hex)
     encoded_jwt = jwt.encode(
         to_encode, config.JWT_SECRET, algorithm=config.JWT_ALGORITHM
     )
     return encoded_jwt
 
 
+def access_token_claims(user: User) -> dict:
+    """
+    Build the claims of an access token for a user.
+
+    The token carries the user's token version, so bumping the version
+    revokes it. In stateless mode it also carries the principal, so that it
+    can be validated without loading the user row.
+    Args:
+        user (User): The user the token is issued for.
+    Returns:
+        dict: Claims to pass to create_access_token.
+    """
+    claims = {"sub": user.email, "ver": user.token_version}
+    if config.JWT_STATELESS:
+        claims.update(
+            {
+                "uid": user.id,
+                "role": UserRole(user.role).value,
+                "name": user.name,
+                "surname": user.surname,
+            }
+        )
+    return claims
+
+
+async def revoke_access_token(token: str):
+    """
+    Revoke an access token for the rest of its lifetime.
+    Args:
+        token (str): The raw, already validated JWT.
+    Returns:
+        None: Nothing is returned.
+    """
+    payload = jwt.decode(token, config.JWT_SECRET, algorithms=[config.JWT_ALGORITHM])
+    jti = payload.get("jti")
+    if jti is None:
+        return
+    ttl = int(payload["exp"] - datetime.now(UTC).timestamp()) + 1
+    await token_denylist.revoke(jti, ttl)
+
+
+async def get_token_version(user_id: int, db: AsyncSession) -> int | None:
+    """
+    Get the current token version of a user, served from the in-process map.
+    Args:
+        user_id (int): The ID of the user.
+        db (AsyncSession): Database session used on a cache miss.
+    Returns:
+        int | None: The token version, or None if the user does not exist.
+    """
+    version = token_versions.get(user_id)
+    if version is None:
+        version = await UserRepository(db).get_token_version(user_id)
+        if version is not None:
+            token_versions.set(user_id, version)
+    return version
+
+
 async def get_current_user(
     token: str = Depends(oauth2_scheme), db: AsyncSession = Depends(get_db_session)
 ) -> UserSchema:
@@ -51,12 +117,44 @@ async def get_current_user(
             raise credentials_exception
     except JWTError as e:
         raise credentials_exception
+
+    jti = payload.get("jti")
+    if jti is not None and await token_denylist.is_revoked(jti):
+        raise credentials_exception
+
+    if config.JWT_STATELESS and "uid" in payload:
+        version = await get_token_version(payload["uid"], db)
+        if version is None or version != payload.get("ver"):
+            raise credentials_exception
+        # Lets replica routing honour the user's read-your-writes window.
+        await set_session_user(db, payload["uid"])
+        return UserSchema(
+            id=payload["uid"],
+            name=payload["name"],
+            surname=payload["surname"],
+            email=username,
+            role=payload["role"],
+        )
+
+    fingerprint = token_fingerprint(token)
+    cached_user = principal_cache.get(username, fingerprint)
+    if cached_user is not None:
+        await set_session_user(db, cached_user.id)
+        return cached_user
+
     user_repo = UserRepository(db)
     user_service = UserService(user_repo)
     user_db = await user_service.get_user_by_email(username)
     if user_db is None:
         raise credentials_exception
-    return UserSchema.model_validate(user_db)
+    if payload.get("ver", user_db.token_version) != user_db.token_version:
+        raise credentials_exception
+    user = UserSchema.model_validate(user_db)
+    await set_session_user(db, user.id)
+    expires_at = payload.get("exp")
+    ttl = expires_at - datetime.now(UTC).timestamp() if expires_at else None
+    principal_cache.set(username, fingerprint, user, ttl=ttl)
+    return user
 
 
 def get_current_admin_user(current_user: User = Depends(get_current_user)):
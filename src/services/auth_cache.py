@@ -0,0 +1,248 @@
+import hashlib
+import time
+from collections import OrderedDict
+
+from src.conf.config import config
+from src.schemas.auth import UserSchema
+
+
+def token_fingerprint(token: str) -> str:
+    """
+    Build a short, non-reversible fingerprint of a token.
+    Args:
+        token (str): The raw JWT.
+    Returns:
+        str: Hex digest identifying the token.
+    """
+    return hashlib.blake2b(token.encode("utf-8"), digest_size=16).hexdigest()
+
+
+class PrincipalCache:
+    """
+    Bounded in-process cache of validated principals.
+
+    Entries are keyed by the token subject and the token fingerprint, expire
+    after ``ttl`` seconds (or earlier, when the token itself expires) and are
+    evicted least-recently-used once ``maxsize`` entries are stored.
+
+    Args:
+        maxsize (int): Maximum number of cached principals.
+        ttl (float): Lifetime of a cached principal in seconds.
+    """
+
+    def __init__(self, maxsize: int, ttl: float):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries: OrderedDict[tuple[str, str], tuple[float, UserSchema]] = (
+            OrderedDict()
+        )
+        self._by_subject: dict[str, set[tuple[str, str]]] = {}
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def get(self, subject: str, fingerprint: str) -> UserSchema | None:
+        """
+        Return the cached principal for a subject/token pair.
+        Args:
+            subject (str): The token subject (user email).
+            fingerprint (str): Fingerprint of the token.
+        Returns:
+            UserSchema | None: The cached principal, or None on a miss.
+        """
+        key = (subject, fingerprint)
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        expires_at, principal = entry
+        if expires_at <= time.monotonic():
+            self._remove(key)
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return principal
+
+    def set(
+        self,
+        subject: str,
+        fingerprint: str,
+        principal: UserSchema,
+        ttl: float | None = None,
+    ):
+        """
+        Store a validated principal.
+        Args:
+            subject (str): The token subject (user email).
+            fingerprint (str): Fingerprint of the token.
+            principal (UserSchema): The principal to cache.
+            ttl (float, optional): Lifetime override, capped by the cache TTL.
+        Returns:
+            None: Nothing is returned.
+        """
+        if self.maxsize <= 0:
+            return
+        lifetime = self.ttl if ttl is None else min(ttl, self.ttl)
+        if lifetime <= 0:
+            return
+        key = (subject, fingerprint)
+        self._entries[key] = (time.monotonic() + lifetime, principal)
+        self._entries.move_to_end(key)
+        self._by_subject.setdefault(subject, set()).add(key)
+        while len(self._entries) > self.maxsize:
+            oldest = next(iter(self._entries))
+            self._remove(oldest)
+            self.evictions += 1
+
+    def invalidate(self, subject: str):
+        """
+        Drop every cached principal of a subject.
+        Args:
+            subject (str): The token subject (user email).
+        Returns:
+            None: Nothing is returned.
+        """
+        keys = self._by_subject.pop(subject, None)
+        if not keys:
+            return
+        for key in keys:
+            self._entries.pop(key, None)
+        self.invalidations += 1
+
+    def clear(self):
+        """Drop all cached principals and reset the counters."""
+        self._entries.clear()
+        self._by_subject.clear()
+        self.hits = self.misses = self.evictions = self.invalidations = 0
+
+    def stats(self) -> dict:
+        """
+        Return cache counters.
+        Returns:
+            dict: Size, hit/miss/eviction/invalidation counters and hit ratio.
+        """
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "maxsize": self.maxsize,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "invalidations": self.invalidations,
+            "hit_ratio": self.hits / lookups if lookups else 0.0,
+        }
+
+    def _remove(self, key: tuple[str, str]):
+        self._entries.pop(key, None)
+        keys = self._by_subject.get(key[0])
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del self._by_subject[key[0]]
+
+
+class TokenVersionCache:
+    """
+    Bounded in-process map of user id to current token version.
+
+    Used by the stateless token mode to check revocation without loading the
+    user row. Entries expire after ``ttl`` seconds so that version bumps made
+    by other workers become visible within that window.
+
+    Args:
+        maxsize (int): Maximum number of cached versions.
+        ttl (float): Lifetime of a cached version in seconds.
+    """
+
+    def __init__(self, maxsize: int, ttl: float):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries: OrderedDict[int, tuple[float, int]] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, user_id: int) -> int | None:
+        """
+        Return the cached token version of a user.
+        Args:
+            user_id (int): The ID of the user.
+        Returns:
+            int | None: The cached version, or None on a miss.
+        """
+        entry = self._entries.get(user_id)
+        if entry is None or entry[0] <= time.monotonic():
+            self._entries.pop(user_id, None)
+            self.misses += 1
+            return None
+        self._entries.move_to_end(user_id)
+        self.hits += 1
+        return entry[1]
+
+    def set(self, user_id: int, version: int):
+        """
+        Store the token version of a user.
+        Args:
+            user_id (int): The ID of the user.
+            version (int): The current token version.
+        Returns:
+            None: Nothing is returned.
+        """
+        if self.maxsize <= 0:
+            return
+        self._entries[user_id] = (time.monotonic() + self.ttl, version)
+        self._entries.move_to_end(user_id)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def invalidate(self, user_id: int):
+        """
+        Drop the cached token version of a user.
+        Args:
+            user_id (int): The ID of the user.
+        Returns:
+            None: Nothing is returned.
+        """
+        self._entries.pop(user_id, None)
+
+    def clear(self):
+        """Drop all cached versions and reset the counters."""
+        self._entries.clear()
+        self.hits = self.misses = 0
+
+    def stats(self) -> dict:
+        """
+        Return cache counters.
+        Returns:
+            dict: Size and hit/miss counters.
+        """
+        return {
+            "size": len(self._entries),
+            "maxsize": self.maxsize,
+            "hits": self.hits,
+            "misses": self.misses,
+        }
+
+
+principal_cache = PrincipalCache(
+    maxsize=config.PRINCIPAL_CACHE_SIZE, ttl=config.PRINCIPAL_CACHE_TTL_SECONDS
+)
+token_versions = TokenVersionCache(
+    maxsize=config.TOKEN_VERSION_CACHE_SIZE,
+    ttl=config.TOKEN_VERSION_CACHE_TTL_SECONDS,
+)
+
+
+def invalidate_user(email: str, user_id: int | None = None):
+    """
+    Drop every in-process cache entry derived from a user row.
+    Args:
+        email (str): The email of the user.
+        user_id (int, optional): The ID of the user.
+    Returns:
+        None: Nothing is returned.
+    """
+    principal_cache.invalidate(email)
+    if user_id is not None:
+        token_versions.invalidate(user_id)
@@ -0,0 +1,54 @@
+import csv
+import io
+import json
+from typing import AsyncIterator, Callable
+
+from src.db.models import User
+from src.db.routing import set_session_user
+from src.repository.contacts import ContactsRepository
+
+# Exported files use the same fields as the import, so they can be re-imported.
+EXPORT_FIELDS = ("name", "email", "phone", "birthdate")
+MEDIA_TYPES = {"ndjson": "application/x-ndjson", "csv": "text/csv"}
+
+
+async def stream_export(
+    session_factory: Callable, user: User, format: str, fetch_size: int
+) -> AsyncIterator[bytes]:
+    """
+    Encode all contacts of a user as NDJSON or CSV, one chunk per fetched
+    partition of rows.
+
+    Runs in the response body, with its own session. If the client
+    disconnects, the pending await is cancelled and the session is closed,
+    which closes the cursor and returns the connection to the pool.
+    Args:
+        session_factory (Callable): Returns an async context manager yielding a session.
+        user (User): The user whose contacts are exported.
+        format (str): "ndjson" or "csv".
+        fetch_size (int): Rows fetched per round trip.
+    Returns:
+        AsyncIterator[bytes]: Encoded chunks of the export file.
+    """
+    if format == "csv":
+        yield _encode_csv([dict(zip(EXPORT_FIELDS, EXPORT_FIELDS))])
+    async with session_factory() as db:
+        # Lets the router send the export to the primary after a recent write.
+        await set_session_user(db, user.id)
+        repo = ContactsRepository(db)
+        async for rows in repo.stream_all(user, fetch_size=fetch_size):
+            yield _encode_csv(rows) if format == "csv" else _encode_ndjson(rows)
+
+
+def _encode_ndjson(rows) -> bytes:
+    return "".join(
+        json.dumps({field: row[field] for field in EXPORT_FIELDS}, default=str) + "\n"
+        for row in rows
+    ).encode("utf-8")
+
+
+def _encode_csv(rows) -> bytes:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerows([row[field] for field in EXPORT_FIELDS] for row in rows)
+    return buffer.getvalue().encode("utf-8")
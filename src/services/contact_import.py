@@ -0,0 +1,112 @@
+import csv
+import io
+import json
+from pathlib import PurePath
+from typing import IO, Iterator
+
+from src.api.exceptions import ImportFormatError
+
+# Record readers yield one dict per contact in the file, or None for a
+# record that cannot be parsed. They read the file incrementally.
+
+_SUFFIXES = {
+    ".csv": "csv",
+    ".jsonl": "jsonl",
+    ".ndjson": "jsonl",
+    ".vcf": "vcard",
+    ".vcard": "vcard",
+}
+_VCARD_FIELDS = {"FN": "name", "EMAIL": "email", "TEL": "phone", "BDAY": "birthdate"}
+
+
+def detect_format(filename: str | None) -> str | None:
+    """
+    Guess the import format from a file name.
+    Args:
+        filename (str | None): Name of the uploaded file.
+    Returns:
+        str | None: "csv", "jsonl" or "vcard", or None if unknown.
+    """
+    if not filename:
+        return None
+    return _SUFFIXES.get(PurePath(filename).suffix.lower())
+
+
+def read_records(file: IO[bytes], format: str) -> Iterator[dict | None]:
+    """
+    Read contact records from an import file.
+    Args:
+        file (IO[bytes]): The uploaded file.
+        format (str): "csv", "jsonl" or "vcard".
+    Returns:
+        Iterator[dict | None]: Contact fields per record; None if malformed.
+    Raises:
+        ImportFormatError: If the file is not UTF-8 text.
+    """
+    reader = {"csv": _read_csv, "jsonl": _read_jsonl, "vcard": _read_vcard}[format]
+    text = io.TextIOWrapper(file, encoding="utf-8-sig", newline="")
+    try:
+        yield from reader(text)
+    except UnicodeDecodeError:
+        raise ImportFormatError("File is not valid UTF-8")
+    except csv.Error as e:
+        raise ImportFormatError(f"Malformed CSV: {e}")
+    finally:
+        text.detach()  # leave the upload open for its owner to close
+
+
+def _read_csv(text: IO[str]) -> Iterator[dict | None]:
+    for row in csv.DictReader(text):
+        yield {key.strip().lower(): value for key, value in row.items() if key}
+
+
+def _read_jsonl(text: IO[str]) -> Iterator[dict | None]:
+    for line in text:
+        if not line.strip():
+            continue
+        try:
+            record = json.loads(line)
+        except ValueError:
+            record = None
+        yield record if isinstance(record, dict) else None
+
+
+def _read_vcard(text: IO[str]) -> Iterator[dict | None]:
+    card = None
+    for line in _unfold(text):
+        name, sep, value = line.partition(":")
+        if not sep:
+            continue
+        prop = name.split(";", 1)[0].rsplit(".", 1)[-1].upper()
+        if prop == "BEGIN" and value.strip().upper() == "VCARD":
+            card = {}
+        elif prop == "END" and card is not None:
+            yield card
+            card = None
+        elif card is not None and prop in _VCARD_FIELDS:
+            field = _VCARD_FIELDS[prop]
+            if field not in card:  # keep the first (preferred) value
+                card[field] = _vcard_value(field, value)
+
+
+def _unfold(text: IO[str]) -> Iterator[str]:
+    # Content lines may be folded onto continuation lines starting with
+    # whitespace (RFC 6350, section 3.2).
+    current = None
+    for line in text:
+        line = line.rstrip("\r\n")
+        if line[:1] in (" ", "\t") and current is not None:
+            current += line[1:]
+            continue
+        if current is not None:
+            yield current
+        current = line
+    if current is not None:
+        yield current
+
+
+def _vcard_value(field: str, value: str) -> str:
+    value = value.strip().replace("\\,", ",").replace("\\;", ";")
+    if field == "birthdate" and len(value) == 8 and value.isdigit():
+        value = f"{value[:4]}-{value[4:6]}-{value[6:]}"
+    return value
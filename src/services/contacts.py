@@ -1,9 +1,99 @@
+import asyncio
+import itertools
+from datetime import date, datetime
+from typing import Iterable, Iterator
+
 from src.repository.contacts import ContactsRepository
-from src.db.models import Contacts
-from src.api.exceptions import UserNotFoundError, DuplicateEmailError, ServerError
+from src.db.models import Contacts, normalize_phone
+from src.api.exceptions import (
+    UserNotFoundError,
+    DuplicateEmailError,
+    InvalidCursorError,
+    ServerError,
+)
 
 from libgravatar import Gravatar
+from pydantic import ValidationError
+from sqlalchemy.exc import IntegrityError
+
+from src.services.pagination import decode_cursor, encode_cursor
 from src.db.models import User
+from src.schemas.contacts import (
+    ContactBatchOperation,
+    ContactBatchResponse,
+    ContactBatchResult,
+    ContactImportResult,
+    ContactSchema,
+    ContactSuggestion,
+    ImportRowError,
+)
+from src.services.typeahead import typeahead
+
+
+def _parse_sort_value(sort: str, value):
+    try:
+        if sort == "created_at":
+            return datetime.fromisoformat(value)
+        if sort == "birthdate":
+            return date.fromisoformat(value)
+    except (TypeError, ValueError):
+        raise InvalidCursorError
+    expected = int if sort == "id" else str
+    if not isinstance(value, expected):
+        raise InvalidCursorError
+    return value
+
+
+def _contact_schemas(rows) -> list[ContactSchema]:
+    # Rows were validated when they were written; build the response models
+    # without validating every email again. The API serializes them as they
+    # are (see contact_list_response), so FastAPI does not validate them either.
+    return [ContactSchema.model_construct(**row) for row in rows]
+
+
+def _add_error(report: ContactImportResult, max_errors: int, row: int, message: str):
+    if len(report.errors) < max_errors:
+        report.errors.append(ImportRowError(row=row, message=message))
+
+
+def _validation_message(error: ValidationError) -> str:
+    return "; ".join(
+        f"{'.'.join(map(str, e['loc']))}: {e['msg']}" for e in error.errors()
+    )
+
+
+def _validate_batch(
+    records: Iterator[dict | None],
+    size: int,
+    seen: set[str],
+    report: ContactImportResult,
+    max_errors: int,
+) -> tuple[list[tuple[int, dict]], bool]:
+    batch = []
+    read = 0
+    for record in itertools.islice(records, size):
+        read += 1
+        report.total += 1
+        row = report.total
+        if record is None:
+            report.invalid += 1
+            _add_error(report, max_errors, row, "Malformed record")
+            continue
+        try:
+            contact = ContactSchema.model_validate(record)
+        except ValidationError as e:
+            report.invalid += 1
+            _add_error(report, max_errors, row, _validation_message(e))
+            continue
+        email = contact.email.lower()
+        if email in seen:
+            report.duplicates += 1
+            _add_error(report, max_errors, row, "Duplicate email")
+            continue
+        seen.add(email)
+        avatar = Gravatar(contact.email).get_image()
+        batch.append((row, {**contact.model_dump(), "avatar": avatar}))
+    return batch, read < size
 
 
 class ContactService:
@@ -11,11 +101,44 @@ class ContactService:
     def __init__(self, repo: ContactsRepository):
         self.repo = repo
 
-    async def get_contacts(self, user: User, limit: int, skip: int):
+    async def get_contacts(
+        self,
+        user: User,
+        limit: int,
+        skip: int = 0,
+        sort: str = "id",
+        descending: bool = False,
+        cursor: str | None = None,
+    ):
+        if skip and cursor:
+            # The cursor already marks where the page starts.
+            raise InvalidCursorError("skip cannot be combined with cursor")
+        after = None
+        if cursor:
+            cursor_sort, value, last_id = decode_cursor(cursor, 3)
+            if cursor_sort != sort or not isinstance(last_id, int):
+                raise InvalidCursorError
+            after = (_parse_sort_value(sort, value), last_id)
         try:
-            return await self.repo.get_all(user=user, limit=limit, skip=skip)
+            contacts = await self.repo.get_all(
+                user=user,
+                limit=limit + 1,
+                skip=skip,
+                sort=sort,
+                descending=descending,
+                after=after,
+            )
         except Exception as e:
             raise ServerError(str(e))
+        next_cursor = None
+        if len(contacts) > limit:
+            contacts = contacts[:limit]
+            last = contacts[-1]
+            value = last[sort]
+            if isinstance(value, (date, datetime)):
+                value = value.isoformat()
+            next_cursor = encode_cursor(sort, value, last["id"])
+        return _contact_schemas(contacts), next_cursor
 
     async def get_contact(self, contact_id: int, user: User):
         try:
@@ -29,38 +152,187 @@ class ContactService:
             raise ServerError(str(e))
 
     async def create_contact(self, data: Contacts, user: User):
-        if await self.repo.get_by_email(email=data.email, user=user):
-            raise DuplicateEmailError
         try:
             g = Gravatar(data.email)
             avatar = g.get_image()
 
-            return await self.repo.create(data, user=user, avatar=avatar)
+            contact = await self.repo.create(data, user=user, avatar=avatar)
+        except Exception as e:
+            raise ServerError(str(e))
+        if contact is None:
+            raise DuplicateEmailError
+        return contact
+
+    async def import_contacts(
+        self,
+        records: Iterable[dict | None],
+        user: User,
+        batch_size: int = 1000,
+        max_errors: int = 1000,
+    ) -> ContactImportResult:
+        """
+        Validate records and insert them in batches, skipping emails the user
+        already has or that appeared earlier in the import.
+        Args:
+            records (Iterable[dict | None]): Records read from the import file.
+            user (User): The user for whom the contacts are imported.
+            batch_size (int): Contacts inserted per statement.
+            max_errors (int): Maximum number of per-record errors reported.
+        Returns:
+            ContactImportResult: Counters and per-record errors.
+        """
+        report = ContactImportResult()
+        seen: set[str] = set()
+        records = iter(records)
+        exhausted = False
+        while not exhausted:
+            # Reading and validating (email checks dominate) are blocking and
+            # CPU-bound: run them off the event loop, one batch at a time.
+            batch, exhausted = await asyncio.to_thread(
+                _validate_batch, records, batch_size, seen, report, max_errors
+            )
+            await self._import_batch(batch, user, report, max_errors)
+        return report
+
+    async def _import_batch(
+        self,
+        batch: list[tuple[int, dict]],
+        user: User,
+        report: ContactImportResult,
+        max_errors: int,
+    ):
+        try:
+            inserted = await self.repo.create_many([data for _, data in batch], user)
         except Exception as e:
             raise ServerError(str(e))
+        report.imported += len(inserted)
+        for row, data in batch:
+            if data["email"].lower() not in inserted:
+                report.duplicates += 1
+                _add_error(report, max_errors, row, "Email already exists")
 
     async def update_contact(self, contact_id: int, data: Contacts, user: User):
-        existing = await self.repo.get_by_id(contact_id=contact_id, user=user)
-        if not existing:
-            raise UserNotFoundError
-        if (
-            await self.repo.get_by_email(email=data.email, user=user)
-            and existing.email != data.email
-        ):
+        try:
+            contact = await self.repo.update(
+                contact_id, data.model_dump(exclude_unset=True), user=user
+            )
+        except IntegrityError:
+            # The email belongs to another of the user's contacts.
             raise DuplicateEmailError
+        except Exception as e:
+            raise ServerError(str(e))
+        if contact is None:
+            raise UserNotFoundError
+        return contact
+
+    async def apply_batch(
+        self,
+        operations: list[ContactBatchOperation],
+        user: User,
+        atomic: bool = True,
+    ) -> ContactBatchResponse:
+        """
+        Apply create, update and delete operations in one transaction.
+
+        The contacts and emails the operations touch are loaded with two
+        set-based queries and every operation is checked in order against
+        them; the accepted operations are then written at once. If ``atomic``
+        and any operation fails, nothing is written.
+        Args:
+            operations (list[ContactBatchOperation]): The operations, in order.
+            user (User): The user who owns the contacts.
+            atomic (bool): Apply nothing if any operation fails.
+        Returns:
+            ContactBatchResponse: Whether the batch was applied, and a result per operation.
+        """
+        ids = [operation.id for operation in operations if operation.op != "create"]
+        emails = [
+            operation.data.email.lower()
+            for operation in operations
+            if operation.op != "delete"
+        ]
+        try:
+            contacts = await self.repo.get_many(ids, user)
+            # Owner of each email that matters to the batch: a contact ID, or
+            # the index of a create operation.
+            email_owners: dict[str, int | tuple] = await self.repo.get_ids_by_emails(
+                emails, user
+            )
+        except Exception as e:
+            raise ServerError(str(e))
+        current_emails = {id: contact.email.lower() for id, contact in contacts.items()}
+
+        results: list[ContactBatchResult] = []
+        deleted: set[int] = set()
+        # (contact ID, values) per accepted update, in request order.
+        updates: list[tuple[int, dict]] = []
+        creates: list[tuple[ContactBatchResult, dict]] = []
+        for index, operation in enumerate(operations):
+            result = ContactBatchResult(
+                index=index, op=operation.op, id=operation.id, status=200
+            )
+            results.append(result)
+            if operation.op != "create" and (
+                operation.id not in contacts or operation.id in deleted
+            ):
+                result.status, result.message = 404, "Contact not found"
+                continue
+            if operation.op == "delete":
+                deleted.add(operation.id)
+                updates = [step for step in updates if step[0] != operation.id]
+                if email_owners.get(current_emails[operation.id]) == operation.id:
+                    del email_owners[current_emails[operation.id]]
+                result.status = 204
+                continue
+
+            email = operation.data.email.lower()
+            owner = email_owners.get(email)
+            if owner is not None and owner != operation.id:
+                result.status, result.message = 400, "Email already exists"
+                continue
+            data = operation.data.model_dump(exclude_unset=True)
+            if operation.op == "update":
+                old_email = current_emails[operation.id]
+                if email_owners.get(old_email) == operation.id:
+                    del email_owners[old_email]
+                email_owners[email] = current_emails[operation.id] = operation.id
+                updates.append((operation.id, data))
+            else:
+                email_owners[email] = ("create", index)
+                avatar = Gravatar(operation.data.email).get_image()
+                creates.append((result, {**data, "avatar": avatar}))
+                result.status = 201
+
+        if atomic and any(result.status >= 400 for result in results):
+            for result in results:
+                if result.status < 400:
+                    result.status = 424
+                    result.message = "Not applied: another operation failed"
+            return ContactBatchResponse(applied=False, results=results)
+
         try:
-            return await self.repo.update(existing, data.model_dump(exclude_unset=True))
+            created = await self.repo.write_batch(
+                sorted(deleted),
+                updates,
+                [data for _, data in creates],
+                user,
+            )
+        except IntegrityError:
+            # A concurrent change to the user's contacts since they were read.
+            raise DuplicateEmailError
         except Exception as e:
             raise ServerError(str(e))
+        for (result, _), contact in zip(creates, created):
+            result.id = contact.id
+        return ContactBatchResponse(applied=True, results=results)
 
     async def delete_contact(self, contact_id: int, user: User):
-        existing = await self.repo.get_by_id(contact_id=contact_id, user=user)
-        if not existing:
-            raise UserNotFoundError
         try:
-            return await self.repo.delete(existing)
+            deleted = await self.repo.delete(contact_id, user=user)
         except Exception as e:
             raise ServerError(str(e))
+        if not deleted:
+            raise UserNotFoundError
 
     async def search_contacts(
         self,
@@ -68,14 +340,58 @@ class ContactService:
         email: str | None,
         phone: str | None,
         user: User,
+        q: str | None = None,
+        limit: int = 25,
+        cursor: str | None = None,
+    ):
+        after = None
+        if cursor:
+            after = tuple(decode_cursor(cursor, 2))
+            if not all(isinstance(value, (int, float)) for value in after):
+                raise InvalidCursorError
+        try:
+            rows = await self.repo.search(
+                name, email, phone, user=user, q=q, limit=limit + 1, after=after
+            )
+        except Exception as e:
+            raise ServerError(str(e))
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = encode_cursor(rows[-1]["rank"], rows[-1]["id"])
+        return _contact_schemas(rows), next_cursor
+
+    async def autocomplete(
+        self, q: str, user: User, limit: int = 10
+    ) -> list[ContactSuggestion]:
+        try:
+            suggestions = await typeahead.search(
+                user.id, q, limit, load=lambda: self.repo.get_suggestions(user)
+            )
+        except Exception as e:
+            raise ServerError(str(e))
+        return [
+            ContactSuggestion.model_construct(**suggestion._asdict())
+            for suggestion in suggestions
+        ]
+
+    async def find_by_phone(
+        self, phone: str, user: User, prefix: bool = False, limit: int = 25
     ):
+        normalized = normalize_phone(phone)
+        if normalized is None:
+            return []  # no stored number normalizes to nothing
         try:
-            return await self.repo.search(name, email, phone, user=user)
+            rows = await self.repo.find_by_phone(
+                normalized, user=user, prefix=prefix, limit=limit
+            )
+            return _contact_schemas(rows)
         except Exception as e:
             raise ServerError(str(e))
 
     async def upcoming_birthdays(self, days: int, user: User):
         try:
-            return await self.repo.upcoming_birthdays(days, user=user)
+            rows = await self.repo.upcoming_birthdays(days, user=user)
+            return _contact_schemas(rows)
         except Exception as e:
             raise ServerError(str(e))
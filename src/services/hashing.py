@@ -0,0 +1,137 @@
+import asyncio
+import multiprocessing
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor
+
+from src.api.exceptions import ServiceUnavailableError
+from src.conf.config import config
+from src.services.metrics import LatencyHistogram
+from src.services.utils import (
+    Hash,
+    hash_password,
+    verify_and_update_password,
+    verify_password,
+)
+
+
+class PasswordHasher:
+    """
+    Async password hashing service backed by a process pool.
+
+    bcrypt is CPU-bound, so it runs outside of the event loop. At most
+    ``max_pending`` calls may be running or queued at once; further calls are
+    rejected immediately with ServiceUnavailableError instead of piling up.
+
+    Args:
+        max_workers (int): Number of worker processes. With 0 the work runs
+            on the event loop's default thread pool instead.
+        max_pending (int): Maximum number of running plus queued calls.
+
+    Returns:
+        PasswordHasher: An instance of the PasswordHasher class.
+    """
+
+    def __init__(self, max_workers: int, max_pending: int):
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self._executor: Executor | None = None
+        self.in_flight = 0
+        self.completed = 0
+        self.failed = 0
+        self.rejected = 0
+        self.latency = LatencyHistogram()
+
+    def _get_executor(self) -> Executor | None:
+        if self.max_workers <= 0:
+            return None
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return self._executor
+
+    async def _run(self, func, *args):
+        if self.in_flight >= self.max_pending:
+            self.rejected += 1
+            raise ServiceUnavailableError("Password hashing is overloaded")
+        self.in_flight += 1
+        start = time.perf_counter()
+        try:
+            loop = asyncio.get_running_loop()
+            result = await loop.run_in_executor(self._get_executor(), func, *args)
+        except BaseException:
+            self.failed += 1
+            raise
+        finally:
+            self.in_flight -= 1
+            self.latency.observe((time.perf_counter() - start) * 1000)
+        self.completed += 1
+        return result
+
+    async def hash(self, password: str) -> str:
+        """
+        Hash a password.
+        Args:
+            password (str): The plain password.
+        Returns:
+            str: The password hash.
+        """
+        return await self._run(hash_password, password, Hash.rounds)
+
+    async def verify(self, password: str, hashed_password: str) -> bool:
+        """
+        Verify a password against its hash.
+        Args:
+            password (str): The plain password.
+            hashed_password (str): The stored hash.
+        Returns:
+            bool: True if the password matches.
+        """
+        return await self._run(verify_password, password, hashed_password, Hash.rounds)
+
+    async def verify_and_update(
+        self, password: str, hashed_password: str
+    ) -> tuple[bool, str | None]:
+        """
+        Verify a password and rehash it if its cost is out of policy.
+        Args:
+            password (str): The plain password.
+            hashed_password (str): The stored hash.
+        Returns:
+            tuple[bool, str | None]: Whether the password matches, and a
+            replacement hash when the stored one should be upgraded.
+        """
+        return await self._run(
+            verify_and_update_password, password, hashed_password, Hash.rounds
+        )
+
+    def shutdown(self):
+        """Stop the worker processes."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    def stats(self) -> dict:
+        """
+        Return hashing counters.
+        Returns:
+            dict: In-flight and queued calls, completed/failed/rejected
+            counters and the latency histogram (queue wait included).
+        """
+        return {
+            "bcrypt_rounds": Hash.rounds,
+            "workers": self.max_workers,
+            "max_pending": self.max_pending,
+            "in_flight": self.in_flight,
+            "queue_depth": max(0, self.in_flight - max(self.max_workers, 1)),
+            "completed": self.completed,
+            "failed": self.failed,
+            "rejected": self.rejected,
+            "latency": self.latency.stats(),
+        }
+
+
+password_hasher = PasswordHasher(
+    max_workers=config.HASH_POOL_WORKERS, max_pending=config.HASH_MAX_PENDING
+)
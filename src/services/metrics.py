@@ -0,0 +1,50 @@
+from bisect import bisect_left
+
+
+class LatencyHistogram:
+    """
+    Fixed-bucket latency histogram.
+
+    Args:
+        buckets (tuple[float, ...]): Upper bounds of the buckets in milliseconds.
+
+    Returns:
+        LatencyHistogram: An instance of the LatencyHistogram class.
+    """
+
+    def __init__(
+        self,
+        buckets: tuple[float, ...] = (1, 5, 10, 25, 50, 100, 250, 500, 1000, 2500),
+    ):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.count = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+
+    def observe(self, elapsed_ms: float):
+        """
+        Record one observation.
+        Args:
+            elapsed_ms (float): The observed latency in milliseconds.
+        Returns:
+            None: Nothing is returned.
+        """
+        self.counts[bisect_left(self.buckets, elapsed_ms)] += 1
+        self.count += 1
+        self.total_ms += elapsed_ms
+        self.max_ms = max(self.max_ms, elapsed_ms)
+
+    def stats(self) -> dict:
+        """
+        Return the histogram as a dict.
+        Returns:
+            dict: Count, average, maximum and per-bucket counts.
+        """
+        labels = [f"le_{bound:g}ms" for bound in self.buckets] + ["le_inf"]
+        return {
+            "count": self.count,
+            "avg_ms": self.total_ms / self.count if self.count else 0.0,
+            "max_ms": self.max_ms,
+            "buckets": dict(zip(labels, self.counts)),
+        }
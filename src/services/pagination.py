@@ -0,0 +1,58 @@
+import base64
+import binascii
+import json
+
+from fastapi import Request, Response
+
+from src.api.exceptions import InvalidCursorError
+
+
+def encode_cursor(*values) -> str:
+    """
+    Encode the sort key of the last row of a page as an opaque cursor.
+    Args:
+        *values: JSON-serializable sort key values.
+    Returns:
+        str: URL-safe cursor.
+    """
+    raw = json.dumps(values, separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).rstrip(b"=").decode("ascii")
+
+
+def decode_cursor(cursor: str, size: int) -> list:
+    """
+    Decode a cursor produced by ``encode_cursor``.
+    Args:
+        cursor (str): The cursor.
+        size (int): Expected number of sort key values.
+    Returns:
+        list: The sort key values.
+    Raises:
+        InvalidCursorError: If the cursor is malformed.
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+    except (ValueError, UnicodeError, binascii.Error):
+        raise InvalidCursorError
+    if not isinstance(values, list) or len(values) != size:
+        raise InvalidCursorError
+    return values
+
+
+def set_next_link(request: Request, response: Response, cursor: str | None):
+    """
+    Point the response at the next page with a ``Link: <...>; rel="next"``
+    header, keeping the other query parameters of the request except the
+    deprecated ``skip``, which the cursor replaces.
+    Args:
+        request (Request): The current request.
+        response (Response): The response being built.
+        cursor (str | None): Cursor of the next page; None on the last page.
+    Returns:
+        None: Nothing is returned.
+    """
+    if cursor is None:
+        return
+    url = request.url.remove_query_params("skip").include_query_params(cursor=cursor)
+    response.headers["Link"] = f'<{url}>; rel="next"'
@@ -0,0 +1,70 @@
+import hashlib
+import secrets
+from datetime import datetime, timedelta, UTC
+
+from src.api.exceptions import ServerError
+from src.conf.config import config
+from src.db.models import User
+from src.repository.sessions import SessionRepository
+
+
+def hash_refresh_token(token: str) -> str:
+    """
+    Hash a refresh token for storage and lookup.
+    Args:
+        token (str): The raw refresh token.
+    Returns:
+        str: SHA-256 hex digest of the token.
+    """
+    return hashlib.sha256(token.encode("utf-8")).hexdigest()
+
+
+def _utcnow() -> datetime:
+    return datetime.now(UTC).replace(tzinfo=None)
+
+
+class SessionService:
+    def __init__(self, repo: SessionRepository):
+        self.repo = repo
+
+    async def create_session(self, user: User, device: str | None = None) -> str:
+        token = secrets.token_urlsafe(48)
+        expires_at = _utcnow() + timedelta(
+            seconds=config.REFRESH_TOKEN_EXPIRATION_SECONDS
+        )
+        try:
+            await self.repo.create(
+                user_id=user.id,
+                token_hash=hash_refresh_token(token),
+                expires_at=expires_at,
+                device=device[:255] if device else None,
+            )
+        except Exception as e:
+            raise ServerError(str(e))
+        return token
+
+    async def rotate_session(self, refresh_token: str):
+        token = secrets.token_urlsafe(48)
+        now = _utcnow()
+        user = await self.repo.rotate(
+            token_hash=hash_refresh_token(refresh_token),
+            new_token_hash=hash_refresh_token(token),
+            now=now,
+            expires_at=now + timedelta(seconds=config.REFRESH_TOKEN_EXPIRATION_SECONDS),
+        )
+        if user is None:
+            return None
+        return user, token
+
+    async def end_session(self, user_id: int, refresh_token: str) -> bool:
+        return await self.repo.delete_by_token_hash(
+            hash_refresh_token(refresh_token), user_id=user_id
+        )
+
+    async def end_all_sessions(self, user_id: int) -> int:
+        return await self.repo.delete_for_user(user_id)
+
+    async def purge_expired_sessions(self, batch_size: int | None = None) -> int:
+        return await self.repo.purge_expired(
+            now=_utcnow(), batch_size=batch_size or config.SESSION_PURGE_BATCH_SIZE
+        )
@@ -0,0 +1,304 @@
+import heapq
+import re
+import time
+from collections import OrderedDict
+from typing import Awaitable, Callable, NamedTuple
+
+from src.conf.config import config
+
+# Prefixes longer than this are not indexed; longer query terms are matched
+# by filtering the candidates of their first MAX_PREFIX characters.
+MAX_PREFIX = 12
+
+_WORD_SPLIT = re.compile(r"[\W_]+")
+_PHONE_QUERY = re.compile(r"[\d\s+().-]+")
+_NON_DIGITS = re.compile(r"\D")
+
+
+class Suggestion(NamedTuple):
+    id: int
+    name: str
+    email: str
+    phone: str
+
+
+def _tokens(contact: Suggestion) -> list[str]:
+    email = contact.email.lower()
+    tokens = _WORD_SPLIT.split(contact.name.lower()) + _WORD_SPLIT.split(email)
+    tokens += [email, _NON_DIGITS.sub("", contact.phone)]
+    return list(dict.fromkeys(token for token in tokens if token))
+
+
+def _terms(query: str) -> list[str]:
+    if _PHONE_QUERY.fullmatch(query):
+        digits = _NON_DIGITS.sub("", query)
+        return [digits] if digits else []
+    return [term for term in _WORD_SPLIT.split(query.lower()) if term]
+
+
+class UserIndex:
+    """
+    Prefix index over the name words, email and phone digits of one user's
+    contacts.
+
+    Args:
+        contacts (list[Suggestion]): The user's contacts.
+
+    Returns:
+        UserIndex: An instance of the UserIndex class.
+    """
+
+    def __init__(self, contacts: list[Suggestion] = ()):
+        self._contacts: dict[int, tuple[Suggestion, list[str]]] = {}
+        self._postings: dict[str, set[int]] = {}
+        self.size = 0
+        for contact in contacts:
+            self.upsert(contact)
+
+    def upsert(self, contact: Suggestion):
+        """
+        Add a contact, or replace its indexed values.
+        Args:
+            contact (Suggestion): The contact.
+        Returns:
+            None: Nothing is returned.
+        """
+        self.remove(contact.id)
+        tokens = _tokens(contact)
+        for token in tokens:
+            for length in range(1, min(len(token), MAX_PREFIX) + 1):
+                ids = self._postings.setdefault(token[:length], set())
+                if contact.id not in ids:
+                    ids.add(contact.id)
+                    self.size += 1
+        self._contacts[contact.id] = (contact, tokens)
+
+    def remove(self, contact_id: int):
+        """
+        Remove a contact from the index.
+        Args:
+            contact_id (int): The ID of the contact.
+        Returns:
+            None: Nothing is returned.
+        """
+        entry = self._contacts.pop(contact_id, None)
+        if entry is None:
+            return
+        for token in entry[1]:
+            for length in range(1, min(len(token), MAX_PREFIX) + 1):
+                ids = self._postings.get(token[:length])
+                if ids is not None and contact_id in ids:
+                    ids.discard(contact_id)
+                    self.size -= 1
+                    if not ids:
+                        del self._postings[token[:length]]
+
+    def search(self, query: str, limit: int) -> list[Suggestion]:
+        """
+        Return the contacts having a token that starts with every query term.
+
+        Exact name matches rank first, then name prefixes, then the rest;
+        ties are ordered by name.
+        Args:
+            query (str): What the user typed.
+            limit (int): Maximum number of suggestions.
+        Returns:
+            list[Suggestion]: The best matches.
+        """
+        terms = _terms(query)
+        if not terms:
+            return []
+        candidates = None
+        for term in terms:
+            ids = self._postings.get(term[:MAX_PREFIX], set())
+            if len(term) > MAX_PREFIX:
+                ids = {
+                    id
+                    for id in ids
+                    if any(token.startswith(term) for token in self._contacts[id][1])
+                }
+            candidates = ids if candidates is None else candidates & ids
+            if not candidates:
+                return []
+        query = query.strip().lower()
+
+        def rank(id: int):
+            contact = self._contacts[id][0]
+            name = contact.name.lower()
+            return (name != query, not name.startswith(query), name, id)
+
+        return [
+            self._contacts[id][0] for id in heapq.nsmallest(limit, candidates, rank)
+        ]
+
+
+class TypeaheadCache:
+    """
+    In-process LRU of per-user typeahead indexes.
+
+    A user's index is built on first use and then updated after each
+    committed write of that worker. Whole users are evicted least recently
+    used once the indexes hold more than ``max_postings`` (prefix, contact)
+    postings, and indexes expire after ``ttl`` seconds so that writes made
+    by other workers become visible within that window.
+
+    Args:
+        max_postings (int): Global budget of postings across users.
+        ttl (float): Lifetime of a user's index in seconds.
+
+    Returns:
+        TypeaheadCache: An instance of the TypeaheadCache class.
+    """
+
+    def __init__(self, max_postings: int, ttl: float):
+        self.max_postings = max_postings
+        self.ttl = ttl
+        self._indexes: OrderedDict[int, tuple[float, UserIndex]] = OrderedDict()
+        # A counter bumped on every write, and its value at each user's last
+        # write, so that an index built from a read that raced with a write
+        # is not kept. Users missing from the map count as written at
+        # _pruned_at, when it was last emptied.
+        self._generation = 0
+        self._pruned_at = 0
+        self._last_writes: dict[int, int] = {}
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    async def search(
+        self,
+        user_id: int,
+        query: str,
+        limit: int,
+        load: Callable[[], Awaitable[list[Suggestion]]],
+    ) -> list[Suggestion]:
+        """
+        Return the top matches of a user's contacts, building the user's
+        index with ``load`` if it is not cached.
+        Args:
+            user_id (int): The ID of the user.
+            query (str): What the user typed.
+            limit (int): Maximum number of suggestions.
+            load (Callable): Reads all of the user's contacts as suggestions.
+        Returns:
+            list[Suggestion]: The best matches.
+        """
+        index = self._get(user_id)
+        if index is None:
+            self.misses += 1
+            started = self._generation
+            index = UserIndex(await load())
+            if self._last_writes.get(user_id, self._pruned_at) <= started:
+                self._put(user_id, index)
+        else:
+            self.hits += 1
+        return index.search(query, limit)
+
+    def upsert(self, user_id: int, contact: Suggestion):
+        """
+        Index a created or updated contact, if the user's index is cached.
+        Args:
+            user_id (int): The ID of the user.
+            contact (Suggestion): The contact's committed values.
+        Returns:
+            None: Nothing is returned.
+        """
+        self._bump(user_id)
+        entry = self._indexes.get(user_id)
+        if entry is not None:
+            self.size -= entry[1].size
+            entry[1].upsert(contact)
+            self.size += entry[1].size
+            self._evict()
+
+    def remove(self, user_id: int, contact_id: int):
+        """
+        Drop a deleted contact from the user's index, if cached.
+        Args:
+            user_id (int): The ID of the user.
+            contact_id (int): The ID of the deleted contact.
+        Returns:
+            None: Nothing is returned.
+        """
+        self._bump(user_id)
+        entry = self._indexes.get(user_id)
+        if entry is not None:
+            self.size -= entry[1].size
+            entry[1].remove(contact_id)
+            self.size += entry[1].size
+
+    def invalidate(self, user_id: int):
+        """
+        Drop a user's index, e.g. after a bulk write; it is rebuilt on next use.
+        Args:
+            user_id (int): The ID of the user.
+        Returns:
+            None: Nothing is returned.
+        """
+        self._bump(user_id)
+        self._drop(user_id)
+
+    def clear(self):
+        """Drop all indexes and reset the counters."""
+        self._indexes.clear()
+        self._last_writes.clear()
+        self._pruned_at = self._generation
+        self.size = self.hits = self.misses = self.evictions = 0
+
+    def stats(self) -> dict:
+        """
+        Return cache counters.
+        Returns:
+            dict: Users and postings held, hit/miss/eviction counters.
+        """
+        return {
+            "users": len(self._indexes),
+            "postings": self.size,
+            "max_postings": self.max_postings,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
+
+    def _get(self, user_id: int) -> UserIndex | None:
+        entry = self._indexes.get(user_id)
+        if entry is None:
+            return None
+        if entry[0] <= time.monotonic():
+            self._drop(user_id)
+            return None
+        self._indexes.move_to_end(user_id)
+        return entry[1]
+
+    def _put(self, user_id: int, index: UserIndex):
+        if index.size > self.max_postings:
+            return  # would evict everyone else; serve it uncached
+        self._drop(user_id)
+        self._indexes[user_id] = (time.monotonic() + self.ttl, index)
+        self.size += index.size
+        self._evict()
+
+    def _evict(self):
+        while self.size > self.max_postings and len(self._indexes) > 1:
+            user_id = next(iter(self._indexes))
+            self._drop(user_id)
+            self.evictions += 1
+
+    def _drop(self, user_id: int):
+        entry = self._indexes.pop(user_id, None)
+        if entry is not None:
+            self.size -= entry[1].size
+
+    def _bump(self, user_id: int):
+        self._generation += 1
+        if len(self._last_writes) >= 100000:
+            # Builds in flight are then not kept, whoever they are for.
+            self._last_writes.clear()
+            self._pruned_at = self._generation
+        self._last_writes[user_id] = self._generation
+
+
+typeahead = TypeaheadCache(
+    max_postings=config.TYPEAHEAD_MAX_POSTINGS, ttl=config.TYPEAHEAD_TTL_SECONDS
+)
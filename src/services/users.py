@@ -9,7 +9,7 @@ from src.schemas.auth import UserCreate
 
 from libgravatar import Gravatar
 from jose import jwt
-from src.services.utils import Hash
+from src.services.hashing import password_hasher
 
 from src.conf.config import config
 
@@ -20,26 +20,7 @@ ALGORITHM = config.JWT_ALGORITHM
 class UserService:
     def __init__(self, repo: UserRepository):
         self.repo = repo
-        self.hash = Hash()
-
-    async def get_refresh_token(self, user: User):
-        user = await self.repo.get_by_id(user.id)
-        if not user:
-            raise UserNotFoundError
-        return user.refresh_token
-
-    async def update_refresh_token(self, user: User, refresh_token: str):
-        user = await self.repo.get_by_id(user.id)
-        if not user:
-            raise UserNotFoundError
-        try:
-            return await self.repo.update(user, {"refresh_token": refresh_token})
-        except Exception as e:
-            raise ServerError(str(e))
-
-    async def get_user_by_refresh_token(self, refresh_token: str):
-        result = await self.repo.get_user_by_refresh_token(refresh_token)
-        return result
+        self.hasher = password_hasher
 
     async def get_user_by_email_verification_token(self, token: str):
         email = jwt.decode(token, key=SECRET_KEY, algorithms=[ALGORITHM]).get("sub")
@@ -47,14 +28,18 @@ class UserService:
         return result
 
     async def create_user(self, data: UserCreate):
-        if await self.repo.get_by_email(data.email):
-            raise DuplicateEmailError
+        hashed_password = await self.hasher.hash(data.password)
         try:
             g = Gravatar(data.email)
             avatar = g.get_image()
-            return await self.repo.create(data, avatar=avatar)
+            user = await self.repo.create(
+                data, avatar=avatar, hashed_password=hashed_password
+            )
         except Exception as e:
             raise ServerError(str(e))
+        if user is None:
+            raise DuplicateEmailError
+        return user
 
     async def update_user(self, user: User, data):
         existing = await self.repo.get_by_id(user.id)
@@ -76,29 +61,48 @@ class UserService:
         except Exception as e:
             raise ServerError(str(e))
 
+    async def get_user_by_id(self, user_id: int):
+        try:
+            return await self.repo.get_by_id(user_id)
+        except Exception as e:
+            raise ServerError(str(e))
+
     async def get_user_by_email(self, email: str):
         try:
             return await self.repo.get_by_email(email)
         except Exception as e:
             raise ServerError(str(e))
 
-    async def verify_email(self, user: User):
-        existing = await self.repo.get_by_id(user.id)
-        if not existing:
-            raise UserNotFoundError
+    async def verify_email(self, token: str):
+        email = jwt.decode(token, key=SECRET_KEY, algorithms=[ALGORITHM]).get("sub")
         try:
-            return await self.repo.confirm_email(existing)
+            return await self.repo.confirm_email(email)
         except Exception as e:
             raise ServerError(str(e))
 
     async def update_avatar_url(self, email: str, url: str):
         return await self.repo.update_avatar_url(email, url)
 
+    async def revoke_tokens(self, user_id: int):
+        try:
+            version = await self.repo.bump_token_version(user_id)
+        except Exception as e:
+            raise ServerError(str(e))
+        if version is None:
+            raise UserNotFoundError
+        return version
+
+    async def update_password_hash(self, user: User, hashed_password: str):
+        try:
+            return await self.repo.set_password_hash(user, hashed_password)
+        except Exception as e:
+            raise ServerError(str(e))
+
     async def reset_password(self, user: User, new_password: str):
+        hashed_new_password = await self.hasher.hash(new_password)
         try:
-            hashed_new_password = self.hash.get_password_hash(new_password)
-            return await self.repo.update(
-                user, {"hashed_password": hashed_new_password}
+            return await self.repo.set_password_hash(
+                user, hashed_new_password, revoke_tokens=True
             )
         except Exception as e:
             raise ServerError(str(e))
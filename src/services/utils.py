@@ -1,11 +1,90 @@
+import time
+from functools import lru_cache
+
 from passlib.context import CryptContext
 
+from src.conf.config import config
+
+
+@lru_cache
+def crypt_context(rounds: int, min_rounds: int, max_rounds: int) -> CryptContext:
+    """
+    Build the password hashing policy for a bcrypt cost.
+
+    The accepted range is fleet-wide rather than derived from the cost each
+    instance calibrated, so instances do not rehash each other's hashes:
+    only hashes outside it are reported by ``verify_and_update``.
+    Args:
+        rounds (int): The bcrypt cost factor used for new hashes.
+        min_rounds (int): Lowest accepted cost.
+        max_rounds (int): Highest accepted cost.
+    Returns:
+        CryptContext: The hashing context.
+    """
+    return CryptContext(
+        schemes=["bcrypt"],
+        deprecated="auto",
+        bcrypt__default_rounds=rounds,
+        bcrypt__min_rounds=min(rounds, min_rounds),
+        bcrypt__max_rounds=max(rounds, max_rounds),
+    )
+
 
 class Hash:
-    pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+    rounds: int = config.HASH_ROUNDS
+
+    def __init__(self, rounds: int | None = None):
+        self.pwd_context = crypt_context(
+            rounds or self.rounds, config.HASH_MIN_ROUNDS, config.HASH_MAX_ROUNDS
+        )
 
     def verify_password(self, plain_password, hashed_password):
         return self.pwd_context.verify(plain_password, hashed_password)
 
+    def verify_and_update(self, plain_password, hashed_password):
+        return self.pwd_context.verify_and_update(plain_password, hashed_password)
+
     def get_password_hash(self, password: str):
         return self.pwd_context.hash(password)
+
+    @classmethod
+    def calibrate(cls, target_ms: float, min_rounds: int, max_rounds: int) -> int:
+        """
+        Pick the highest bcrypt cost whose hash time fits the latency budget
+        on this machine and use it for all new hashes.
+        Args:
+            target_ms (float): Latency budget of a single hash in milliseconds.
+            min_rounds (int): Lowest acceptable cost.
+            max_rounds (int): Highest acceptable cost.
+        Returns:
+            int: The selected cost.
+        """
+        context = crypt_context(min_rounds, min_rounds, max_rounds)
+        context.hash("calibration")  # warm up
+        start = time.perf_counter()
+        context.hash("calibration")
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        rounds = min_rounds
+        # Each extra round doubles the work.
+        while rounds < max_rounds and elapsed_ms * 2 <= target_ms:
+            rounds += 1
+            elapsed_ms *= 2
+        cls.rounds = rounds
+        return rounds
+
+
+# Module-level helpers so that they can be pickled into worker processes.
+def hash_password(password: str, rounds: int | None = None) -> str:
+    return Hash(rounds).get_password_hash(password)
+
+
+def verify_password(
+    plain_password: str, hashed_password: str, rounds: int | None = None
+) -> bool:
+    return Hash(rounds).verify_password(plain_password, hashed_password)
+
+
+def verify_and_update_password(
+    plain_password: str, hashed_password: str, rounds: int | None = None
+) -> tuple[bool, str | None]:
+    return Hash(rounds).verify_and_update(plain_password, hashed_password)
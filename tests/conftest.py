@@ -1,3 +1,10 @@
+import os
+
+# Keep rate-limit counters in process so they can be reset between tests.
+os.environ.setdefault("RATE_LIMIT_STORAGE_URI", "memory://")
+# Cheapest bcrypt cost to keep the suite fast.
+os.environ.setdefault("HASH_ROUNDS", "4")
+
 import pytest
 from src.db.models import User, Contacts
 
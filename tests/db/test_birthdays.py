@@ -0,0 +1,90 @@
+from datetime import date
+
+import pytest
+import pytest_asyncio
+from sqlalchemy import insert
+
+from src.db.configurations import DatabaseSessionManager
+from src.db.models import Base, Contacts, User
+from src.repository.contacts import ContactsRepository
+
+BIRTHDATES = {
+    "dec28": date(1980, 12, 28),
+    "dec31": date(1990, 12, 31),
+    "jan02": date(1985, 1, 2),
+    "jan05": date(1970, 1, 5),
+    "feb03": date(1999, 2, 3),
+    "feb28": date(1991, 2, 28),
+    "leap": date(1992, 2, 29),
+    "mar01": date(1993, 3, 1),
+}
+
+
+@pytest_asyncio.fixture
+async def repo(tmp_path):
+    manager = DatabaseSessionManager(f"sqlite+aiosqlite:///{tmp_path / 'bd.db'}")
+    async with manager._engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+        await conn.execute(
+            insert(Contacts),
+            [
+                {
+                    "name": name,
+                    "email": f"{name}@example.com",
+                    "phone": "1",
+                    "birthdate": birthdate,
+                    "user_id": 1,
+                }
+                for name, birthdate in BIRTHDATES.items()
+            ],
+        )
+    async with manager.session() as session:
+        yield ContactsRepository(session)
+    await manager._engine.dispose()
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "today, days, expected",
+    [
+        # Wraps into January, soonest first.
+        (date(2025, 12, 28), 7, ["dec28", "dec31", "jan02"]),
+        # The window crosses from a 31-day month into the next one.
+        (date(2025, 1, 28), 7, ["feb03"]),
+        # February 29 birthdays are observed on March 1 in common years...
+        (date(2025, 2, 28), 0, ["feb28"]),
+        (date(2025, 3, 1), 0, ["leap", "mar01"]),
+        (date(2025, 2, 27), 2, ["feb28", "leap", "mar01"]),
+        # ...and on the day itself in leap years.
+        (date(2024, 2, 29), 0, ["leap"]),
+        (date(2024, 3, 1), 0, ["mar01"]),
+    ],
+)
+async def test_upcoming_birthdays(repo, today, days, expected):
+    rows = await repo.upcoming_birthdays(days, user=User(id=1), today=today)
+    assert [row["name"] for row in rows] == expected
+
+
+@pytest.mark.asyncio
+async def test_upcoming_birthdays_for_a_whole_year(repo):
+    rows = await repo.upcoming_birthdays(365, user=User(id=1), today=date(2025, 3, 1))
+    assert [row["name"] for row in rows] == [
+        "leap",
+        "mar01",
+        "dec28",
+        "dec31",
+        "jan02",
+        "jan05",
+        "feb03",
+        "feb28",
+    ]
+
+
+@pytest.mark.asyncio
+async def test_birthday_ordinal_follows_birthdate(repo):
+    contact = await repo.get_by_email("dec28@example.com", user=User(id=1))
+    assert contact.birthday_ordinal == 1228
+    contact = await repo.update(
+        contact.id, {"birthdate": date(1980, 2, 29)}, user=User(id=1)
+    )
+    assert contact.birthday_ordinal == 229
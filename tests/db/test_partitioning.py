@@ -0,0 +1,34 @@
+from datetime import date
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import Session
+
+from src.db.models import Base, Contacts, User
+
+
+def test_flushed_contact_writes_carry_the_partition_key():
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    statements = []
+    event.listen(
+        engine,
+        "before_cursor_execute",
+        lambda conn, cursor, statement, *args: statements.append(statement),
+    )
+    with Session(engine) as session:
+        session.add(
+            User(id=1, name="A", surname="B", email="a@b.c", hashed_password="-")
+        )
+        contact = Contacts(
+            name="N", email="n@b.c", phone="1", birthdate=date(1990, 1, 1), user_id=1
+        )
+        session.add(contact)
+        session.flush()
+        contact.name = "M"
+        session.flush()
+        session.delete(contact)
+        session.flush()
+
+    writes = [s for s in statements if s.startswith(("UPDATE contacts", "DELETE FROM"))]
+    assert len(writes) == 2
+    assert all("contacts.user_id = ?" in write for write in writes)
@@ -0,0 +1,77 @@
+from datetime import date
+
+import pytest
+import pytest_asyncio
+from sqlalchemy import insert
+
+from src.db.configurations import DatabaseSessionManager
+from src.db.models import Base, Contacts, User, normalize_phone
+from src.repository.contacts import ContactsRepository
+
+PHONES = {
+    "formatted": "+1 (234) 567-890",
+    "plain": "1234567890",
+    "other": "+1 234 999 00 00",
+    "intl": "0044 20 7946 0000",
+    "text": "ask reception",
+}
+
+
+@pytest.mark.parametrize(
+    "phone, expected",
+    [
+        ("+1 (234) 567-890", "+1234567890"),
+        ("1234567890", "+1234567890"),
+        ("0044 20 7946 0000", "+442079460000"),
+        ("ask reception", None),
+        ("1" * 16, None),
+    ],
+)
+def test_normalize_phone(phone, expected):
+    assert normalize_phone(phone) == expected
+
+
+@pytest_asyncio.fixture
+async def repo(tmp_path):
+    manager = DatabaseSessionManager(f"sqlite+aiosqlite:///{tmp_path / 'ph.db'}")
+    async with manager._engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+        # Core insert: phone_normalized comes from the column default.
+        await conn.execute(
+            insert(Contacts),
+            [
+                {
+                    "name": name,
+                    "email": f"{name}@example.com",
+                    "phone": phone,
+                    "birthdate": date(1990, 1, 1),
+                    "user_id": 1,
+                }
+                for name, phone in PHONES.items()
+            ],
+        )
+    async with manager.session() as session:
+        yield ContactsRepository(session)
+    await manager._engine.dispose()
+
+
+async def names(repo, phone, prefix=False):
+    rows = await repo.find_by_phone(
+        normalize_phone(phone), user=User(id=1), prefix=prefix
+    )
+    return sorted(row["name"] for row in rows)
+
+
+@pytest.mark.asyncio
+async def test_find_by_phone_ignores_formatting(repo):
+    assert await names(repo, "1-234-567-890") == ["formatted", "plain"]
+    assert await names(repo, "+44 20 7946 0000") == ["intl"]
+    assert await names(repo, "+1 234") == []
+    assert await names(repo, "+1 234", prefix=True) == ["formatted", "other", "plain"]
+
+
+@pytest.mark.asyncio
+async def test_updated_phone_is_normalized(repo):
+    contact = await repo.update(5, {"phone": "(234) 999-00-00"}, user=User(id=1))
+    assert contact.phone_normalized == "+2349990000"
+    assert await names(repo, "2349990000") == ["text"]
@@ -0,0 +1,52 @@
+import pytest
+from sqlalchemy import exc, text
+
+from src.db.configurations import DatabaseSessionManager
+from src.db.pool import InstrumentedAsyncQueuePool
+
+
+def make_manager(tmp_path, **pool_options):
+    return DatabaseSessionManager(
+        f"sqlite+aiosqlite:///{tmp_path / 'pool.db'}",
+        poolclass=InstrumentedAsyncQueuePool,
+        **pool_options,
+    )
+
+
+@pytest.mark.asyncio
+async def test_pool_stats_track_checkouts_and_churn(tmp_path):
+    manager = make_manager(tmp_path, pool_size=1, max_overflow=1)
+
+    async with manager.session() as session:
+        await session.execute(text("SELECT 1"))
+        stats = manager.pool_stats()
+        assert stats["checked_out"] == 1
+        assert stats["idle"] == 0
+
+        async with manager.session() as other:
+            await other.execute(text("SELECT 1"))
+            assert manager.pool_stats()["overflow"] == 1
+
+    stats = manager.pool_stats()
+    assert stats["checked_out"] == 0
+    assert stats["checkouts"] == 2
+    assert stats["checkout_wait"]["count"] == 2
+    assert stats["connections_opened"] == 2
+    # The overflow connection is closed on checkin.
+    assert stats["connections_closed"] == 1
+
+    await manager._engine.dispose()
+
+
+@pytest.mark.asyncio
+async def test_pool_counts_checkout_timeouts(tmp_path):
+    manager = make_manager(tmp_path, pool_size=1, max_overflow=0, pool_timeout=0.01)
+
+    async with manager.session() as session:
+        await session.execute(text("SELECT 1"))
+        async with manager.session() as other:
+            with pytest.raises(exc.TimeoutError):
+                await other.execute(text("SELECT 1"))
+
+    assert manager.pool_stats()["checkout_timeouts"] == 1
+    await manager._engine.dispose()
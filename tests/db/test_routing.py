@@ -0,0 +1,176 @@
+import json
+from datetime import date
+
+import pytest
+import pytest_asyncio
+from sqlalchemy import insert
+
+from src.db.configurations import DatabaseSessionManager
+from src.db.models import Base, Contacts, User
+from src.db.routing import set_session_user
+from src.db.unit_of_work import unit_of_work
+from src.repository.contacts import ContactsRepository
+from src.services.contact_export import stream_export
+
+
+async def seed(engine, contact_name: str):
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+        await conn.execute(
+            insert(Contacts).values(
+                name=contact_name,
+                birthdate=date(1990, 1, 1),
+                email=f"{contact_name}@example.com",
+                phone="123",
+                user_id=1,
+            )
+        )
+
+
+@pytest_asyncio.fixture
+async def manager(tmp_path):
+    manager = DatabaseSessionManager(
+        f"sqlite+aiosqlite:///{tmp_path / 'primary.db'}",
+        replica_urls=[
+            f"sqlite+aiosqlite:///{tmp_path / 'replica1.db'}",
+            f"sqlite+aiosqlite:///{tmp_path / 'replica2.db'}",
+        ],
+    )
+    await seed(manager._engine, "primary")
+    await seed(manager._replicas[0], "replica1")
+    await seed(manager._replicas[1], "replica2")
+    yield manager
+    for engine in [manager._engine, *manager._replicas]:
+        await engine.dispose()
+
+
+async def contact_names(manager, user_id=None):
+    async with manager.session() as session:
+        if user_id is not None:
+            session.info["user_id"] = user_id
+        contacts = await ContactsRepository(session).get_all(
+            limit=10, skip=0, user=User(id=1)
+        )
+        return [contact["name"] for contact in contacts]
+
+
+@pytest.mark.asyncio
+async def test_read_only_queries_go_to_replicas_round_robin(manager):
+    assert await contact_names(manager) == ["replica1"]
+    assert await contact_names(manager) == ["replica2"]
+    assert await contact_names(manager) == ["replica1"]
+
+
+@pytest.mark.asyncio
+async def test_other_queries_stay_on_primary(manager):
+    async with manager.session() as session:
+        contact = await ContactsRepository(session).get_by_id(1, user=User(id=1))
+    assert contact.name == "primary"
+
+
+@pytest.mark.asyncio
+async def test_reads_after_own_write_go_to_primary(manager):
+    async with manager.session() as session:
+        session.info["user_id"] = 1
+        await ContactsRepository(session).update(
+            1, {"name": "updated"}, user=User(id=1)
+        )
+        await unit_of_work(session).commit()
+
+    assert await contact_names(manager, user_id=1) == ["updated"]
+    # Other users are not pinned.
+    assert await contact_names(manager, user_id=2) == ["replica1"]
+
+
+class SharedStore:
+    """In-memory stand-in for the Redis keys shared by workers."""
+
+    def __init__(self):
+        self.keys = {}
+
+    async def set(self, key, value, px):
+        self.keys[key] = value
+
+    async def exists(self, key):
+        return key in self.keys
+
+
+@pytest.mark.asyncio
+async def test_reads_after_write_on_another_worker_go_to_primary(manager, tmp_path):
+    store = SharedStore()
+    manager._router.store = store
+    # A second worker process, with its own router, on the same databases.
+    other = DatabaseSessionManager(
+        f"sqlite+aiosqlite:///{tmp_path / 'primary.db'}",
+        replica_urls=[f"sqlite+aiosqlite:///{tmp_path / 'replica1.db'}"],
+        read_your_writes_store=store,
+    )
+    async with manager.session() as session:
+        await set_session_user(session, 1)
+        await ContactsRepository(session).update(
+            1, {"name": "updated"}, user=User(id=1)
+        )
+        await unit_of_work(session).commit()
+
+    try:
+        async with other.session() as session:
+            await set_session_user(session, 1)
+            contacts = await ContactsRepository(session).get_all(
+                limit=10, user=User(id=1)
+            )
+        assert [contact["name"] for contact in contacts] == ["updated"]
+    finally:
+        for engine in [other._engine, *other._replicas]:
+            await engine.dispose()
+
+
+@pytest.mark.asyncio
+async def test_streamed_reads_go_to_replicas(manager):
+    async with manager.session() as session:
+        repo = ContactsRepository(session)
+        partitions = [
+            partition async for partition in repo.stream_all(User(id=1), fetch_size=1)
+        ]
+        assert session.info["read_only"] is False
+    assert [[row["name"] for row in partition] for partition in partitions] == [
+        ["replica1"]
+    ]
+
+
+@pytest.mark.asyncio
+async def test_export_after_own_write_reads_from_primary(manager):
+    async with manager.session() as session:
+        session.info["user_id"] = 1
+        await ContactsRepository(session).update(
+            1, {"name": "updated"}, user=User(id=1)
+        )
+        await unit_of_work(session).commit()
+
+    chunks = [
+        chunk
+        async for chunk in stream_export(
+            manager.session, User(id=1), "ndjson", fetch_size=1
+        )
+    ]
+    assert [json.loads(line)["name"] for line in b"".join(chunks).splitlines()] == [
+        "updated"
+    ]
+
+
+@pytest.mark.asyncio
+async def test_search_picks_one_replica_per_query(manager, monkeypatch):
+    choose_replica = manager._router.choose_replica
+    picks = []
+
+    def counting_choose_replica():
+        picks.append(choose_replica())
+        return picks[-1]
+
+    monkeypatch.setattr(manager._router, "choose_replica", counting_choose_replica)
+    async with manager.session() as session:
+        rows = await ContactsRepository(session).search(
+            None, None, None, user=User(id=1), q="replica", limit=10
+        )
+
+    assert [row["name"] for row in rows] == ["replica1"]
+    assert len(picks) == 1
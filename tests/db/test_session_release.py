@@ -0,0 +1,52 @@
+from fastapi import APIRouter, Depends, FastAPI
+from fastapi.testclient import TestClient
+from pydantic import BaseModel, field_serializer
+from sqlalchemy import text
+
+from src.api.routes import SessionReleasingRoute
+from src.db.configurations import DatabaseSessionManager, track_request_session
+from src.db.pool import InstrumentedAsyncQueuePool
+
+
+def test_connection_is_released_before_serialization(tmp_path):
+    manager = DatabaseSessionManager(
+        f"sqlite+aiosqlite:///{tmp_path / 'release.db'}",
+        poolclass=InstrumentedAsyncQueuePool,
+    )
+    pool = manager._engine.sync_engine.pool
+    checked_out_during_serialization = []
+
+    class Answer(BaseModel):
+        value: int
+
+        @field_serializer("value")
+        def record_pool(self, value: int):
+            checked_out_during_serialization.append(pool.checkedout())
+            return value
+
+    async def get_db():
+        async with manager.session() as session:
+            track_request_session(session)
+            yield session
+
+    router = APIRouter(route_class=SessionReleasingRoute)
+
+    @router.get("/answer", response_model=Answer)
+    async def answer(db=Depends(get_db)):
+        return {"value": (await db.execute(text("SELECT 42"))).scalar_one()}
+
+    @router.get("/no-db")
+    async def no_db(db=Depends(get_db)):
+        return {"value": 0}
+
+    app = FastAPI()
+    app.include_router(router)
+
+    with TestClient(app) as client:
+        assert client.get("/answer").json() == {"value": 42}
+        assert checked_out_during_serialization == [0]
+
+        # A session that never executes does not check out a connection.
+        checkouts = pool.stats()["checkouts"]
+        assert client.get("/no-db").status_code == 200
+        assert pool.stats()["checkouts"] == checkouts
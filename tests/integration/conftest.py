@@ -8,10 +8,16 @@ from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, Asyn
 
 from src.main import app
 from src.db.models import Base, User
-from src.db.configurations import get_db_session as get_db
+from src.db.configurations import (
+    get_db_session as get_db,
+    get_streaming_session_factory,
+    track_request_session,
+)
 from src.services.auth import create_access_token
 from src.services.utils import Hash
+from src.services.auth_cache import principal_cache
 from src.conf.config import config
+from src.conf.limiter import limiter
 from tests.conftest import mock_user
 
 SQLALCHEMY_DATABASE_URL = "sqlite+aiosqlite:///./test.db"
@@ -46,15 +52,22 @@ def init_models_wrap(mock_user: User):
             session.add(current_user)
             await session.commit()
 
+    principal_cache.clear()
     asyncio.run(init_models())
 
 
+@pytest.fixture(autouse=True)
+def reset_rate_limits():
+    limiter.reset()
+
+
 @pytest.fixture(scope="module")
 def client():
     # Dependency override
 
     async def override_get_db():
         async with TestingSessionLocal() as session:
+            track_request_session(session)
             try:
                 yield session
             except Exception as err:
@@ -62,6 +75,9 @@ def client():
                 raise
 
     app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_streaming_session_factory] = (
+        lambda: TestingSessionLocal
+    )
 
     yield TestClient(app)
 
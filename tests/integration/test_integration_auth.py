@@ -2,12 +2,14 @@ import pytest
 from src.schemas.auth import UserCreate, UserSchema, Token, RefreshTokenRequest
 from fastapi.testclient import TestClient
 from unittest.mock import Mock
-from src.db.models import User
+from src.db.models import User, UserSession
 from sqlalchemy.future import select
 from tests.integration.conftest import TestingSessionLocal
 from src.conf.config import config
 from jose import jwt
 from src.services.auth import create_access_token
+from src.services.utils import Hash
+from src.services.sessions import hash_refresh_token
 
 
 @pytest.mark.asyncio
@@ -35,6 +37,22 @@ async def test_register_user(client: TestClient, monkeypatch):
     assert "hashed_password" not in data
 
 
+@pytest.mark.asyncio
+async def test_register_user_email_is_case_insensitive(client: TestClient, monkeypatch):
+    monkeypatch.setattr("src.services.email.send_verification_email", Mock())
+    response = client.post(
+        "api/auth/signup",
+        json={
+            "name": "newuser",
+            "surname": "New",
+            "email": "NewUser@example.com",
+            "password": "password",
+        },
+    )
+
+    assert response.status_code == 409
+
+
 @pytest.mark.asyncio
 async def test_login_user(client: TestClient, mock_user):
     async with TestingSessionLocal() as session:
@@ -70,15 +88,54 @@ async def test_refresh_token(client: TestClient, mock_user):
             current_user.is_verified = True
             await session.commit()
 
-        data = RefreshTokenRequest(refresh_token=current_user.refresh_token)
-        response = client.post("api/auth/refresh", json=data.model_dump())
+    login = client.post(
+        "api/auth/login",
+        data={"username": mock_user.email, "password": mock_user.hashed_password},
+        headers={"Content-Type": "application/x-www-form-urlencoded"},
+    )
+    refresh_token = login.json()["refresh_token"]
+
+    data = RefreshTokenRequest(refresh_token=refresh_token)
+    response = client.post("api/auth/refresh", json=data.model_dump())
 
     assert response.status_code == 200
     data = response.json()
     Token.model_validate(data)
     assert "access_token" in data
     assert data["token_type"] == "bearer"
-    assert "refresh_token" in data
+    assert data["refresh_token"] != refresh_token
+
+    # The rotated token cannot be replayed.
+    response = client.post("api/auth/refresh", json={"refresh_token": refresh_token})
+    assert response.status_code == 401
+
+
+@pytest.mark.asyncio
+async def test_sessions_are_per_device(client: TestClient, mock_user):
+    tokens = []
+    for device in ("phone", "laptop"):
+        response = client.post(
+            "api/auth/login",
+            data={"username": mock_user.email, "password": mock_user.hashed_password},
+            headers={
+                "Content-Type": "application/x-www-form-urlencoded",
+                "User-Agent": device,
+            },
+        )
+        assert response.status_code == 200
+        tokens.append(response.json()["refresh_token"])
+
+    async with TestingSessionLocal() as session:
+        result = await session.execute(
+            select(UserSession.device).where(
+                UserSession.token_hash.in_([hash_refresh_token(t) for t in tokens])
+            )
+        )
+        assert sorted(result.scalars().all()) == ["laptop", "phone"]
+
+    for token in tokens:
+        response = client.post("api/auth/refresh", json={"refresh_token": token})
+        assert response.status_code == 200
 
 
 @pytest.mark.asyncio
@@ -138,3 +195,139 @@ async def test_reset_password(client: TestClient, mock_user):
         updated_user = updated_user.scalar_one_or_none()
         assert updated_user is not None
         assert updated_user.hashed_password != current_user.hashed_password
+
+
+@pytest.mark.asyncio
+async def test_stateless_token_revoked_by_password_reset(
+    client: TestClient, mock_user, monkeypatch
+):
+    monkeypatch.setattr(config, "JWT_STATELESS", True)
+    async with TestingSessionLocal() as session:
+        current_user = await session.execute(
+            select(User).where(User.email == mock_user.email)
+        )
+        current_user = current_user.scalar_one_or_none()
+        current_user.is_verified = True
+        current_user.hashed_password = Hash().get_password_hash("stateless")
+        await session.commit()
+
+    response = client.post(
+        "api/auth/login",
+        data={"username": mock_user.email, "password": "stateless"},
+        headers={"Content-Type": "application/x-www-form-urlencoded"},
+    )
+    assert response.status_code == 200
+    access_token = response.json()["access_token"]
+    payload = jwt.decode(
+        access_token, config.JWT_SECRET, algorithms=[config.JWT_ALGORITHM]
+    )
+    assert payload["uid"] == current_user.id
+    assert payload["ver"] == current_user.token_version
+
+    headers = {"Authorization": f"Bearer {access_token}"}
+    response = client.get("api/contacts/", headers=headers)
+    assert response.status_code == 200
+
+    response = client.post(
+        "api/auth/reset-password",
+        json={
+            "email": mock_user.email,
+            "old_password": "stateless",
+            "new_password": "stateless-new",
+        },
+    )
+    assert response.status_code == 200
+
+    response = client.get("api/contacts/", headers=headers)
+    assert response.status_code == 401
+
+
+async def login_with_password(client: TestClient, email: str, password: str):
+    async with TestingSessionLocal() as session:
+        current_user = await session.execute(select(User).where(User.email == email))
+        current_user = current_user.scalar_one_or_none()
+        current_user.is_verified = True
+        current_user.hashed_password = Hash().get_password_hash(password)
+        await session.commit()
+
+    response = client.post(
+        "api/auth/login",
+        data={"username": email, "password": password},
+        headers={"Content-Type": "application/x-www-form-urlencoded"},
+    )
+    assert response.status_code == 200
+    return response.json()
+
+
+@pytest.mark.asyncio
+async def test_logout_revokes_access_token(client: TestClient, mock_user):
+    tokens = await login_with_password(client, mock_user.email, "logout")
+    headers = {"Authorization": f"Bearer {tokens['access_token']}"}
+    assert client.get("api/contacts/", headers=headers).status_code == 200
+
+    response = client.post(
+        "api/auth/logout",
+        json={"refresh_token": tokens["refresh_token"]},
+        headers=headers,
+    )
+    assert response.status_code == 204
+
+    assert client.get("api/contacts/", headers=headers).status_code == 401
+    response = client.post(
+        "api/auth/refresh", json={"refresh_token": tokens["refresh_token"]}
+    )
+    assert response.status_code == 401
+
+
+@pytest.mark.asyncio
+async def test_logout_all_revokes_every_device(client: TestClient, mock_user):
+    first = await login_with_password(client, mock_user.email, "logout-all")
+    second = await login_with_password(client, mock_user.email, "logout-all")
+    second_headers = {"Authorization": f"Bearer {second['access_token']}"}
+    assert client.get("api/contacts/", headers=second_headers).status_code == 200
+
+    response = client.post(
+        "api/auth/logout-all",
+        headers={"Authorization": f"Bearer {first['access_token']}"},
+    )
+    assert response.status_code == 204
+
+    assert client.get("api/contacts/", headers=second_headers).status_code == 401
+    for tokens in (first, second):
+        response = client.post(
+            "api/auth/refresh", json={"refresh_token": tokens["refresh_token"]}
+        )
+        assert response.status_code == 401
+
+
+@pytest.mark.asyncio
+async def test_login_rehashes_out_of_policy_hash(
+    client: TestClient, mock_user, monkeypatch
+):
+    # A hash made before the fleet raised its minimum cost.
+    old_hash = Hash(Hash.rounds).get_password_hash("rehash")
+    monkeypatch.setattr(Hash, "rounds", Hash.rounds + 1)
+    monkeypatch.setattr(config, "HASH_MIN_ROUNDS", Hash.rounds)
+    async with TestingSessionLocal() as session:
+        current_user = await session.execute(
+            select(User).where(User.email == mock_user.email)
+        )
+        current_user = current_user.scalar_one_or_none()
+        current_user.is_verified = True
+        current_user.hashed_password = old_hash
+        await session.commit()
+
+    response = client.post(
+        "api/auth/login",
+        data={"username": mock_user.email, "password": "rehash"},
+        headers={"Content-Type": "application/x-www-form-urlencoded"},
+    )
+    assert response.status_code == 200
+
+    async with TestingSessionLocal() as session:
+        updated_user = await session.execute(
+            select(User).where(User.email == mock_user.email)
+        )
+        updated_user = updated_user.scalar_one_or_none()
+        assert updated_user.hashed_password.startswith(f"$2b${Hash.rounds:02d}$")
+        assert Hash().verify_password("rehash", updated_user.hashed_password)
@@ -1,3 +1,8 @@
+import csv
+import io
+import json
+from datetime import date
+
 import pytest
 from fastapi.testclient import TestClient
 from unittest.mock import Mock
@@ -7,6 +12,9 @@ from tests.integration.conftest import TestingSessionLocal
 from src.conf.config import config
 from src.db.models import Contacts
 from src.schemas.contacts import ContactSchema
+from src.services.auth_cache import principal_cache
+from src.services.typeahead import typeahead
+from tests.integration.test_integration_query_count import count_statements
 
 
 @pytest.mark.asyncio
@@ -43,6 +51,24 @@ async def test_create_user_contact(client: TestClient, get_token):
         assert str(db_contact.birthdate) == data["birthdate"]
 
 
+@pytest.mark.asyncio
+async def test_create_contact_duplicate_email_is_case_insensitive(
+    client: TestClient, get_token
+):
+    headers = {"Authorization": f"Bearer {get_token}"}
+    data = {
+        "name": "John Doe",
+        "email": "John@example.com",
+        "phone": "1234567890",
+        "birthdate": "1990-01-01",
+    }
+
+    response = client.post("/api/contacts/", json=data, headers=headers)
+
+    assert response.status_code == 400
+    assert response.json()["message"] == "Email already exists"
+
+
 @pytest.mark.asyncio
 async def test_get_user_contacts(client: TestClient, get_token):
 
@@ -85,3 +111,447 @@ async def test_delete_user_contact(client: TestClient, get_token):
         result = await session.execute(select(Contacts).where(Contacts.id == 1))
         db_contact = result.scalars().first()
         assert not db_contact
+
+
+@pytest.mark.asyncio
+async def test_repeated_requests_hit_principal_cache(client: TestClient, get_token):
+    headers = {"Authorization": f"Bearer {get_token}"}
+    client.get("/api/contacts/", headers=headers)
+    hits = principal_cache.hits
+
+    response = client.get("/api/contacts/", headers=headers)
+
+    assert response.status_code == 200
+    assert principal_cache.hits == hits + 1
+
+
+@pytest.mark.asyncio
+async def test_search_ranks_and_pages_with_link_header(client: TestClient, get_token):
+    headers = {"Authorization": f"Bearer {get_token}"}
+    for name, email in [
+        ("Ann Zimmer", "ann.zimmer@example.com"),
+        ("Zim", "zim@example.com"),
+        ("Bob Zimmerman", "bob@example.com"),
+    ]:
+        payload = {
+            "name": name,
+            "email": email,
+            "phone": "5550000",
+            "birthdate": "1991-02-03",
+        }
+        assert client.post("/api/contacts/", json=payload, headers=headers).is_success
+
+    response = client.get("/api/contacts/search/?q=zim&limit=1", headers=headers)
+    assert response.status_code == 200
+    assert [c["name"] for c in response.json()] == ["Zim"]
+
+    names = []
+    while "next" in response.links:
+        response = client.get(response.links["next"]["url"], headers=headers)
+        assert response.status_code == 200
+        names += [c["name"] for c in response.json()]
+    assert sorted(names) == ["Ann Zimmer", "Bob Zimmerman"]
+
+
+@pytest.mark.asyncio
+async def test_search_rejects_invalid_cursor(client: TestClient, get_token):
+    headers = {"Authorization": f"Bearer {get_token}"}
+    response = client.get("/api/contacts/search/?cursor=not-a-cursor", headers=headers)
+    assert response.status_code == 400
+    assert response.json()["message"] == "Invalid cursor"
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "sort, order", [("id", "asc"), ("name", "asc"), ("created_at", "desc")]
+)
+async def test_get_contacts_pages_with_cursor(
+    client: TestClient, get_token, sort, order
+):
+    headers = {"Authorization": f"Bearer {get_token}"}
+    url = f"/api/contacts/?sort={sort}&order={order}"
+    expected = client.get(f"{url}&limit=100", headers=headers).json()
+    assert len(expected) > 2
+
+    response = client.get(f"{url}&limit=2", headers=headers)
+    pages = [response.json()]
+    while "next" in response.links:
+        assert len(pages) <= len(expected)
+        response = client.get(response.links["next"]["url"], headers=headers)
+        assert response.status_code == 200
+        pages.append(response.json())
+
+    assert [len(page) for page in pages[:-1]] == [2] * (len(pages) - 1)
+    assert [c for page in pages for c in page] == expected
+
+
+@pytest.mark.asyncio
+async def test_get_contacts_skip_is_not_carried_into_next_link(
+    client: TestClient, get_token
+):
+    headers = {"Authorization": f"Bearer {get_token}"}
+    for i in range(6):
+        contact = {
+            "name": f"Skip {i}",
+            "email": f"skip{i}@example.com",
+            "phone": "555",
+            "birthdate": "1990-01-01",
+        }
+        client.post("/api/contacts/", json=contact, headers=headers)
+    expected = client.get("/api/contacts/?limit=100", headers=headers).json()
+
+    response = client.get("/api/contacts/?skip=2&limit=2", headers=headers)
+    assert response.json() == expected[2:4]
+    next_url = response.links["next"]["url"]
+    assert "skip=" not in next_url
+
+    response = client.get(next_url, headers=headers)
+    assert response.json() == expected[4:6]
+
+    cursor = next_url.split("cursor=")[1]
+    response = client.get(f"/api/contacts/?skip=2&cursor={cursor}", headers=headers)
+    assert response.status_code == 400
+    assert response.json()["message"] == "skip cannot be combined with cursor"
+
+
+@pytest.mark.asyncio
+async def test_get_contacts_validates_page_size_and_cursor(
+    client: TestClient, get_token
+):
+    headers = {"Authorization": f"Bearer {get_token}"}
+    limit = config.CONTACTS_MAX_PAGE_SIZE + 1
+    response = client.get(f"/api/contacts/?limit={limit}", headers=headers)
+    assert response.status_code == 422
+
+    response = client.get("/api/contacts/?limit=1", headers=headers)
+    cursor = response.links["next"]["url"].split("cursor=")[1]
+    response = client.get(f"/api/contacts/?sort=name&cursor={cursor}", headers=headers)
+    assert response.status_code == 400
+
+
+@pytest.mark.asyncio
+async def test_import_contacts_reports_invalid_and_duplicate_rows(
+    client: TestClient, get_token
+):
+    headers = {"Authorization": f"Bearer {get_token}"}
+    existing = {
+        "name": "Existing",
+        "email": "existing.import@example.com",
+        "phone": "555",
+        "birthdate": "1990-01-01",
+    }
+    assert client.post("/api/contacts/", json=existing, headers=headers).is_success
+    csv_data = (
+        "name,email,phone,birthdate\n"
+        "Imported One,imported1@example.com,555,1990-01-01\n"
+        "Bad,not-an-email,555,1990-01-01\n"
+        "Imported Again,IMPORTED1@example.com,555,1990-01-01\n"
+        "Existing,EXISTING.import@example.com,555,1990-01-01\n"
+        "Imported Two,imported2@example.com,555,1990-02-02\n"
+    )
+
+    response = client.post(
+        "/api/contacts/import",
+        files={"file": ("contacts.csv", csv_data, "text/csv")},
+        headers=headers,
+    )
+
+    assert response.status_code == 200, response.text
+    report = response.json()
+    assert {k: report[k] for k in ("total", "imported", "duplicates", "invalid")} == {
+        "total": 5,
+        "imported": 2,
+        "duplicates": 2,
+        "invalid": 1,
+    }
+    assert [(e["row"], e["message"]) for e in report["errors"] if e["row"] != 2] == [
+        (3, "Duplicate email"),
+        (4, "Email already exists"),
+    ]
+    async with TestingSessionLocal() as session:
+        result = await session.execute(
+            select(Contacts.name).where(Contacts.email.like("imported%"))
+        )
+        assert sorted(result.scalars().all()) == ["Imported One", "Imported Two"]
+
+
+@pytest.mark.asyncio
+async def test_import_contacts_rejects_unknown_format(client: TestClient, get_token):
+    headers = {"Authorization": f"Bearer {get_token}"}
+    response = client.post(
+        "/api/contacts/import",
+        files={"file": ("contacts.txt", "hello", "text/plain")},
+        headers=headers,
+    )
+    assert response.status_code == 400
+
+
+@pytest.mark.asyncio
+async def test_export_contacts_streams_ndjson_and_csv(client: TestClient, get_token):
+    headers = {"Authorization": f"Bearer {get_token}"}
+    expected = client.get("/api/contacts/?limit=100", headers=headers).json()
+
+    response = client.get("/api/contacts/export", headers=headers)
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    assert [json.loads(line) for line in response.text.splitlines()] == expected
+
+    response = client.get("/api/contacts/export?format=csv", headers=headers)
+    assert response.status_code == 200
+    rows = list(csv.DictReader(io.StringIO(response.text)))
+    assert [row["email"] for row in rows] == [c["email"] for c in expected]
+
+
+def batch_contact(email: str, name: str = "Batch"):
+    return {"name": name, "email": email, "phone": "555", "birthdate": "1990-01-01"}
+
+
+@pytest.mark.asyncio
+async def test_batch_applies_operations_in_order(client: TestClient, get_token):
+    headers = {"Authorization": f"Bearer {get_token}"}
+    a = client.post(
+        "/api/contacts/", json=batch_contact("batch.a@example.com"), headers=headers
+    ).json()
+    b = client.post(
+        "/api/contacts/", json=batch_contact("batch.b@example.com"), headers=headers
+    ).json()
+
+    operations = [
+        {"op": "delete", "id": a["id"]},
+        # Takes the email freed by the delete, and frees its own.
+        {"op": "update", "id": b["id"], "data": batch_contact("BATCH.A@example.com")},
+        {"op": "create", "data": batch_contact("batch.b@example.com", "New B")},
+        {"op": "delete", "id": 999999},
+        {"op": "create", "data": batch_contact("batch.c@example.com")},
+        {"op": "create", "data": batch_contact("batch.c@example.com")},
+        {"op": "update", "id": a["id"], "data": batch_contact("batch.d@example.com")},
+    ]
+    response = client.post(
+        "/api/contacts/batch",
+        json={"operations": operations, "atomic": False},
+        headers=headers,
+    )
+
+    assert response.status_code == 200
+    body = response.json()
+    assert body["applied"] is True
+    assert [r["status"] for r in body["results"]] == [204, 200, 201, 404, 201, 400, 404]
+    async with TestingSessionLocal() as session:
+        result = await session.execute(
+            select(Contacts.name, Contacts.email)
+            .where(Contacts.email.like("batch._@example.com"))
+            .order_by(Contacts.email)
+        )
+        assert result.all() == [
+            ("Batch", "BATCH.A@example.com"),
+            ("New B", "batch.b@example.com"),
+            ("Batch", "batch.c@example.com"),
+        ]
+
+
+@pytest.mark.asyncio
+async def test_batch_applies_email_chains_in_request_order(
+    client: TestClient, get_token
+):
+    headers = {"Authorization": f"Bearer {get_token}"}
+    x = client.post(
+        "/api/contacts/",
+        json=batch_contact("chain.a@example.com", "X"),
+        headers=headers,
+    ).json()
+    y = client.post(
+        "/api/contacts/",
+        json=batch_contact("chain.b@example.com", "Y"),
+        headers=headers,
+    ).json()
+
+    # Swaps the emails through a free one; in id order X would take chain.b
+    # before Y releases it.
+    operations = [
+        {
+            "op": "update",
+            "id": y["id"],
+            "data": batch_contact("chain.c@example.com", "Y"),
+        },
+        {
+            "op": "update",
+            "id": x["id"],
+            "data": batch_contact("chain.b@example.com", "X"),
+        },
+        {
+            "op": "update",
+            "id": y["id"],
+            "data": batch_contact("chain.a@example.com", "Y"),
+        },
+    ]
+    response = client.post(
+        "/api/contacts/batch",
+        json={"operations": operations, "atomic": False},
+        headers=headers,
+    )
+
+    assert response.status_code == 200
+    body = response.json()
+    assert body["applied"] is True
+    assert [r["status"] for r in body["results"]] == [200, 200, 200]
+    async with TestingSessionLocal() as session:
+        result = await session.execute(
+            select(Contacts.name, Contacts.email)
+            .where(Contacts.email.like("chain._@example.com"))
+            .order_by(Contacts.email)
+        )
+        assert result.all() == [
+            ("Y", "chain.a@example.com"),
+            ("X", "chain.b@example.com"),
+        ]
+
+
+@pytest.mark.asyncio
+async def test_atomic_batch_with_a_failure_applies_nothing(
+    client: TestClient, get_token
+):
+    headers = {"Authorization": f"Bearer {get_token}"}
+    operations = [
+        {"op": "create", "data": batch_contact("batch.atomic@example.com")},
+        {"op": "delete", "id": 999999},
+    ]
+    response = client.post(
+        "/api/contacts/batch", json={"operations": operations}, headers=headers
+    )
+
+    assert response.status_code == 409
+    assert [r["status"] for r in response.json()["results"]] == [424, 404]
+    async with TestingSessionLocal() as session:
+        result = await session.execute(
+            select(Contacts).where(Contacts.email == "batch.atomic@example.com")
+        )
+        assert result.first() is None
+
+
+@pytest.mark.asyncio
+async def test_autocomplete_follows_writes_without_queries(
+    client: TestClient, get_token
+):
+    headers = {"Authorization": f"Bearer {get_token}"}
+    typeahead.clear()
+    created = client.post(
+        "/api/contacts/",
+        json=batch_contact("typeahead@example.com", "Quentin Typeahead"),
+        headers=headers,
+    ).json()
+
+    response = client.get("/api/contacts/autocomplete?q=quen", headers=headers)
+    assert response.status_code == 200
+    assert response.json() == [
+        {
+            "id": created["id"],
+            "name": "Quentin Typeahead",
+            "email": "typeahead@example.com",
+            "phone": "555",
+        }
+    ]
+
+    client.patch(
+        f"/api/contacts/{created['id']}",
+        json=batch_contact("typeahead@example.com", "Quincy Typeahead"),
+        headers=headers,
+    )
+    with count_statements() as statements:
+        response = client.get("/api/contacts/autocomplete?q=quin", headers=headers)
+    assert [c["name"] for c in response.json()] == ["Quincy Typeahead"]
+    assert statements == []
+
+    client.delete(f"/api/contacts/{created['id']}", headers=headers)
+    response = client.get("/api/contacts/autocomplete?q=quin", headers=headers)
+    assert response.json() == []
+    assert typeahead.stats()["misses"] == 1
+
+
+def test_find_contacts_by_phone(client: TestClient, get_token):
+    headers = {"Authorization": f"Bearer {get_token}"}
+    contact = batch_contact("caller@example.com", "Caller")
+    contact["phone"] = "+1 (987) 654-3210"
+    client.post("/api/contacts/", json=contact, headers=headers)
+
+    response = client.get("/api/contacts/by-phone/?phone=19876543210", headers=headers)
+    assert response.status_code == 200
+    assert [c["email"] for c in response.json()] == ["caller@example.com"]
+
+    response = client.get(
+        "/api/contacts/by-phone/?phone=%2B1 987&prefix=true", headers=headers
+    )
+    assert [c["email"] for c in response.json()] == ["caller@example.com"]
+
+    response = client.get("/api/contacts/search/?phone=654-32", headers=headers)
+    assert [c["email"] for c in response.json()] == ["caller@example.com"]
+    response = client.get("/api/contacts/search/?phone=0054", headers=headers)
+    assert response.json() == []
+
+
+def test_update_contact_conflicts(client: TestClient, get_token):
+    headers = {"Authorization": f"Bearer {get_token}"}
+    client.post(
+        "/api/contacts/", json=batch_contact("taken@example.com"), headers=headers
+    )
+    created = client.post(
+        "/api/contacts/", json=batch_contact("mover@example.com"), headers=headers
+    ).json()
+
+    response = client.patch(
+        f"/api/contacts/{created['id']}",
+        json=batch_contact("Taken@example.com"),
+        headers=headers,
+    )
+    assert response.status_code == 400
+    assert response.json()["message"] == "Email already exists"
+
+    response = client.patch(
+        "/api/contacts/999999", json=batch_contact("free@example.com"), headers=headers
+    )
+    assert response.status_code == 404
+
+
+def test_update_contact_returns_public_fields(client: TestClient, get_token):
+    headers = {"Authorization": f"Bearer {get_token}"}
+    created = client.post(
+        "/api/contacts/", json=batch_contact("patched@example.com"), headers=headers
+    ).json()
+
+    response = client.patch(
+        f"/api/contacts/{created['id']}",
+        json=batch_contact("patched@example.com", "Patched"),
+        headers=headers,
+    )
+
+    assert response.status_code == 200
+    assert response.json() == batch_contact("patched@example.com", "Patched")
+
+
+@pytest.mark.asyncio
+async def test_contact_lists_are_not_validated_again(
+    client: TestClient, get_token, mock_user
+):
+    headers = {"Authorization": f"Bearer {get_token}"}
+    async with TestingSessionLocal() as session:
+        user_id = await session.scalar(
+            select(User.id).where(User.email == mock_user.email)
+        )
+        # Stored before EmailStr got stricter: still listed, as stored.
+        contact = Contacts(
+            name="Unvalidated",
+            email="legacy@localhost",
+            phone="555",
+            birthdate=date(1990, 1, 1),
+            user_id=user_id,
+        )
+        session.add(contact)
+        await session.commit()
+
+    try:
+        response = client.get("/api/contacts/search/?name=Unvalidated", headers=headers)
+        assert response.status_code == 200
+        assert [c["email"] for c in response.json()] == ["legacy@localhost"]
+    finally:
+        async with TestingSessionLocal() as session:
+            await session.delete(await session.get(Contacts, (contact.id, user_id)))
+            await session.commit()
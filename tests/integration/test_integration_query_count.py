@@ -0,0 +1,186 @@
+from contextlib import contextmanager
+from unittest.mock import Mock
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.future import select
+
+from src.db.models import User
+from src.services.auth import create_access_token
+from src.services.utils import Hash
+from tests.integration.conftest import TestingSessionLocal
+
+
+@contextmanager
+def count_statements():
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    # Listen on the class: the app may be bound to another engine instance.
+    event.listen(Engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        yield statements
+    finally:
+        event.remove(Engine, "before_cursor_execute", before_cursor_execute)
+
+
+async def set_password(email: str, password: str, is_verified: bool = True):
+    async with TestingSessionLocal() as session:
+        user = await session.execute(select(User).where(User.email == email))
+        user = user.scalar_one()
+        user.hashed_password = Hash().get_password_hash(password)
+        user.is_verified = is_verified
+        await session.commit()
+
+
+@pytest.mark.asyncio
+async def test_signup_is_one_statement(client: TestClient, monkeypatch):
+    monkeypatch.setattr("src.services.email.send_verification_email", Mock())
+    body = {
+        "name": "Query",
+        "surname": "Count",
+        "email": "querycount@example.com",
+        "password": "password",
+    }
+
+    with count_statements() as statements:
+        response = client.post("api/auth/signup", json=body)
+    assert response.status_code == 201
+    assert len(statements) == 1
+
+    with count_statements() as statements:
+        response = client.post("api/auth/signup", json=body)
+    assert response.status_code == 409
+    assert len(statements) == 1
+
+
+@pytest.mark.asyncio
+async def test_login_and_refresh_statement_counts(client: TestClient, mock_user):
+    await set_password(mock_user.email, "querycount")
+
+    with count_statements() as statements:
+        response = client.post(
+            "api/auth/login",
+            data={"username": mock_user.email, "password": "querycount"},
+            headers={"Content-Type": "application/x-www-form-urlencoded"},
+        )
+    assert response.status_code == 200
+    # SELECT the user, INSERT the session.
+    assert len(statements) == 2
+
+    with count_statements() as statements:
+        response = client.post(
+            "api/auth/refresh",
+            json={"refresh_token": response.json()["refresh_token"]},
+        )
+    assert response.status_code == 200
+    assert len(statements) == 1
+
+
+@pytest.mark.asyncio
+async def test_verify_email_is_one_statement(client: TestClient, mock_user):
+    await set_password(mock_user.email, "querycount", is_verified=False)
+    token = await create_access_token(data={"sub": mock_user.email})
+
+    with count_statements() as statements:
+        response = client.get(f"api/auth/verify-email?token={token}")
+    assert response.status_code == 200
+    assert len(statements) == 1
+
+
+@pytest.mark.asyncio
+async def test_reset_password_statement_count(client: TestClient, mock_user):
+    await set_password(mock_user.email, "querycount")
+
+    with count_statements() as statements:
+        response = client.post(
+            "api/auth/reset-password",
+            json={
+                "email": mock_user.email,
+                "old_password": "querycount",
+                "new_password": "querycount2",
+            },
+        )
+    assert response.status_code == 200
+    # SELECT the user, conditional UPDATE of hash and token version.
+    assert len(statements) == 2
+
+
+@pytest.mark.asyncio
+async def test_contact_writes_are_one_statement(client: TestClient, mock_user):
+    token = await create_access_token(data={"sub": mock_user.email})
+    headers = {"Authorization": f"Bearer {token}"}
+    # Warm the principal cache so that only the write path is counted.
+    assert client.get("api/contacts/", headers=headers).status_code == 200
+    body = {
+        "name": "Query Count",
+        "email": "querycount.contact@example.com",
+        "phone": "1234567890",
+        "birthdate": "1990-01-01",
+    }
+
+    # INSERT ... ON CONFLICT DO NOTHING RETURNING, whether or not it conflicts.
+    with count_statements() as statements:
+        response = client.post("api/contacts/", json=body, headers=headers)
+    assert response.status_code == 201
+    assert len(statements) == 1
+    assert "RETURNING" in statements[0]
+    contact_id = response.json()["id"]
+
+    with count_statements() as statements:
+        response = client.post("api/contacts/", json=body, headers=headers)
+    assert response.status_code == 400
+    assert len(statements) == 1
+
+    with count_statements() as statements:
+        response = client.patch(
+            f"api/contacts/{contact_id}",
+            json={**body, "name": "Query Count 2"},
+            headers=headers,
+        )
+    assert response.status_code == 200
+    assert response.json()["name"] == "Query Count 2"
+    assert len(statements) == 1
+
+    for status_code in (204, 404):
+        with count_statements() as statements:
+            response = client.delete(f"api/contacts/{contact_id}", headers=headers)
+        assert response.status_code == status_code
+        assert len(statements) == 1
+
+
+@pytest.mark.asyncio
+async def test_batch_statement_count_does_not_grow(client: TestClient, mock_user):
+    token = await create_access_token(data={"sub": mock_user.email})
+    headers = {"Authorization": f"Bearer {token}"}
+    assert client.get("api/contacts/", headers=headers).status_code == 200
+
+    def contact(i):
+        return {
+            "name": f"Batch {i}",
+            "email": f"batch.count{i}@example.com",
+            "phone": "1234567890",
+            "birthdate": "1990-01-01",
+        }
+
+    creates = [{"op": "create", "data": contact(i)} for i in range(20)]
+    response = client.post(
+        "api/contacts/batch", json={"operations": creates}, headers=headers
+    )
+    ids = [result["id"] for result in response.json()["results"]]
+
+    operations = [
+        {"op": "update", "id": id, "data": contact(i + 100)}
+        for i, id in enumerate(ids[:10])
+    ] + [{"op": "delete", "id": id} for id in ids[10:]]
+    with count_statements() as statements:
+        response = client.post(
+            "api/contacts/batch", json={"operations": operations}, headers=headers
+        )
+    assert response.status_code == 200
+    # SELECT contacts, SELECT emails, one DELETE and one executemany UPDATE.
+    assert len(statements) == 4
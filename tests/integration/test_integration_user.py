@@ -8,6 +8,7 @@ from sqlalchemy.future import select
 from tests.integration.conftest import TestingSessionLocal
 from src.conf.config import config
 from src.db.models import UserRole
+from src.conf.limiter import rate_limit_key
 
 
 @pytest.mark.asyncio
@@ -54,3 +55,12 @@ async def test_get_me(client: TestClient, mock_user, get_token):
 #         )
 #         user_in_db = result.scalars().first()
 #         assert user_in_db.avatar == data["avatar"]
+
+
+def test_rate_limit_is_keyed_by_user(client: TestClient, get_token):
+    headers = {"Authorization": f"Bearer {get_token}"}
+    for _ in range(5):
+        assert client.get("api/users/me", headers=headers).status_code == 200
+
+    assert client.get("api/users/me", headers=headers).status_code == 429
+    assert rate_limit_key(Mock(headers=headers)) == "user:test@example.com"
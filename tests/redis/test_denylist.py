@@ -0,0 +1,43 @@
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+from redis.exceptions import RedisError
+
+from src.redis.denylist import BloomFilter, TokenDenylist
+
+
+def test_bloom_filter_has_no_false_negatives():
+    bloom = BloomFilter(capacity=1000, error_rate=0.01)
+    items = [f"jti-{i}" for i in range(1000)]
+    for item in items:
+        bloom.add(item)
+
+    assert all(item in bloom for item in items)
+    false_positives = sum(f"other-{i}" in bloom for i in range(10000))
+    assert false_positives < 300
+
+
+def make_denylist(client):
+    return TokenDenylist(client, capacity=1000, error_rate=0.01, rebuild_interval=60)
+
+
+@pytest.mark.asyncio
+async def test_unknown_token_skips_redis():
+    client = MagicMock()
+    client.exists = AsyncMock()
+    denylist = make_denylist(client)
+
+    assert await denylist.is_revoked("never-revoked") is False
+    client.exists.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_revocation_survives_redis_outage():
+    client = MagicMock()
+    client.pipeline.side_effect = RedisError("down")
+    client.exists = AsyncMock(side_effect=RedisError("down"))
+    denylist = make_denylist(client)
+
+    await denylist.revoke("revoked", ttl=60)
+
+    assert await denylist.is_revoked("revoked") is True
+    assert await denylist.is_revoked("not-revoked") is False
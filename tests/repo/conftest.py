@@ -4,6 +4,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from src.db.models import User, Contacts
 from src.repository.users import UserRepository
 from src.repository.contacts import ContactsRepository
+from src.repository.sessions import SessionRepository
 
 
 # ------------------------
@@ -17,6 +18,8 @@ def mock_user_db_session(mock_user):
 
     # async methods
     mock_session.commit = AsyncMock()
+    mock_session.flush = AsyncMock()
+    mock_session.info = {}
     mock_session.refresh = AsyncMock()
     mock_session.delete = AsyncMock()
 
@@ -25,6 +28,7 @@ def mock_user_db_session(mock_user):
     mock_result.scalars.return_value.all.return_value = [mock_user]
     mock_result.scalar_one_or_none.return_value = mock_user
     mock_session.execute.return_value = mock_result
+    mock_session.get_bind.return_value.dialect.name = "postgresql"
 
     mock_session.add = MagicMock()
     yield mock_session
@@ -45,11 +49,22 @@ def mock_contacts_db_session(mock_contact):
     mock_session = MagicMock(spec=AsyncSession)
 
     mock_session.commit = AsyncMock()
+    mock_session.flush = AsyncMock()
+    mock_session.info = {}
     mock_session.refresh = AsyncMock()
     mock_session.delete = AsyncMock()
 
     mock_result = MagicMock()
     mock_result.scalars.return_value.all.return_value = [mock_contact]
+    mock_result.mappings.return_value.all.return_value = [
+        {
+            "id": mock_contact.id,
+            "name": mock_contact.name,
+            "email": mock_contact.email,
+            "phone": mock_contact.phone,
+            "birthdate": mock_contact.birthdate,
+        }
+    ]
     mock_result.scalar_one_or_none.return_value = mock_contact
     mock_session.execute.return_value = mock_result
 
@@ -60,3 +75,32 @@ def mock_contacts_db_session(mock_contact):
 @pytest.fixture
 def mock_contacts_repo(mock_contacts_db_session):
     return ContactsRepository(db=mock_contacts_db_session)
+
+
+# ------------------------
+# Sessions
+# ------------------------
+
+
+@pytest.fixture
+def mock_sessions_db_session():
+    mock_session = MagicMock(spec=AsyncSession)
+
+    mock_session.commit = AsyncMock()
+    mock_session.flush = AsyncMock()
+    mock_session.info = {}
+
+    mock_result = MagicMock()
+    mock_result.scalar_one_or_none.return_value = 1
+    mock_result.one_or_none.return_value = 1
+    mock_result.rowcount = 0
+    mock_session.execute.return_value = mock_result
+    mock_session.get_bind.return_value.dialect.name = "postgresql"
+
+    mock_session.add = MagicMock()
+    yield mock_session
+
+
+@pytest.fixture
+def mock_sessions_repo(mock_sessions_db_session):
+    return SessionRepository(db=mock_sessions_db_session)
@@ -1,6 +1,8 @@
 import pytest
-from src.schemas.auth import UserCreate
+from src.schemas.auth import UserCreate, UserSchema
 from src.db.models import User
+from src.services.auth_cache import principal_cache
+from src.db.unit_of_work import unit_of_work
 
 
 @pytest.mark.asyncio
@@ -32,7 +34,7 @@ async def test_get_user_by_email(mock_user_repo, mock_user):
 
 
 @pytest.mark.asyncio
-async def test_create_user(mock_user_repo, mock_user_db_session):
+async def test_create_user(mock_user_repo, mock_user_db_session, mock_user):
     # Setup
     user_create_data = UserCreate(
         name="testuser",
@@ -41,16 +43,28 @@ async def test_create_user(mock_user_repo, mock_user_db_session):
         password="password",
     )
 
-    result = await mock_user_repo.create(user_create_data)
+    result = await mock_user_repo.create(user_create_data, hashed_password="hash")
 
-    # Assertions
-    assert isinstance(result, User)
-    assert result.email == "testuser@example.com"
-    assert result.surname == "Test"
-    assert result.name == "testuser"
-    mock_user_db_session.add.assert_called_once()
-    mock_user_db_session.commit.assert_awaited_once()
-    mock_user_db_session.refresh.assert_awaited_once_with(result)
+    # Assertions: a single INSERT ... ON CONFLICT DO NOTHING RETURNING
+    assert result == mock_user
+    mock_user_db_session.execute.assert_awaited_once()
+    mock_user_db_session.add.assert_not_called()
+    mock_user_db_session.commit.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_create_user_duplicate_email(mock_user_repo, mock_user_db_session):
+    mock_user_db_session.execute.return_value.scalar_one_or_none.return_value = None
+    user_create_data = UserCreate(
+        name="testuser",
+        surname="Test",
+        email="test@example.com",
+        password="password",
+    )
+
+    result = await mock_user_repo.create(user_create_data, hashed_password="hash")
+
+    assert result is None
 
 
 @pytest.mark.asyncio
@@ -64,8 +78,21 @@ async def test_update_user(mock_user_repo, mock_user_db_session, mock_user):
     assert isinstance(result, User)
     assert result.name == "updatedname"
     assert result.surname == "Updated"
-    mock_user_db_session.commit.assert_awaited_once()
-    mock_user_db_session.refresh.assert_awaited_once_with(mock_user)
+    mock_user_db_session.flush.assert_awaited_once()
+    mock_user_db_session.commit.assert_not_awaited()
+    mock_user_db_session.refresh.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_update_user_revokes_tokens_when_claims_change(mock_user_repo):
+    user = User(id=1, name="Test", email="claims@example.com", role="admin")
+    user.token_version = 3
+
+    await mock_user_repo.update(user, {"name": "Test"})
+    assert user.token_version == 3
+
+    await mock_user_repo.update(user, {"role": "user"})
+    assert (User.token_version + 1).compare(user.token_version)
 
 
 @pytest.mark.asyncio
@@ -73,16 +100,18 @@ async def test_delete_user(mock_user_repo, mock_user_db_session, mock_user):
     result = await mock_user_repo.delete(mock_user)
     assert result is True
     mock_user_db_session.add.assert_not_called()
-    mock_user_db_session.commit.assert_awaited_once()
-    mock_user_db_session.refresh.assert_not_awaited()
+    mock_user_db_session.delete.assert_awaited_once_with(mock_user)
+    mock_user_db_session.begin_nested.assert_called_once()
+    mock_user_db_session.commit.assert_not_awaited()
 
 
 @pytest.mark.asyncio
 async def test_confirm_user_email(mock_user_repo, mock_user_db_session, mock_user):
-    await mock_user_repo.confirm_email(mock_user)
-    assert mock_user.is_verified is True
-    mock_user_db_session.commit.assert_awaited_once()
-    mock_user_db_session.refresh.assert_awaited_once_with(mock_user)
+    mock_user_db_session.execute.return_value.scalar_one_or_none.return_value = 1
+    result = await mock_user_repo.confirm_email(mock_user.email)
+    assert result == 1
+    mock_user_db_session.execute.assert_awaited_once()
+    mock_user_db_session.commit.assert_not_awaited()
 
 
 @pytest.mark.asyncio
@@ -91,16 +120,22 @@ async def test_update_avatar_url(mock_user_repo, mock_user_db_session, mock_user
     result = await mock_user_repo.update_avatar_url(mock_user.email, new_avatar_url)
     assert result is None
     assert mock_user.avatar == new_avatar_url
-    mock_user_db_session.commit.assert_awaited_once()
-    mock_user_db_session.refresh.assert_awaited_once_with(mock_user)
+    mock_user_db_session.flush.assert_awaited_once()
+    mock_user_db_session.refresh.assert_not_awaited()
 
 
 @pytest.mark.asyncio
-async def test_get_by_refresh_token(mock_user_repo, mock_user):
-    user = await mock_user_repo.get_by_email(mock_user.email)
-    token = user.refresh_token
-    result = await mock_user_repo.get_user_by_refresh_token(token)
-    assert isinstance(result, User)
-    assert result == mock_user
-    assert result.refresh_token == token
-    assert result.email == mock_user.email
+async def test_update_user_invalidates_principal_cache_after_commit(
+    mock_user_repo, mock_user_db_session, mock_user
+):
+    principal = UserSchema(
+        id=1, name="Test", surname="User", email=mock_user.email, role="user"
+    )
+    principal_cache.set(mock_user.email, "fingerprint", principal)
+
+    await mock_user_repo.update(mock_user, {"name": "Test"})
+    assert principal_cache.get(mock_user.email, "fingerprint") is not None
+
+    await unit_of_work(mock_user_db_session).commit()
+
+    assert principal_cache.get(mock_user.email, "fingerprint") is None
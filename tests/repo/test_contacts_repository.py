@@ -1,5 +1,5 @@
 import pytest
-from src.db.models import Contacts
+from sqlalchemy.dialects import postgresql
 from src.schemas.contacts import ContactSchema
 from datetime import date
 
@@ -9,8 +9,7 @@ async def test_get_all_contacts(mock_contacts_repo, mock_user):
     result = await mock_contacts_repo.get_all(limit=10, skip=0, user=mock_user)
     assert isinstance(result, list)
     assert len(result) == 1
-    assert isinstance(result[0], Contacts)
-    assert result[0].email == "john@example.com"
+    assert result[0]["email"] == "john@example.com"
 
 
 @pytest.mark.asyncio
@@ -27,8 +26,16 @@ async def test_get_contact_by_email(mock_contacts_repo, mock_user, mock_contact)
     assert result == mock_contact
 
 
+def executed_sql(mock_session) -> str:
+    mock_session.execute.assert_awaited_once()
+    statement = mock_session.execute.await_args.args[0]
+    return str(statement.compile(dialect=postgresql.dialect()))
+
+
 @pytest.mark.asyncio
-async def test_create_contact(mock_contacts_repo, mock_contacts_db_session, mock_user):
+async def test_create_contact(
+    mock_contacts_repo, mock_contacts_db_session, mock_user, mock_contact
+):
     contact_data = ContactSchema(
         name="John",
         email="john@example.com",
@@ -38,32 +45,33 @@ async def test_create_contact(mock_contacts_repo, mock_contacts_db_session, mock
         user_id=mock_user.id,
     )
     result = await mock_contacts_repo.create(contact_data, user=mock_user)
-    assert isinstance(result, Contacts)
-    assert result.email == contact_data.email
-    assert result.name == contact_data.name
-    assert result.phone == contact_data.phone
-    assert result.birthdate == contact_data.birthdate
-    mock_contacts_db_session.add.assert_called_once_with(result)
-    mock_contacts_db_session.commit.assert_awaited_once()
-    mock_contacts_db_session.refresh.assert_awaited_once_with(result)
+    assert result == mock_contact
+    sql = executed_sql(mock_contacts_db_session)
+    assert "ON CONFLICT (user_id, lower(email)) DO NOTHING RETURNING" in sql
+    mock_contacts_db_session.add.assert_not_called()
+    mock_contacts_db_session.flush.assert_not_awaited()
+    mock_contacts_db_session.commit.assert_not_awaited()
 
 
 @pytest.mark.asyncio
 async def test_update_contact(
-    mock_contacts_repo, mock_contacts_db_session, mock_contact
+    mock_contacts_repo, mock_contacts_db_session, mock_user, mock_contact
 ):
-    update_data = {"name": "Jane", "surname": "Smith"}
-    await mock_contacts_repo.update(mock_contact, update_data)
-    assert mock_contact.name == "Jane"
-    assert mock_contact.surname == "Smith"
-    mock_contacts_db_session.commit.assert_awaited_once()
-    mock_contacts_db_session.refresh.assert_awaited_once_with(mock_contact)
+    update_data = {"name": "Jane", "phone": "+1 (234) 567-890"}
+    result = await mock_contacts_repo.update(1, update_data, user=mock_user)
+    assert result == mock_contact
+    statement = mock_contacts_db_session.execute.await_args.args[0]
+    assert statement.compile().params["phone_normalized"] == "+1234567890"
+    sql = executed_sql(mock_contacts_db_session)
+    assert "WHERE contacts.id = %(id_1)s AND contacts.user_id" in sql
+    assert "RETURNING" in sql
+    mock_contacts_db_session.flush.assert_not_awaited()
 
 
 @pytest.mark.asyncio
-async def test_delete_contact(
-    mock_contacts_repo, mock_contacts_db_session, mock_contact
-):
-    await mock_contacts_repo.delete(mock_contact)
-    mock_contacts_db_session.delete.assert_awaited_once_with(mock_contact)
-    mock_contacts_db_session.commit.assert_awaited_once()
+async def test_delete_contact(mock_contacts_repo, mock_contacts_db_session, mock_user):
+    assert await mock_contacts_repo.delete(1, user=mock_user) is True
+    sql = executed_sql(mock_contacts_db_session)
+    assert sql.startswith("DELETE FROM contacts WHERE")
+    assert "RETURNING contacts.id" in sql
+    mock_contacts_db_session.delete.assert_not_awaited()
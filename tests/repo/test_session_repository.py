@@ -0,0 +1,41 @@
+import pytest
+from datetime import datetime, timedelta
+from src.db.models import UserSession
+
+
+@pytest.mark.asyncio
+async def test_create_session(mock_sessions_repo, mock_sessions_db_session):
+    expires_at = datetime(2030, 1, 1)
+    result = await mock_sessions_repo.create(
+        user_id=1, token_hash="a" * 64, expires_at=expires_at, device="phone"
+    )
+    assert isinstance(result, UserSession)
+    assert result.user_id == 1
+    assert result.token_hash == "a" * 64
+    assert result.device == "phone"
+    mock_sessions_db_session.add.assert_called_once_with(result)
+    mock_sessions_db_session.flush.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_rotate_session(mock_sessions_repo, mock_sessions_db_session):
+    now = datetime(2030, 1, 1)
+    result = await mock_sessions_repo.rotate(
+        token_hash="a" * 64,
+        new_token_hash="b" * 64,
+        now=now,
+        expires_at=now + timedelta(days=7),
+    )
+    assert result == 1
+    mock_sessions_db_session.execute.assert_awaited_once()
+    mock_sessions_db_session.commit.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_purge_expired_sessions(mock_sessions_repo, mock_sessions_db_session):
+    deleted = await mock_sessions_repo.purge_expired(
+        now=datetime(2030, 1, 1), batch_size=100
+    )
+    assert deleted == 0
+    mock_sessions_db_session.execute.assert_awaited_once()
+    mock_sessions_db_session.commit.assert_awaited_once()
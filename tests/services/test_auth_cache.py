@@ -0,0 +1,56 @@
+from src.schemas.auth import UserSchema
+from src.services.auth_cache import PrincipalCache, token_fingerprint
+
+
+def make_principal(user_id: int, email: str) -> UserSchema:
+    return UserSchema(id=user_id, name="Test", surname="User", email=email, role="user")
+
+
+def test_cache_hit_and_miss():
+    cache = PrincipalCache(maxsize=10, ttl=60)
+    fingerprint = token_fingerprint("token")
+    assert cache.get("test@example.com", fingerprint) is None
+
+    principal = make_principal(1, "test@example.com")
+    cache.set("test@example.com", fingerprint, principal)
+
+    assert cache.get("test@example.com", fingerprint) == principal
+    assert cache.get("test@example.com", token_fingerprint("other")) is None
+    stats = cache.stats()
+    assert stats["hits"] == 1
+    assert stats["misses"] == 2
+
+
+def test_cache_evicts_least_recently_used():
+    cache = PrincipalCache(maxsize=2, ttl=60)
+    cache.set("a@example.com", "a", make_principal(1, "a@example.com"))
+    cache.set("b@example.com", "b", make_principal(2, "b@example.com"))
+    cache.get("a@example.com", "a")
+    cache.set("c@example.com", "c", make_principal(3, "c@example.com"))
+
+    assert cache.get("b@example.com", "b") is None
+    assert cache.get("a@example.com", "a") is not None
+    assert cache.get("c@example.com", "c") is not None
+    assert cache.stats()["evictions"] == 1
+
+
+def test_cache_respects_ttl():
+    cache = PrincipalCache(maxsize=10, ttl=60)
+    cache.set("a@example.com", "a", make_principal(1, "a@example.com"), ttl=0)
+    cache.set("b@example.com", "b", make_principal(2, "b@example.com"), ttl=-1)
+    assert cache.get("a@example.com", "a") is None
+    assert cache.get("b@example.com", "b") is None
+
+
+def test_cache_invalidate_drops_all_tokens_of_subject():
+    cache = PrincipalCache(maxsize=10, ttl=60)
+    principal = make_principal(1, "a@example.com")
+    cache.set("a@example.com", "t1", principal)
+    cache.set("a@example.com", "t2", principal)
+    cache.set("b@example.com", "t3", make_principal(2, "b@example.com"))
+
+    cache.invalidate("a@example.com")
+
+    assert cache.get("a@example.com", "t1") is None
+    assert cache.get("a@example.com", "t2") is None
+    assert cache.get("b@example.com", "t3") is not None
@@ -0,0 +1,63 @@
+import io
+
+import pytest
+
+from src.api.exceptions import ImportFormatError
+from src.services.contact_import import detect_format, read_records
+
+
+def records(data: bytes, format: str):
+    return list(read_records(io.BytesIO(data), format))
+
+
+def test_read_csv_with_bom_and_header_case():
+    data = (
+        "\ufeffName,Email,Phone,Birthdate\r\n"
+        'Jane,jane@example.com,555,1990-01-02\r\n"Doe, John",john@example.com,,\r\n'
+    ).encode("utf-8")
+    assert records(data, "csv") == [
+        {
+            "name": "Jane",
+            "email": "jane@example.com",
+            "phone": "555",
+            "birthdate": "1990-01-02",
+        },
+        {
+            "name": "Doe, John",
+            "email": "john@example.com",
+            "phone": "",
+            "birthdate": "",
+        },
+    ]
+
+
+def test_read_jsonl_marks_malformed_lines():
+    data = b'{"name": "Jane"}\n\nnot json\n[1, 2]\n'
+    assert records(data, "jsonl") == [{"name": "Jane"}, None, None]
+
+
+def test_read_vcard_unfolds_lines_and_keeps_first_values():
+    data = (
+        b"BEGIN:VCARD\r\nVERSION:3.0\r\nFN:Jane\r\n  Smith\r\n"
+        b"item1.EMAIL;TYPE=INTERNET:jane@example.com\r\nEMAIL:other@example.com\r\n"
+        b"TEL;TYPE=CELL:+380501234567\r\nBDAY:19900102\r\nEND:VCARD\r\n"
+    )
+    assert records(data, "vcard") == [
+        {
+            "name": "Jane Smith",
+            "email": "jane@example.com",
+            "phone": "+380501234567",
+            "birthdate": "1990-01-02",
+        }
+    ]
+
+
+def test_read_rejects_non_utf8():
+    with pytest.raises(ImportFormatError):
+        records(b"name\n\xff\xfe\n", "csv")
+
+
+def test_detect_format():
+    assert detect_format("book.VCF") == "vcard"
+    assert detect_format("export.ndjson") == "jsonl"
+    assert detect_format("notes.txt") is None
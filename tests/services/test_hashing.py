@@ -0,0 +1,67 @@
+import pytest
+
+from src.api.exceptions import ServiceUnavailableError
+from src.services.hashing import PasswordHasher
+from src.conf.config import config
+from src.services.utils import Hash
+
+
+@pytest.mark.asyncio
+async def test_hash_and_verify_password():
+    hasher = PasswordHasher(max_workers=0, max_pending=4)
+
+    hashed = await hasher.hash("password")
+
+    assert await hasher.verify("password", hashed) is True
+    assert await hasher.verify("wrong", hashed) is False
+    stats = hasher.stats()
+    assert stats["completed"] == 3
+    assert stats["failed"] == 0
+    assert stats["in_flight"] == 0
+    assert stats["latency"]["count"] == 3
+
+
+@pytest.mark.asyncio
+async def test_hasher_sheds_load_when_saturated():
+    hasher = PasswordHasher(max_workers=0, max_pending=1)
+    hasher.in_flight = 1
+
+    with pytest.raises(ServiceUnavailableError):
+        await hasher.hash("password")
+
+    assert hasher.stats()["rejected"] == 1
+
+
+@pytest.mark.asyncio
+async def test_failed_calls_are_not_counted_as_completed():
+    hasher = PasswordHasher(max_workers=0, max_pending=4)
+
+    with pytest.raises(ValueError):
+        await hasher.verify("password", "not-a-hash")
+
+    stats = hasher.stats()
+    assert stats["completed"] == 0
+    assert stats["failed"] == 1
+    assert stats["in_flight"] == 0
+
+
+def test_calibrate_stays_within_bounds(monkeypatch):
+    monkeypatch.setattr(Hash, "rounds", Hash.rounds)
+
+    assert Hash.calibrate(target_ms=0, min_rounds=4, max_rounds=6) == 4
+    assert Hash.calibrate(target_ms=10**9, min_rounds=4, max_rounds=6) == 6
+    assert Hash.rounds == 6
+
+
+def test_hashes_within_fleet_bounds_are_not_rehashed(monkeypatch):
+    monkeypatch.setattr(config, "HASH_MIN_ROUNDS", 4)
+    monkeypatch.setattr(config, "HASH_MAX_ROUNDS", 7)
+    # Another instance calibrated a different cost.
+    other = Hash(rounds=7).get_password_hash("password")
+    below = Hash(rounds=5).get_password_hash("password")
+    monkeypatch.setattr(config, "HASH_MIN_ROUNDS", 6)
+
+    assert Hash(rounds=6).verify_and_update("password", other) == (True, None)
+    valid, replacement = Hash(rounds=6).verify_and_update("password", below)
+    assert valid is True
+    assert replacement.startswith("$2b$06$")
@@ -0,0 +1,108 @@
+import pytest
+
+from src.services.typeahead import Suggestion, TypeaheadCache, UserIndex
+
+CONTACTS = [
+    Suggestion(1, "Ann Smith", "ann.smith@example.com", "+38 (050) 123-45-67"),
+    Suggestion(2, "Annabel Lee", "poe@example.com", "+1 555 0100"),
+    Suggestion(3, "Ann", "ann@other.org", "380671112233"),
+    Suggestion(4, "Bob Annand", "bob@example.com", "0441234567"),
+]
+
+
+def ids(suggestions):
+    return [suggestion.id for suggestion in suggestions]
+
+
+def test_search_ranks_exact_then_name_prefix_then_other_words():
+    index = UserIndex(CONTACTS)
+    assert ids(index.search("ann", 10)) == [3, 1, 2, 4]
+    assert ids(index.search("ann", 2)) == [3, 1]
+
+
+def test_search_matches_every_term_across_fields():
+    index = UserIndex(CONTACTS)
+    assert ids(index.search("ann exam", 10)) == [1, 2, 4]
+    assert ids(index.search("ann other", 10)) == [3]
+    assert ids(index.search("smith@ex", 10)) == [1]
+    assert ids(index.search("ann.smith@example.c", 10)) == [1]
+    assert ids(index.search("+38 050 12", 10)) == [1]
+    assert index.search("zed", 10) == []
+
+
+def test_upsert_and_remove_update_postings():
+    index = UserIndex(CONTACTS)
+    size = index.size
+    index.upsert(Suggestion(3, "Zed", "zed@other.org", "1"))
+    assert ids(index.search("zed", 10)) == [3]
+    assert 3 not in ids(index.search("ann", 10))
+    index.remove(3)
+    assert index.search("zed", 10) == []
+    index.upsert(CONTACTS[2])
+    assert index.size == size
+
+
+@pytest.mark.asyncio
+async def test_cache_builds_lazily_and_applies_writes():
+    cache = TypeaheadCache(max_postings=10000, ttl=60)
+    loads = []
+
+    async def load():
+        loads.append(1)
+        return CONTACTS
+
+    assert ids(await cache.search(1, "bob", 10, load)) == [4]
+    cache.upsert(1, Suggestion(5, "Bobby", "bobby@example.com", "1"))
+    cache.remove(1, 4)
+    assert ids(await cache.search(1, "bob", 10, load)) == [5]
+    assert len(loads) == 1
+    assert cache.stats()["hits"] == 1
+
+
+@pytest.mark.asyncio
+async def test_cache_evicts_least_recently_used_users():
+    size = UserIndex(CONTACTS).size
+    cache = TypeaheadCache(max_postings=2 * size, ttl=60)
+
+    async def load():
+        return CONTACTS
+
+    for user_id in (1, 2, 1, 3):
+        await cache.search(user_id, "ann", 10, load)
+
+    assert cache.stats()["users"] == 2
+    assert cache.stats()["evictions"] == 1
+    assert cache._get(2) is None
+
+
+@pytest.mark.asyncio
+async def test_index_built_while_a_write_commits_is_not_kept():
+    cache = TypeaheadCache(max_postings=10000, ttl=60)
+
+    async def load():
+        cache.upsert(1, Suggestion(9, "Late", "late@example.com", "1"))
+        return CONTACTS
+
+    await cache.search(1, "ann", 10, load)
+    assert cache.stats()["users"] == 0
+
+
+@pytest.mark.asyncio
+async def test_index_built_across_a_write_map_reset_is_not_kept():
+    cache = TypeaheadCache(max_postings=10000, ttl=60)
+
+    async def load():
+        cache.upsert(1, Suggestion(9, "Late", "late@example.com", "1"))
+        # Enough writes by other users to empty the map of last writes.
+        for user_id in range(2, 100004):
+            cache.invalidate(user_id)
+        return CONTACTS
+
+    await cache.search(1, "ann", 10, load)
+    assert cache.stats()["users"] == 0
+
+    async def load_after():
+        return CONTACTS
+
+    await cache.search(1, "ann", 10, load_after)
+    assert cache.stats()["users"] == 1